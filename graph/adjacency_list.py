@@ -1,6 +1,9 @@
+import itertools
 import numpy as np
 import typing
 
+from csr_graph import CSRGraph, index_dtype
+
 
 class AdjacencyList(object):
 
@@ -74,25 +77,78 @@ class AdjacencyList(object):
         
         return sum(len(val) % 2 != 0 for val in adj_list.values())
 
+    @staticmethod
+    def vertex_index(
+            adj_list: typing.Dict[typing.Hashable,
+                                  typing.List[typing.Hashable]]
+    ) -> typing.Dict[typing.Hashable, int]:
+        """
+        Maps every vertex id in the graph to its row/column in the adjacency
+        matrix format. If the vertices are numbered 0..V-1 every vertex maps
+        to itself, otherwise the keys are numbered in the order of adj_list,
+        followed by vertices that only occur as a neighbour.
+
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        :return: dict from vertex id to matrix index
+        """
+
+        n = len(adj_list)
+        if adj_list.keys() == set(range(n)):
+            index = {v: v for v in range(n)}
+        else:
+            index = {v: i for i, v in enumerate(adj_list)}
+        for v in itertools.chain.from_iterable(adj_list.values()):
+            if v not in index:
+                index[v] = len(index)
+        return index
+
     @staticmethod
     def list_to_matrix(
-            adj_list: typing.Dict[int, typing.List[int]]) -> np.array:
+            adj_list: typing.Dict[typing.Hashable,
+                                  typing.List[typing.Hashable]],
+            dtype: np.dtype = np.uint8,
+            sparse: bool = False) -> typing.Union[np.array, CSRGraph]:
         """
         Accepts a graph in the adjacency list format, and returns it in the
-        adjacency matrix format.
+        adjacency matrix format. Vertex ids are translated to matrix indices
+        by AdjacencyList.vertex_index.
 
         :param adj_list: The graph in adjacency list format, where
         adj_list[i] consists of a list, where each element of that list
         indicates an edge to a specific vertex
+        :param dtype: The dtype of the returned matrix. Only applies to the
+        dense output, a CSRGraph uses the smallest index dtype that fits.
+        :param sparse: If true, return a CSRGraph instead of a dense matrix
         :return: The graph in adjacency matrix format, where
         adj_matrix[i][j] indicates whether there is an edge between vertex i
         and j
         """
-        
-        n_edges = AdjacencyList.count_vertices_directed_graph(adj_list)
-        matrix = np.empty((n_edges, n_edges))
-        for k, lst in adj_list.items():
-            for v in lst:
-                matrix[k][v] = 1
 
+        index = AdjacencyList.vertex_index(adj_list)
+        n = len(index)
+        lengths = np.fromiter((len(lst) for lst in adj_list.values()),
+                              dtype=np.int64, count=len(adj_list))
+        n_edges = int(lengths.sum())
+        rows = np.repeat(np.fromiter((index[k] for k in adj_list),
+                                     dtype=np.int64, count=len(adj_list)),
+                         lengths)
+        neighbours = itertools.chain.from_iterable(adj_list.values())
+        if n == len(adj_list) and adj_list.keys() == set(range(n)):
+            # Vertices are numbered 0..V-1, so ids are already indices
+            cols = np.fromiter(neighbours, dtype=np.int64, count=n_edges)
+        else:
+            cols = np.fromiter((index[v] for v in neighbours),
+                               dtype=np.int64, count=n_edges)
+
+        if sparse:
+            index_type = index_dtype(max(n, n_edges))
+            order = np.argsort(rows, kind='stable')
+            indptr = np.zeros(n + 1, dtype=index_type)
+            np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+            return CSRGraph(indptr, cols[order].astype(index_type))
+
+        matrix = np.zeros((n, n), dtype=dtype)
+        matrix[rows, cols] = 1
         return matrix
@@ -1,4 +1,5 @@
 import numpy as np
+import typing
 
 
 class AdjacencyMatrix(object):
@@ -67,39 +68,30 @@ class AdjacencyMatrix(object):
         neighbours
         """
         
-        n = 0
-        for i in adj_matrix:
-            if np.sum(i) % 2 != 0:
-                n += 1
-        return n
+        degrees = np.sum(adj_matrix, axis=1)
+        return int(np.count_nonzero(degrees % 2))
 
     @staticmethod
-    def invert_directed_graph(adj_matrix: np.array) -> np.array:
+    def invert_directed_graph(adj_matrix: np.array,
+                              out: typing.Optional[np.array] = None) \
+            -> np.array:
         """
         Inverts the graph represented in adj_matrix in such a way, that each
         edge is switched direction, i.e., if there was an edge from
         adj_matrix[i][j] it will be directed the other way around, and vice
-        versa. Pay additional attention to vertices that are connected in both
-        directions.
+        versa. Vertices that are connected in both directions stay connected
+        in both directions, which is exactly the transpose of the matrix.
 
         :param adj_matrix: The graph in adjacency matrix format, where
         adj_matrix[i][j] indicates whether there is an edge between vertex i
         and j
-        :return: numpy array, representing the inverted graph
+        :param out: Optional preallocated array of the same shape to write
+        the inverted graph into. It must not share memory with adj_matrix.
+        :return: numpy array with the dtype of adj_matrix, representing the
+        inverted graph
         """
 
-        # FIXME: Kan wss beter
-        n_edges = AdjacencyMatrix.count_vertices_directed_graph(adj_matrix)
-        coord = []
-        for index, x in np.ndenumerate(adj_matrix):
-            if x == 1:
-                i = index[0]
-                j = index[1]
-
-                coord.append((j, i))
-            
-        adj_matrix = np.zeros((n_edges, n_edges))
-        for c in coord:
-            adj_matrix[c] = 1
-
-        return adj_matrix
+        if out is None:
+            return np.ascontiguousarray(adj_matrix.T)
+        np.copyto(out, adj_matrix.T)
+        return out
@@ -0,0 +1,175 @@
+import argparse
+import numpy as np
+import time
+import typing
+
+from adjacency_matrix import AdjacencyMatrix
+from csr_graph import CSRGraph
+from parallel import ParallelGraph
+from shortest_path import ShortestPath
+
+############################################################################
+# Benchmarks for the graph functions. Run `python benchmark.py` to run all
+# of them, or `python benchmark.py <name>` to run a single one. The
+# reference_* functions are the original, loop-based implementations that
+# the current code is compared against.
+############################################################################
+
+
+def random_directed_graph(size: int, density: float = 0.5,
+                          dtype: np.dtype = np.int64) -> np.array:
+    """
+    Generates a random directed graph without self loops
+
+    :param size: The number of vertices
+    :param density: The probability that an edge exists
+    :param dtype: The dtype of the returned adjacency matrix
+    :return: The graph in adjacency matrix format
+    """
+
+    rng = np.random.default_rng(0)
+    graph = (rng.random((size, size)) < density).astype(dtype)
+    np.fill_diagonal(graph, 0)
+    return graph
+
+
+def time_call(func: typing.Callable, *args, repeat: int = 3) -> float:
+    """
+    Times a function call
+
+    :param func: The function to call
+    :param args: The arguments to call the function with
+    :param repeat: The number of times to call the function
+    :return: The fastest time of all calls, in seconds
+    """
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, size: int, timings: typing.Dict[str, float]) -> None:
+    """
+    Prints one line of benchmark results
+
+    :param name: The name of the benchmarked operation
+    :param size: The size of the input
+    :param timings: Mapping of implementation name to time in seconds
+    """
+
+    columns = '  '.join('%s=%9.5fs' % (k, v) for k, v in timings.items())
+    print('%-32s n=%-8d %s' % (name, size, columns))
+
+
+def reference_invert_directed_graph(adj_matrix: np.array) -> np.array:
+    n = len(adj_matrix)
+    coord = []
+    for index, x in np.ndenumerate(adj_matrix):
+        if x == 1:
+            coord.append((index[1], index[0]))
+    adj_matrix = np.zeros((n, n))
+    for c in coord:
+        adj_matrix[c] = 1
+    return adj_matrix
+
+
+def reference_count_odd_neighbours(adj_matrix: np.array) -> int:
+    n = 0
+    for i in adj_matrix:
+        if np.sum(i) % 2 != 0:
+            n += 1
+    return n
+
+
+def bench_adjacency_matrix() -> None:
+    for size in (250, 500, 1000, 2000):
+        graph = random_directed_graph(size)
+        out = np.empty_like(graph)
+        report('invert_directed_graph', size, {
+            'reference': time_call(reference_invert_directed_graph, graph,
+                                   repeat=1),
+            'current': time_call(AdjacencyMatrix.invert_directed_graph,
+                                 graph),
+            'current(out)': time_call(AdjacencyMatrix.invert_directed_graph,
+                                      graph, out),
+        })
+        report('count_odd_neighbours', size, {
+            'reference': time_call(reference_count_odd_neighbours, graph),
+            'current': time_call(
+                AdjacencyMatrix.count_odd_neighbours_undirected_graph, graph),
+        })
+
+
+def reference_dijkstra(adj_matrix: np.array, source: int) -> np.ndarray:
+    # O(V^2): every step scans all vertices for the closest unvisited one
+    n = len(adj_matrix)
+    distances = np.full(n, np.inf)
+    done = np.zeros(n, dtype=bool)
+    distances[source] = 0
+    for _ in range(n):
+        u = int(np.argmin(np.where(done, np.inf, distances)))
+        if not np.isfinite(distances[u]):
+            break
+        done[u] = True
+        for v in np.flatnonzero(adj_matrix[u]):
+            distances[v] = min(distances[v], distances[u] + adj_matrix[u, v])
+    return distances
+
+
+def bench_shortest_path() -> None:
+    rng = np.random.default_rng(0)
+    for size in (500, 1000, 2000, 4000):
+        # Sparse graph with an average out-degree of 8
+        weights = rng.integers(1, 100, size=(size, size)).astype(np.float64)
+        weights[rng.random((size, size)) > 8 / size] = 0
+        graph = CSRGraph.from_matrix(weights, weighted=True)
+        reverse = graph.invert_directed_graph()
+        report('dijkstra', size, {
+            'reference': time_call(reference_dijkstra, weights, 0, repeat=1),
+            'heap': time_call(ShortestPath.dijkstra, graph, 0),
+            'bidirectional': time_call(ShortestPath.bidirectional_dijkstra,
+                                       graph, 0, size - 1, reverse),
+        })
+    # Distances from 64 sources of the largest graph
+    report('all_pairs', size, {
+        'workers=1': time_call(ShortestPath.all_pairs, graph, range(64), 1,
+                               repeat=1),
+        'workers=all': time_call(ShortestPath.all_pairs, graph, range(64),
+                                 None, repeat=1),
+    })
+
+
+def bench_parallel() -> None:
+    for size in (2000, 4000, 8000):
+        graph = random_directed_graph(size, dtype=np.uint8)
+        report('count_odd_neighbours', size, {
+            'serial': time_call(
+                AdjacencyMatrix.count_odd_neighbours_undirected_graph, graph),
+            'workers=1': time_call(ParallelGraph.count_odd_neighbours_matrix,
+                                   graph, 1),
+            'workers=all': time_call(
+                ParallelGraph.count_odd_neighbours_matrix, graph, None),
+        })
+
+
+BENCHMARKS = {
+    'adjacency_matrix': bench_adjacency_matrix,
+    'shortest_path': bench_shortest_path,
+    'parallel': bench_parallel,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help='benchmarks to run, one of %s (default: all)'
+                             % ', '.join(BENCHMARKS))
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmark(s): %s' % ', '.join(sorted(unknown)))
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
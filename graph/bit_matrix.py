@@ -0,0 +1,161 @@
+import numpy as np
+
+# Number of set bits in every possible byte
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class BitAdjacencyMatrix(object):
+    """
+    A graph in bit-packed adjacency matrix format. Row i of the matrix is
+    stored as np.packbits of adj_matrix[i], so every possible edge takes a
+    single bit instead of the 8 to 64 bits of an unpacked matrix.
+    """
+
+    # Upper bound on the number of bytes unpacked at once by
+    # invert_directed_graph
+    BLOCK_BYTES = 1 << 26
+
+    def __init__(self, bits: np.ndarray, n: int):
+        """
+        Wraps an existing array of packed rows, without copying it
+
+        :param bits: uint8 array of shape (n, ceil(n / 8)), where bit j of
+        row i (in big-endian bit order) indicates an edge from i to j
+        :param n: The number of vertices
+        """
+
+        self.bits = np.asarray(bits, dtype=np.uint8)
+        self.n = n
+
+    @staticmethod
+    def from_matrix(adj_matrix: np.array) -> 'BitAdjacencyMatrix':
+        """
+        Accepts a graph in the adjacency matrix format, and returns it in the
+        bit-packed adjacency matrix format.
+
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        :return: BitAdjacencyMatrix, representing the same graph
+        """
+
+        adj_matrix = np.asarray(adj_matrix)
+        return BitAdjacencyMatrix(np.packbits(adj_matrix != 0, axis=1),
+                                  len(adj_matrix))
+
+    def to_matrix(self, dtype: np.dtype = np.uint8) -> np.array:
+        """
+        Returns the graph in the adjacency matrix format.
+
+        :param dtype: The dtype of the returned matrix
+        :return: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        """
+
+        matrix = np.unpackbits(self.bits, axis=1, count=self.n)
+        return matrix.astype(dtype, copy=False)
+
+    def count_vertices_undirected_graph(self) -> int:
+        """
+        Counts the number of vertices in an undirected graph
+
+        :return: int, the number of vertices
+        """
+
+        return self.n
+
+    def count_edges_undirected_graph(self) -> int:
+        """
+        Counts the number of edges in an undirected graph
+
+        :return: int, the number of edges
+        """
+
+        return self.count_edges_directed_graph() // 2
+
+    def count_vertices_directed_graph(self) -> int:
+        """
+        Counts the number of vertices in a directed graph
+
+        :return: int, the number of vertices
+        """
+
+        return self.n
+
+    def count_edges_directed_graph(self) -> int:
+        """
+        Counts the number of edges in a directed graph
+
+        :return: int, the number of edges
+        """
+
+        return int(POPCOUNT[self.bits].sum(dtype=np.int64))
+
+    def degrees(self) -> np.ndarray:
+        """
+        Computes the (out-)degree of every vertex
+
+        :return: numpy array, where element i is the degree of vertex i
+        """
+
+        return POPCOUNT[self.bits].sum(axis=1, dtype=np.int64)
+
+    def count_odd_neighbours_undirected_graph(self) -> int:
+        """
+        Counts the number of vertices that have an odd number of neighbours
+
+        :return: int, the number of vertices that have an odd number of
+        neighbours
+        """
+
+        if self.bits.shape[1] == 0:
+            return 0
+        # The parity of the popcount of a row equals the parity of the
+        # popcount of the xor of all its bytes
+        folded = np.bitwise_xor.reduce(self.bits, axis=1)
+        return int(np.count_nonzero(POPCOUNT[folded] & 1))
+
+    def has_edge(self, i: int, j: int) -> bool:
+        """
+        Returns whether there is an edge from vertex i to vertex j
+
+        :param i: The source vertex
+        :param j: The target vertex
+        :return: true iff the edge exists
+        """
+
+        return bool((self.bits[i, j >> 3] >> (7 - (j & 7))) & 1)
+
+    def neighbours(self, vertex: int) -> np.ndarray:
+        """
+        Returns the neighbours of a vertex
+
+        :param vertex: The vertex to look up
+        :return: numpy array with the neighbours of vertex, in increasing
+        order
+        """
+
+        return np.flatnonzero(np.unpackbits(self.bits[vertex], count=self.n))
+
+    def invert_directed_graph(self) -> 'BitAdjacencyMatrix':
+        """
+        Inverts the graph in such a way, that each edge is switched
+        direction, i.e., an edge from i to j becomes an edge from j to i.
+        The transpose is computed in blocks of columns, so at most
+        BLOCK_BYTES of unpacked data exist at any time.
+
+        :return: BitAdjacencyMatrix, representing the inverted graph
+        """
+
+        n = self.n
+        inverted = np.zeros_like(self.bits)
+        # Width of a block in packed bytes, i.e. 8 columns per byte
+        block = max(1, self.BLOCK_BYTES // (8 * max(n, 1)))
+        for start in range(0, self.bits.shape[1], block):
+            stop = min(start + block, self.bits.shape[1])
+            columns = np.unpackbits(self.bits[:, start:stop], axis=1)
+            columns = columns[:, :n - 8 * start]
+            inverted[8 * start:8 * start + columns.shape[1]] = \
+                np.packbits(columns.T, axis=1)
+        return BitAdjacencyMatrix(inverted, n)
@@ -0,0 +1,231 @@
+import itertools
+import numpy as np
+import typing
+
+
+def index_dtype(n: int) -> np.dtype:
+    """
+    Returns the smallest integer dtype that can index n elements
+
+    :param n: The number of elements that need to be addressed
+    :return: np.int32 if it suffices, np.int64 otherwise
+    """
+
+    return np.dtype(np.int32) if n < np.iinfo(np.int32).max else \
+        np.dtype(np.int64)
+
+
+class CSRGraph(object):
+    """
+    A graph in compressed sparse row format. The neighbours of vertex i are
+    stored in indices[indptr[i]:indptr[i + 1]], so the graph takes O(V + E)
+    memory instead of the O(V^2) of the adjacency matrix format. A weighted
+    graph stores the weight of every edge at the same position in weights.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray,
+                 weights: typing.Optional[np.ndarray] = None):
+        """
+        Wraps existing indptr/indices(/weights) arrays, without copying them
+
+        :param indptr: Array of length V + 1 with the offset of the
+        neighbours of every vertex in indices
+        :param indices: Array of length E with the neighbours of all vertices
+        :param weights: Optional array of length E with the weight of every
+        edge in indices
+        """
+
+        self.indptr = np.asanyarray(indptr)
+        self.indices = np.asanyarray(indices)
+        self.weights = None if weights is None else np.asanyarray(weights)
+
+    def count_vertices_undirected_graph(self) -> int:
+        """
+        Counts the number of vertices in an undirected graph
+
+        :return: int, the number of vertices
+        """
+
+        return len(self.indptr) - 1
+
+    def count_edges_undirected_graph(self) -> int:
+        """
+        Counts the number of edges in an undirected graph
+
+        :return: int, the number of edges
+        """
+
+        return int(self.indptr[-1]) // 2
+
+    def count_vertices_directed_graph(self) -> int:
+        """
+        Counts the number of vertices in a directed graph
+
+        :return: int, the number of vertices
+        """
+
+        return len(self.indptr) - 1
+
+    def count_edges_directed_graph(self) -> int:
+        """
+        Counts the number of edges in a directed graph
+
+        :return: int, the number of edges
+        """
+
+        return int(self.indptr[-1])
+
+    def degrees(self) -> np.ndarray:
+        """
+        Computes the (out-)degree of every vertex
+
+        :return: numpy array, where element i is the degree of vertex i
+        """
+
+        return np.diff(self.indptr)
+
+    def count_odd_neighbours_undirected_graph(self) -> int:
+        """
+        Counts the number of vertices that have an odd number of neighbours
+
+        :return: int, the number of vertices that have an odd number of
+        neighbours
+        """
+
+        return int(np.count_nonzero(self.degrees() & 1))
+
+    def neighbours(self, vertex: int) -> np.ndarray:
+        """
+        Returns the neighbours of a vertex as a view on indices
+
+        :param vertex: The vertex to look up
+        :return: numpy array with the neighbours of vertex
+        """
+
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def neighbour_weights(self, vertex: int) -> np.ndarray:
+        """
+        Returns the weights of the edges of a vertex as a view on weights,
+        in the same order as neighbours(vertex). Unweighted graphs have a
+        weight of 1 for every edge.
+
+        :param vertex: The vertex to look up
+        :return: numpy array with the weights of the edges of vertex
+        """
+
+        start, stop = self.indptr[vertex], self.indptr[vertex + 1]
+        if self.weights is None:
+            return np.ones(stop - start)
+        return self.weights[start:stop]
+
+    def invert_directed_graph(self) -> 'CSRGraph':
+        """
+        Inverts the graph in such a way, that each edge is switched
+        direction, i.e., an edge from i to j becomes an edge from j to i.
+
+        :return: CSRGraph, representing the inverted graph
+        """
+
+        n = self.count_vertices_directed_graph()
+        dtype = self.indices.dtype
+        counts = np.bincount(self.indices, minlength=n)
+        indptr = np.zeros(n + 1, dtype=self.indptr.dtype)
+        np.cumsum(counts, out=indptr[1:])
+
+        # A stable sort on the targets keeps the sources of every target in
+        # increasing order, like a row of the transposed matrix
+        sources = np.repeat(np.arange(n, dtype=dtype), self.degrees())
+        order = np.argsort(self.indices, kind='stable')
+        weights = None if self.weights is None else self.weights[order]
+        return CSRGraph(indptr, sources[order], weights)
+
+    @staticmethod
+    def from_matrix(adj_matrix: np.array,
+                    weighted: bool = False) -> 'CSRGraph':
+        """
+        Accepts a graph in the adjacency matrix format, and returns it in the
+        compressed sparse row format.
+
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        :param weighted: If true, every nonzero adj_matrix[i][j] is the
+        weight of the edge between vertex i and j
+        :return: CSRGraph, representing the same graph
+        """
+
+        adj_matrix = np.asarray(adj_matrix)
+        n = len(adj_matrix)
+        counts = np.count_nonzero(adj_matrix, axis=1)
+        dtype = index_dtype(max(n, int(counts.sum())))
+        indptr = np.zeros(n + 1, dtype=dtype)
+        np.cumsum(counts, out=indptr[1:])
+        # np.nonzero returns the coordinates in row-major order
+        rows, cols = np.nonzero(adj_matrix)
+        weights = adj_matrix[rows, cols] if weighted else None
+        return CSRGraph(indptr, cols.astype(dtype, copy=False), weights)
+
+    def to_matrix(self, dtype: np.dtype = np.uint8) -> np.array:
+        """
+        Returns the graph in the adjacency matrix format.
+
+        :param dtype: The dtype of the returned matrix
+        :return: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j, or holds its weight for weighted graphs
+        """
+
+        n = self.count_vertices_directed_graph()
+        matrix = np.zeros((n, n), dtype=dtype)
+        rows = np.repeat(np.arange(n), self.degrees())
+        matrix[rows, self.indices] = 1 if self.weights is None \
+            else self.weights
+        return matrix
+
+    @staticmethod
+    def from_list(
+            adj_list: typing.Dict[int, typing.List[int]],
+            weights: typing.Optional[typing.Dict[int, typing.List[float]]]
+            = None) -> 'CSRGraph':
+        """
+        Accepts a graph in the adjacency list format, and returns it in the
+        compressed sparse row format. The vertices are expected to be
+        numbered 0..V-1.
+
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        :param weights: Optional weights, where weights[i][k] is the weight
+        of the edge from i to adj_list[i][k]
+        :return: CSRGraph, representing the same graph
+        """
+
+        n = len(adj_list)
+        rows = [adj_list[i] for i in range(n)]
+        counts = np.fromiter((len(row) for row in rows), dtype=np.int64,
+                             count=n)
+        n_edges = int(counts.sum())
+        dtype = index_dtype(max(n, n_edges))
+        indptr = np.zeros(n + 1, dtype=dtype)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.fromiter(itertools.chain.from_iterable(rows),
+                              dtype=dtype, count=n_edges)
+        if weights is not None:
+            weights = np.fromiter(itertools.chain.from_iterable(
+                weights[i] for i in range(n)), dtype=np.float64,
+                count=n_edges)
+        return CSRGraph(indptr, indices, weights)
+
+    def to_list(self) -> typing.Dict[int, np.ndarray]:
+        """
+        Returns the graph in the adjacency list format. The neighbour lists
+        are views on indices, so no edge data is copied.
+
+        :return: The graph in adjacency list format, where adj_list[i]
+        consists of an array, where each element of that array indicates an
+        edge to a specific vertex
+        """
+
+        return {i: self.neighbours(i)
+                for i in range(self.count_vertices_directed_graph())}
@@ -0,0 +1,173 @@
+import numpy as np
+import typing
+
+
+class DynamicGraph(object):
+    """
+    A mutable graph that keeps its counters up to date on every change.
+    The degree of every vertex, the number of edges and the number of
+    vertices with an odd number of neighbours are adjusted by add_edge and
+    remove_edge, so querying them is O(1). Vertices are numbered 0..V-1,
+    and adding an edge to a new vertex adds all vertices up to it.
+    """
+
+    def __init__(self, n_vertices: int = 0, directed: bool = False):
+        """
+        Creates a graph without edges
+
+        :param n_vertices: The initial number of vertices
+        :param directed: Whether edges have a direction. For directed
+        graphs the degree of a vertex is its number of outgoing edges.
+        """
+
+        self.directed = directed
+        self._adj = [set() for _ in range(n_vertices)]
+        self._degrees = np.zeros(max(n_vertices, 16), dtype=np.int64)
+        self._n_edges = 0
+        self._n_odd = 0
+
+    def _grow(self, n_vertices: int) -> None:
+        if n_vertices > len(self._degrees):
+            # Double the capacity, so growing is amortized O(1) per vertex
+            degrees = np.zeros(max(n_vertices, 2 * len(self._degrees)),
+                               dtype=np.int64)
+            degrees[:len(self._adj)] = self._degrees[:len(self._adj)]
+            self._degrees = degrees
+        while len(self._adj) < n_vertices:
+            self._adj.append(set())
+
+    def _change_degree(self, vertex: int, delta: int) -> None:
+        self._degrees[vertex] += delta
+        # A change of one always flips the parity of the degree
+        self._n_odd += 1 if self._degrees[vertex] % 2 else -1
+
+    def add_edge(self, u: int, v: int) -> bool:
+        """
+        Adds an edge from u to v (and from v to u in undirected graphs)
+
+        :param u: The vertex the edge starts in
+        :param v: The vertex the edge ends in
+        :return: true upon success, false if the edge already exists
+        """
+
+        self._grow(max(u, v) + 1)
+        if v in self._adj[u]:
+            return False
+        self._adj[u].add(v)
+        self._change_degree(u, 1)
+        if not self.directed and u != v:
+            self._adj[v].add(u)
+            self._change_degree(v, 1)
+        self._n_edges += 1
+        return True
+
+    def remove_edge(self, u: int, v: int) -> bool:
+        """
+        Removes the edge from u to v (and from v to u in undirected graphs)
+
+        :param u: The vertex the edge starts in
+        :param v: The vertex the edge ends in
+        :return: true upon success, false if the edge does not exist
+        """
+
+        if u >= len(self._adj) or v not in self._adj[u]:
+            return False
+        self._adj[u].remove(v)
+        self._change_degree(u, -1)
+        if not self.directed and u != v:
+            self._adj[v].remove(u)
+            self._change_degree(v, -1)
+        self._n_edges -= 1
+        return True
+
+    def has_edge(self, u: int, v: int) -> bool:
+        """
+        Returns whether there is an edge from u to v
+
+        :param u: The vertex the edge starts in
+        :param v: The vertex the edge ends in
+        :return: true iff the edge exists
+        """
+
+        return u < len(self._adj) and v in self._adj[u]
+
+    def count_vertices(self) -> int:
+        """
+        Counts the number of vertices
+
+        :return: int, the number of vertices
+        """
+
+        return len(self._adj)
+
+    def count_edges(self) -> int:
+        """
+        Counts the number of edges
+
+        :return: int, the number of edges
+        """
+
+        return self._n_edges
+
+    def count_odd_neighbours(self) -> int:
+        """
+        Counts the number of vertices that have an odd number of neighbours
+
+        :return: int, the number of vertices that have an odd number of
+        neighbours
+        """
+
+        return self._n_odd
+
+    def degree(self, vertex: int) -> int:
+        """
+        Returns the number of neighbours of a vertex
+
+        :param vertex: The vertex to look up
+        :return: int, the degree of vertex
+        """
+
+        return int(self._degrees[vertex])
+
+    def degrees(self) -> np.ndarray:
+        """
+        Returns the degree of every vertex, as a read-only view
+
+        :return: numpy array, where element i is the degree of vertex i
+        """
+
+        degrees = self._degrees[:len(self._adj)]
+        degrees.flags.writeable = False
+        return degrees
+
+    @staticmethod
+    def from_list(adj_list: typing.Dict[int, typing.List[int]],
+                  directed: bool = False) -> 'DynamicGraph':
+        """
+        Accepts a graph in the adjacency list format, and returns it as a
+        DynamicGraph. The vertices are expected to be numbered 0..V-1.
+
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        :param directed: Whether edges have a direction
+        :return: DynamicGraph, representing the same graph
+        """
+
+        graph = DynamicGraph(len(adj_list), directed)
+        for u, neighbours in adj_list.items():
+            for v in neighbours:
+                graph.add_edge(u, v)
+        return graph
+
+    def to_list(self) -> typing.Dict[int, typing.List[int]]:
+        """
+        Returns the graph in the adjacency list format.
+
+        :return: The graph in adjacency list format, where adj_list[i]
+        consists of a list, where each element of that list indicates an
+        edge to a specific vertex
+        """
+
+        return {u: sorted(neighbours)
+                for u, neighbours in enumerate(self._adj)}
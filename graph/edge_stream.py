@@ -0,0 +1,228 @@
+import collections
+import itertools
+import numpy as np
+import os
+import typing
+
+from csr_graph import CSRGraph, index_dtype
+from graph_storage import GraphStorage
+
+EdgeSource = typing.Union[str, os.PathLike,
+                          typing.Iterable[typing.Tuple[int, int]]]
+
+
+class EdgeStream(object):
+    """
+    Builds graphs from edge lists without materializing the list of edges.
+    An edge source is either the path of a text file with one `u v` (or,
+    with a delimiter, `u,v`) pair per line, or an iterable of (u, v)
+    tuples. Sources are consumed in chunks of at most chunk_size edges,
+    which are accumulated straight into the output graph.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    @staticmethod
+    def read_chunks(source: EdgeSource,
+                    chunk_size: int = CHUNK_SIZE,
+                    delimiter: typing.Optional[str] = None,
+                    comments: str = '#',
+                    directed: bool = True) -> typing.Iterator[np.ndarray]:
+        """
+        Reads an edge source in chunks
+
+        :param source: The path of an edge-list file, or an iterable of
+        (u, v) tuples
+        :param chunk_size: The maximum number of edges per chunk
+        :param delimiter: The column delimiter of an edge-list file, e.g.
+        ',' for CSV. Defaults to any whitespace.
+        :param comments: Lines of an edge-list file starting with this
+        prefix are skipped
+        :param directed: If false, every chunk also contains the reverse of
+        each edge
+        :return: iterator of int64 arrays of shape (k, 2), one row per edge
+        """
+
+        if isinstance(source, (str, os.PathLike)):
+            chunks = EdgeStream._read_file(source, chunk_size, delimiter,
+                                           comments)
+        else:
+            chunks = EdgeStream._read_pairs(source, chunk_size)
+        for chunk in chunks:
+            if not directed:
+                chunk = np.concatenate([chunk, chunk[:, ::-1]])
+            yield chunk
+
+    @staticmethod
+    def _read_file(path: typing.Union[str, os.PathLike], chunk_size: int,
+                   delimiter: typing.Optional[str], comments: str) \
+            -> typing.Iterator[np.ndarray]:
+        with open(path) as f:
+            lines = (line for line in f
+                     if line.strip() and not line.startswith(comments))
+            while True:
+                chunk = list(itertools.islice(lines, chunk_size))
+                if not chunk:
+                    return
+                yield np.loadtxt(chunk, dtype=np.int64, delimiter=delimiter,
+                                 usecols=(0, 1), ndmin=2)
+
+    @staticmethod
+    def _read_pairs(pairs: typing.Iterable[typing.Tuple[int, int]],
+                    chunk_size: int) -> typing.Iterator[np.ndarray]:
+        pairs = iter(pairs)
+        while True:
+            flat = itertools.chain.from_iterable(
+                itertools.islice(pairs, chunk_size))
+            chunk = np.fromiter(flat, dtype=np.int64).reshape(-1, 2)
+            if len(chunk) == 0:
+                return
+            yield chunk
+
+    @staticmethod
+    def _accumulate_degrees(chunks: typing.Iterable[np.ndarray],
+                            n_vertices: int = 0) -> np.ndarray:
+        degrees = np.zeros(n_vertices, dtype=np.int64)
+        for chunk in chunks:
+            # Vertices that only occur as a target still get a degree of 0
+            n = max(len(degrees), int(chunk.max()) + 1)
+            counts = np.bincount(chunk[:, 0], minlength=n)
+            counts[:len(degrees)] += degrees
+            degrees = counts
+        return degrees
+
+    @staticmethod
+    def count_degrees(source: EdgeSource, n_vertices: int = 0,
+                      directed: bool = True, **kwargs) -> np.ndarray:
+        """
+        Computes the (out-)degree of every vertex in an edge source
+
+        :param source: The path of an edge-list file, or an iterable of
+        (u, v) tuples
+        :param n_vertices: The minimum number of vertices
+        :param directed: If false, each edge counts for both endpoints
+        :param kwargs: Passed on to EdgeStream.read_chunks
+        :return: numpy array, where element i is the degree of vertex i
+        """
+
+        return EdgeStream._accumulate_degrees(
+            EdgeStream.read_chunks(source, directed=directed, **kwargs),
+            n_vertices)
+
+    @staticmethod
+    def to_list(source: EdgeSource, directed: bool = True, **kwargs) \
+            -> typing.Dict[int, typing.List[int]]:
+        """
+        Builds a graph in adjacency list format from an edge source. Every
+        vertex that occurs in an edge gets an entry.
+
+        :param source: The path of an edge-list file, or an iterable of
+        (u, v) tuples
+        :param directed: If false, each edge is added in both directions
+        :param kwargs: Passed on to EdgeStream.read_chunks
+        :return: The graph in adjacency list format, where adj_list[i]
+        consists of a list, where each element of that list indicates an
+        edge to a specific vertex
+        """
+
+        adj_list = collections.defaultdict(list)
+        for chunk in EdgeStream.read_chunks(source, directed=directed,
+                                            **kwargs):
+            for u, v in chunk.tolist():
+                adj_list[u].append(v)
+                if v not in adj_list:
+                    adj_list[v] = []
+        return dict(adj_list)
+
+    @staticmethod
+    def to_matrix(source: EdgeSource, n_vertices: int = 0,
+                  directed: bool = True, dtype: np.dtype = np.uint8,
+                  **kwargs) -> np.array:
+        """
+        Builds a graph in adjacency matrix format from an edge source. The
+        matrix grows if a vertex >= n_vertices occurs.
+
+        :param source: The path of an edge-list file, or an iterable of
+        (u, v) tuples
+        :param n_vertices: The expected number of vertices
+        :param directed: If false, each edge is added in both directions
+        :param dtype: The dtype of the returned matrix
+        :param kwargs: Passed on to EdgeStream.read_chunks
+        :return: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        """
+
+        matrix = np.zeros((n_vertices, n_vertices), dtype=dtype)
+        for chunk in EdgeStream.read_chunks(source, directed=directed,
+                                            **kwargs):
+            n_vertices = max(n_vertices, int(chunk.max()) + 1)
+            if n_vertices > len(matrix):
+                # Double the capacity, so a growing id range costs amortized
+                # O(1) copies per matrix entry instead of one per chunk
+                grown = np.zeros((max(n_vertices, 2 * len(matrix)),) * 2,
+                                 dtype=dtype)
+                grown[:len(matrix), :len(matrix)] = matrix
+                matrix = grown
+            matrix[chunk[:, 0], chunk[:, 1]] = 1
+        return matrix[:n_vertices, :n_vertices]
+
+    @staticmethod
+    def to_csr(source: EdgeSource, n_vertices: int = 0,
+               directed: bool = True,
+               path: typing.Optional[str] = None, **kwargs) -> CSRGraph:
+        """
+        Builds a CSRGraph from an edge source. A file source is read twice,
+        once to count the degrees and once to place the edges, so only the
+        output graph is held in memory (or, with path, not even that).
+        Other sources can only be read once, so their chunks are buffered
+        as compact int arrays.
+
+        :param source: The path of an edge-list file, or an iterable of
+        (u, v) tuples
+        :param n_vertices: The minimum number of vertices
+        :param directed: If false, each edge is added in both directions
+        :param path: If given, the graph is written to this graph file (see
+        GraphStorage) instead of being kept in memory
+        :param kwargs: Passed on to EdgeStream.read_chunks
+        :return: CSRGraph, with the neighbours of every vertex in input order
+        """
+
+        if isinstance(source, (str, os.PathLike)):
+            def read():
+                return EdgeStream.read_chunks(source, directed=directed,
+                                              **kwargs)
+        else:
+            buffered = list(EdgeStream.read_chunks(source, directed=directed,
+                                                   **kwargs))
+
+            def read():
+                return iter(buffered)
+
+        degrees = EdgeStream._accumulate_degrees(read(), n_vertices)
+        n = len(degrees)
+        n_edges = int(degrees.sum())
+        if path is None:
+            dtype = index_dtype(max(n, n_edges))
+            graph = CSRGraph(np.zeros(n + 1, dtype=dtype),
+                             np.zeros(n_edges, dtype=dtype))
+        else:
+            graph = GraphStorage.create_csr(path, n, n_edges)
+        np.cumsum(degrees, out=graph.indptr[1:])
+
+        # Next free slot in indices for every vertex
+        cursor = graph.indptr[:-1].astype(np.int64)
+        for chunk in read():
+            order = np.argsort(chunk[:, 0], kind='stable')
+            sources = chunk[order, 0]
+            # Rank of every edge among the edges of its source in this chunk
+            starts = np.searchsorted(sources, sources)
+            positions = cursor[sources] + np.arange(len(sources)) - starts
+            graph.indices[positions] = chunk[order, 1]
+            cursor += np.bincount(sources, minlength=n)
+
+        if path is not None:
+            graph.indptr.flush()
+            if isinstance(graph.indices, np.memmap):
+                graph.indices.flush()
+        return graph
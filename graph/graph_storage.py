@@ -0,0 +1,260 @@
+import numpy as np
+import typing
+
+from csr_graph import CSRGraph, index_dtype
+
+############################################################################
+# Binary on-disk graph format. A file starts with a 64 byte header,
+# followed by either a dense row-major adjacency matrix, or the indptr and
+# indices (and, for a weighted graph, weights) arrays of a CSRGraph, each
+# starting at an 8 byte boundary.
+# Files are opened with np.memmap, so graphs larger than memory can be
+# used directly, and processes opening the same file read-only share one
+# page-cached copy of it.
+############################################################################
+
+MAGIC = b'GRAPHBIN'
+VERSION = 1
+KIND_MATRIX = 0
+KIND_CSR = 1
+
+HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('kind', '<u4'),
+    ('n_vertices', '<u8'),
+    ('n_edges', '<u8'),
+    ('dtype', 'S8'),
+    # dtype of the CSR weights, empty for an unweighted graph
+    ('weights', 'S8'),
+    ('reserved', 'S16'),
+])
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+class GraphStorage(object):
+
+    @staticmethod
+    def _write_header(path: str, kind: int, n_vertices: int, n_edges: int,
+                      dtype: np.dtype,
+                      weights_dtype: typing.Optional[np.dtype] = None) \
+            -> None:
+        header = np.zeros((), dtype=HEADER)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['kind'] = kind
+        header['n_vertices'] = n_vertices
+        header['n_edges'] = n_edges
+        header['dtype'] = np.dtype(dtype).str.encode('ascii')
+        if weights_dtype is not None:
+            header['weights'] = np.dtype(weights_dtype).str.encode('ascii')
+        with open(path, 'wb') as f:
+            f.write(header.tobytes())
+
+    @staticmethod
+    def read_header(path: str) -> np.void:
+        """
+        Reads and validates the header of a graph file
+
+        :param path: The path of the graph file
+        :return: structured numpy scalar with the HEADER fields
+        """
+
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if len(header) != 1 or header[0]['magic'] != MAGIC:
+            raise ValueError('%s is not a graph file' % path)
+        if header[0]['version'] != VERSION:
+            raise ValueError('%s has unsupported version %d'
+                             % (path, header[0]['version']))
+        return header[0]
+
+    @staticmethod
+    def create_matrix(path: str, n_vertices: int,
+                      dtype: np.dtype = np.uint8) -> np.memmap:
+        """
+        Creates a graph file holding an empty adjacency matrix, and maps it
+        into memory so it can be filled in place.
+
+        :param path: The path of the graph file
+        :param n_vertices: The number of vertices
+        :param dtype: The dtype of the matrix
+        :return: writable memory-mapped adjacency matrix
+        """
+
+        GraphStorage._write_header(path, KIND_MATRIX, n_vertices, 0, dtype)
+        return np.memmap(path, dtype=dtype, mode='r+',
+                         offset=HEADER.itemsize,
+                         shape=(n_vertices, n_vertices))
+
+    @staticmethod
+    def save_matrix(path: str, adj_matrix: np.array) -> None:
+        """
+        Writes a graph in adjacency matrix format to a graph file
+
+        :param path: The path of the graph file
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        """
+
+        adj_matrix = np.asarray(adj_matrix)
+        matrix = GraphStorage.create_matrix(path, len(adj_matrix),
+                                            adj_matrix.dtype)
+        matrix[:] = adj_matrix
+        matrix.flush()
+
+    @staticmethod
+    def load_matrix(path: str, mode: str = 'r') -> np.memmap:
+        """
+        Maps the adjacency matrix in a graph file into memory. The result
+        can be passed to all AdjacencyMatrix functions.
+
+        :param path: The path of the graph file
+        :param mode: The np.memmap mode, 'r' for read-only, 'c' for
+        copy-on-write or 'r+' for writing through to the file
+        :return: memory-mapped adjacency matrix
+        """
+
+        header = GraphStorage.read_header(path)
+        if header['kind'] != KIND_MATRIX:
+            raise ValueError('%s does not hold an adjacency matrix' % path)
+        n = int(header['n_vertices'])
+        return np.memmap(path, dtype=np.dtype(header['dtype'].decode()),
+                         mode=mode, offset=HEADER.itemsize, shape=(n, n))
+
+    @staticmethod
+    def _csr_layout(n_vertices: int, n_edges: int, dtype: np.dtype) \
+            -> typing.Tuple[int, int, int]:
+        indptr_offset = HEADER.itemsize
+        indices_offset = _aligned(indptr_offset +
+                                  (n_vertices + 1) * dtype.itemsize)
+        weights_offset = _aligned(indices_offset + n_edges * dtype.itemsize)
+        return indptr_offset, indices_offset, weights_offset
+
+    @staticmethod
+    def _map_csr(path: str, n_vertices: int, n_edges: int, dtype: np.dtype,
+                 weights_dtype: typing.Optional[np.dtype],
+                 mode: str) -> CSRGraph:
+        indptr_offset, indices_offset, weights_offset = \
+            GraphStorage._csr_layout(n_vertices, n_edges, dtype)
+        indptr = np.memmap(path, dtype=dtype, mode=mode,
+                           offset=indptr_offset, shape=(n_vertices + 1,))
+        if n_edges == 0:
+            # np.memmap cannot map zero bytes
+            weights = None if weights_dtype is None else \
+                np.zeros(0, dtype=weights_dtype)
+            return CSRGraph(indptr, np.zeros(0, dtype=dtype), weights)
+        indices = np.memmap(path, dtype=dtype, mode=mode,
+                            offset=indices_offset, shape=(n_edges,))
+        weights = None if weights_dtype is None else \
+            np.memmap(path, dtype=weights_dtype, mode=mode,
+                      offset=weights_offset, shape=(n_edges,))
+        return CSRGraph(indptr, indices, weights)
+
+    @staticmethod
+    def create_csr(path: str, n_vertices: int, n_edges: int,
+                   dtype: typing.Optional[np.dtype] = None,
+                   weights_dtype: typing.Optional[np.dtype] = None) \
+            -> CSRGraph:
+        """
+        Creates a graph file holding a zeroed CSRGraph, and maps it into
+        memory so its indptr, indices and weights can be filled in place.
+
+        :param path: The path of the graph file
+        :param n_vertices: The number of vertices
+        :param n_edges: The number of (directed) edges
+        :param dtype: The dtype of indptr and indices, by default the
+        smallest one that fits
+        :param weights_dtype: The dtype of the edge weights, None for an
+        unweighted graph
+        :return: writable CSRGraph backed by the file
+        """
+
+        dtype = np.dtype(dtype or index_dtype(max(n_vertices, n_edges)))
+        if weights_dtype is not None:
+            weights_dtype = np.dtype(weights_dtype)
+        GraphStorage._write_header(path, KIND_CSR, n_vertices, n_edges, dtype,
+                                   weights_dtype)
+        # Mapping in 'r+' mode extends the file to the size of the arrays
+        return GraphStorage._map_csr(path, n_vertices, n_edges, dtype,
+                                     weights_dtype, 'r+')
+
+    @staticmethod
+    def save_csr(path: str, graph: CSRGraph) -> None:
+        """
+        Writes a CSRGraph, including its weights if it has any, to a graph
+        file
+
+        :param path: The path of the graph file
+        :param graph: The graph to write
+        """
+
+        weighted = graph.weights is not None
+        stored = GraphStorage.create_csr(
+            path, graph.count_vertices_directed_graph(),
+            graph.count_edges_directed_graph(),
+            np.promote_types(graph.indptr.dtype, graph.indices.dtype),
+            graph.weights.dtype if weighted else None)
+        stored.indptr[:] = graph.indptr
+        stored.indices[:] = graph.indices
+        if weighted:
+            stored.weights[:] = graph.weights
+        for array in (stored.indptr, stored.indices, stored.weights):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    @staticmethod
+    def save_list(path: str,
+                  adj_list: typing.Dict[int, typing.List[int]]) -> None:
+        """
+        Writes a graph in adjacency list format to a graph file. The
+        vertices are expected to be numbered 0..V-1.
+
+        :param path: The path of the graph file
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        """
+
+        GraphStorage.save_csr(path, CSRGraph.from_list(adj_list))
+
+    @staticmethod
+    def load_csr(path: str, mode: str = 'r') -> CSRGraph:
+        """
+        Maps the CSRGraph in a graph file into memory. CSRGraph.to_list
+        on the result gives an adjacency list whose neighbour lists are
+        views on the file, which can be passed to the AdjacencyList
+        counting functions.
+
+        :param path: The path of the graph file
+        :param mode: The np.memmap mode, 'r' for read-only, 'c' for
+        copy-on-write or 'r+' for writing through to the file
+        :return: CSRGraph backed by the file
+        """
+
+        header = GraphStorage.read_header(path)
+        if header['kind'] != KIND_CSR:
+            raise ValueError('%s does not hold a CSR graph' % path)
+        weights_dtype = np.dtype(header['weights'].decode()) \
+            if header['weights'] else None
+        return GraphStorage._map_csr(
+            path, int(header['n_vertices']), int(header['n_edges']),
+            np.dtype(header['dtype'].decode()), weights_dtype, mode)
+
+    @staticmethod
+    def load(path: str, mode: str = 'r') \
+            -> typing.Union[np.memmap, CSRGraph]:
+        """
+        Maps a graph file into memory, whatever kind of graph it holds
+
+        :param path: The path of the graph file
+        :param mode: The np.memmap mode
+        :return: memory-mapped adjacency matrix or CSRGraph
+        """
+
+        if GraphStorage.read_header(path)['kind'] == KIND_MATRIX:
+            return GraphStorage.load_matrix(path, mode)
+        return GraphStorage.load_csr(path, mode)
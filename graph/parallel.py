@@ -0,0 +1,180 @@
+import concurrent.futures
+import numpy as np
+import os
+import typing
+from multiprocessing import shared_memory
+
+from csr_graph import CSRGraph
+from traversal import Traversal
+
+############################################################################
+# Opt-in parallel execution of whole-graph analytics. The vertex set is
+# split into contiguous ranges that are processed by a pool of worker
+# processes. The graph arrays are copied into shared memory once and
+# attached by every worker, instead of being pickled for every task.
+# Results are returned in vertex order, so they do not depend on the
+# number of workers or on scheduling.
+############################################################################
+
+Arrays = typing.Dict[str, np.ndarray]
+RangeFunction = typing.Callable[[Arrays, int, int], typing.Any]
+
+# The shared arrays attached by a worker process, and their memory blocks
+_worker_arrays = None
+_worker_blocks = None
+
+
+def _init_worker(descriptors: typing.Dict[str, typing.Tuple]) -> None:
+    global _worker_arrays, _worker_blocks
+    _worker_blocks = []
+    _worker_arrays = {}
+    for key, (name, shape, dtype) in descriptors.items():
+        block = shared_memory.SharedMemory(name=name)
+        _worker_blocks.append(block)
+        _worker_arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _run_range(func: RangeFunction, start: int, stop: int) -> typing.Any:
+    return func(_worker_arrays, start, stop)
+
+
+def _matrix_degrees(arrays: Arrays, start: int, stop: int) -> np.ndarray:
+    return np.sum(arrays['adj_matrix'][start:stop], axis=1)
+
+
+def _csr_graph(arrays: Arrays) -> CSRGraph:
+    return CSRGraph(arrays['indptr'], arrays['indices'])
+
+
+def _csr_bfs(arrays: Arrays, start: int, stop: int) -> np.ndarray:
+    graph = _csr_graph(arrays)
+    return np.array([Traversal.bfs_csr(graph, s)
+                     for s in arrays['sources'][start:stop]])
+
+
+class SharedArrays(object):
+    """
+    Context manager that copies a dict of arrays into shared memory blocks,
+    which are released again on exit.
+    """
+
+    def __init__(self, arrays: Arrays):
+        self.arrays = arrays
+        self.blocks = []
+        self.descriptors = {}
+
+    def __enter__(self) -> 'SharedArrays':
+        for key, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            # Shared memory blocks cannot be empty
+            block = shared_memory.SharedMemory(create=True,
+                                               size=max(1, array.nbytes))
+            self.blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype,
+                       buffer=block.buf)[...] = array
+            self.descriptors[key] = (block.name, array.shape,
+                                     array.dtype.str)
+        return self
+
+    def __exit__(self, *args) -> None:
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+class ParallelGraph(object):
+
+    @staticmethod
+    def map_vertex_ranges(func: RangeFunction, arrays: Arrays,
+                          n_vertices: int,
+                          max_workers: typing.Optional[int] = None,
+                          n_ranges: typing.Optional[int] = None) \
+            -> typing.List[typing.Any]:
+        """
+        Calls func(arrays, start, stop) for contiguous ranges of vertices
+        that together cover 0..n_vertices-1, in parallel worker processes.
+
+        :param func: Module-level function to call for every range. In the
+        workers, arrays holds views on shared memory, which must not be
+        written to.
+        :param arrays: The arrays func needs, by name
+        :param n_vertices: The number of vertices to split over the ranges
+        :param max_workers: The number of worker processes, by default the
+        number of CPUs. With 1 func is called in this process.
+        :param n_ranges: The number of ranges, by default 4 per worker
+        :return: list with the result of every range, in vertex order
+        """
+
+        max_workers = max_workers or os.cpu_count() or 1
+        n_ranges = max(1, min(n_ranges or 4 * max_workers, n_vertices))
+        bounds = np.linspace(0, n_vertices, n_ranges + 1).astype(int)
+        starts, stops = bounds[:-1].tolist(), bounds[1:].tolist()
+        if max_workers == 1:
+            return [func(arrays, start, stop)
+                    for start, stop in zip(starts, stops)]
+
+        with SharedArrays(arrays) as shared:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers, initializer=_init_worker,
+                    initargs=(shared.descriptors,)) as executor:
+                # executor.map yields the results in submission order
+                return list(executor.map(_run_range, [func] * n_ranges,
+                                         starts, stops))
+
+    @staticmethod
+    def degrees_matrix(adj_matrix: np.array,
+                       max_workers: typing.Optional[int] = None) \
+            -> np.ndarray:
+        """
+        Computes the (out-)degree of every vertex in parallel
+
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        :param max_workers: The number of worker processes
+        :return: numpy array, where element i is the degree of vertex i
+        """
+
+        return np.concatenate(ParallelGraph.map_vertex_ranges(
+            _matrix_degrees, {'adj_matrix': adj_matrix}, len(adj_matrix),
+            max_workers))
+
+    @staticmethod
+    def count_odd_neighbours_matrix(
+            adj_matrix: np.array,
+            max_workers: typing.Optional[int] = None) -> int:
+        """
+        Counts the number of vertices that have an odd number of neighbours
+        in parallel
+
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        :param max_workers: The number of worker processes
+        :return: int, the number of vertices that have an odd number of
+        neighbours
+        """
+
+        degrees = ParallelGraph.degrees_matrix(adj_matrix, max_workers)
+        return int(np.count_nonzero(degrees % 2))
+
+    @staticmethod
+    def bfs_csr(graph: CSRGraph, sources: typing.Sequence[int],
+                max_workers: typing.Optional[int] = None) -> np.ndarray:
+        """
+        Runs a breadth-first search from many sources in parallel
+
+        :param graph: The graph in compressed sparse row format
+        :param sources: The vertices to start from
+        :param max_workers: The number of worker processes
+        :return: numpy array where element [i][j] is the hop distance from
+        the i-th source to vertex j, or -1 if j cannot be reached
+        """
+
+        arrays = {'indptr': graph.indptr, 'indices': graph.indices,
+                  'sources': np.asarray(sources, dtype=np.int64)}
+        rows = ParallelGraph.map_vertex_ranges(_csr_bfs, arrays,
+                                               len(sources), max_workers)
+        return np.concatenate(rows).reshape(
+            len(sources), graph.count_vertices_directed_graph())
@@ -0,0 +1,220 @@
+import concurrent.futures
+import heapq
+import numpy as np
+import os
+import typing
+
+from csr_graph import CSRGraph
+
+############################################################################
+# Shortest paths in weighted graphs. A nonzero adj_matrix[i][j] is the
+# weight of the edge from i to j, and the adjacency list format gets a
+# parallel weights dict, where weights[i][k] belongs to the edge from i to
+# adj_list[i][k]. All algorithms run on a CSRGraph; the other formats are
+# converted first. Weights must not be negative.
+############################################################################
+
+# The graph used by the worker processes of ShortestPath.all_pairs
+_worker_graph = None
+
+
+def _init_worker(graph: CSRGraph) -> None:
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _worker_distances(source: int) -> np.ndarray:
+    return ShortestPath.dijkstra(_worker_graph, source)[0]
+
+
+class ShortestPath(object):
+
+    @staticmethod
+    def _check_weights(graph: CSRGraph) -> None:
+        if graph.weights is not None and len(graph.weights) and \
+                graph.weights.min() < 0:
+            raise ValueError('Dijkstra requires non-negative weights')
+
+    @staticmethod
+    def dijkstra(graph: CSRGraph, source: int) \
+            -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the shortest paths from source to every vertex, using a
+        binary heap. Runs in O((V + E) log V).
+
+        :param graph: The graph in compressed sparse row format. Edges of an
+        unweighted graph have weight 1.
+        :param source: The vertex to start from
+        :return: a Tuple consisting of
+          - numpy array with the distance to every vertex, or inf for
+            vertices that cannot be reached
+          - numpy array with the predecessor of every vertex on its shortest
+            path, or -1 for the source and vertices that cannot be reached
+        """
+
+        ShortestPath._check_weights(graph)
+        n = graph.count_vertices_directed_graph()
+        distances = np.full(n, np.inf)
+        predecessors = np.full(n, -1, dtype=np.int64)
+        done = np.zeros(n, dtype=bool)
+        distances[source] = 0
+        heap = [(0.0, source)]
+        while heap:
+            distance, u = heapq.heappop(heap)
+            if done[u]:
+                # Stale entry for a vertex that was reached via a shorter path
+                continue
+            done[u] = True
+            for v, weight in zip(graph.neighbours(u).tolist(),
+                                 graph.neighbour_weights(u).tolist()):
+                candidate = distance + weight
+                if candidate < distances[v]:
+                    distances[v] = candidate
+                    predecessors[v] = u
+                    heapq.heappush(heap, (candidate, v))
+        return distances, predecessors
+
+    @staticmethod
+    def dijkstra_matrix(adj_matrix: np.array, source: int) \
+            -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the shortest paths from source to every vertex
+
+        :param adj_matrix: The graph in adjacency matrix format, where a
+        nonzero adj_matrix[i][j] is the weight of the edge between vertex i
+        and j
+        :param source: The vertex to start from
+        :return: distances and predecessors, see ShortestPath.dijkstra
+        """
+
+        return ShortestPath.dijkstra(
+            CSRGraph.from_matrix(adj_matrix, weighted=True), source)
+
+    @staticmethod
+    def dijkstra_list(adj_list: typing.Dict[int, typing.List[int]],
+                      weights: typing.Dict[int, typing.List[float]],
+                      source: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the shortest paths from source to every vertex
+
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        :param weights: The weights, where weights[i][k] is the weight of the
+        edge from i to adj_list[i][k]
+        :param source: The vertex to start from
+        :return: distances and predecessors, see ShortestPath.dijkstra
+        """
+
+        return ShortestPath.dijkstra(CSRGraph.from_list(adj_list, weights),
+                                     source)
+
+    @staticmethod
+    def path(predecessors: np.ndarray, target: int) -> typing.List[int]:
+        """
+        Reconstructs a shortest path from the predecessors returned by
+        ShortestPath.dijkstra
+
+        :param predecessors: The predecessor of every vertex
+        :param target: The vertex the path should end in
+        :return: list of vertices from the source to target
+        """
+
+        path = [target]
+        while predecessors[path[-1]] >= 0:
+            path.append(int(predecessors[path[-1]]))
+        return path[::-1]
+
+    @staticmethod
+    def bidirectional_dijkstra(graph: CSRGraph, source: int, target: int,
+                               reverse: typing.Optional[CSRGraph] = None) \
+            -> typing.Tuple[float, typing.List[int]]:
+        """
+        Computes the shortest path from source to target, by running
+        Dijkstra forwards from source and backwards from target until the
+        two searches meet. This usually settles far fewer vertices than a
+        single-source search.
+
+        :param graph: The graph in compressed sparse row format
+        :param source: The vertex the path starts in
+        :param target: The vertex the path ends in
+        :param reverse: graph.invert_directed_graph(), which is computed if
+        not given. Pass it in when answering many queries.
+        :return: a Tuple consisting of
+          - the length of the shortest path, or inf if there is none
+          - list of the vertices on that path, empty if there is none
+        """
+
+        ShortestPath._check_weights(graph)
+        if reverse is None:
+            reverse = graph.invert_directed_graph()
+        n = graph.count_vertices_directed_graph()
+        # Index 0 is the forward search, index 1 the backward search
+        graphs = (graph, reverse)
+        distances = (np.full(n, np.inf), np.full(n, np.inf))
+        predecessors = (np.full(n, -1, dtype=np.int64),
+                        np.full(n, -1, dtype=np.int64))
+        done = (np.zeros(n, dtype=bool), np.zeros(n, dtype=bool))
+        heaps = ([(0.0, source)], [(0.0, target)])
+        distances[0][source] = 0
+        distances[1][target] = 0
+        best, meeting = (0.0, source) if source == target else (np.inf, -1)
+
+        while heaps[0] and heaps[1]:
+            # Any path found later is at least as long as the two tops
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            distance, u = heapq.heappop(heaps[side])
+            if done[side][u]:
+                continue
+            done[side][u] = True
+            other = distances[1 - side]
+            for v, weight in zip(graphs[side].neighbours(u).tolist(),
+                                 graphs[side].neighbour_weights(u).tolist()):
+                candidate = distance + weight
+                if candidate < distances[side][v]:
+                    distances[side][v] = candidate
+                    predecessors[side][v] = u
+                    heapq.heappush(heaps[side], (candidate, v))
+                if candidate + other[v] < best:
+                    best, meeting = candidate + other[v], v
+
+        if meeting < 0:
+            return np.inf, []
+        forward = ShortestPath.path(predecessors[0], meeting)
+        backward = ShortestPath.path(predecessors[1], meeting)
+        return float(best), forward + backward[::-1][1:]
+
+    @staticmethod
+    def all_pairs(graph: CSRGraph,
+                  sources: typing.Optional[typing.Iterable[int]] = None,
+                  max_workers: typing.Optional[int] = None) -> np.ndarray:
+        """
+        Computes the shortest path distances between all pairs of vertices,
+        running Dijkstra for the sources in parallel worker processes.
+
+        :param graph: The graph in compressed sparse row format
+        :param sources: The sources to compute distances for, by default
+        all vertices
+        :param max_workers: The number of worker processes, by default the
+        number of CPUs. With 1 no processes are started.
+        :return: numpy array where element [i][j] is the distance from the
+        i-th source to vertex j
+        """
+
+        ShortestPath._check_weights(graph)
+        n = graph.count_vertices_directed_graph()
+        sources = list(range(n) if sources is None else sources)
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1:
+            rows = [ShortestPath.dijkstra(graph, s)[0] for s in sources]
+        else:
+            # The graph is sent to every worker once, not with every source
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers, initializer=_init_worker,
+                    initargs=(graph,)) as executor:
+                chunksize = max(1, len(sources) // (4 * max_workers))
+                rows = list(executor.map(_worker_distances, sources,
+                                         chunksize=chunksize))
+        return np.array(rows).reshape(len(sources), n)
@@ -115,6 +115,18 @@ class TestAdjacencyMatrix(unittest.TestCase):
                 np.array(matrix))
             numpy.testing.assert_array_equal(matrix.T, student_answer)
 
+    def test_invert_directed_graph_dtype_and_out(self):
+        for dtype in (bool, np.uint8, np.int64):
+            matrix, _, _ = GraphGenerator.generate_directed_graph(7)
+            matrix = matrix.astype(dtype)
+            inverted = AdjacencyMatrix.invert_directed_graph(matrix)
+            self.assertEqual(matrix.dtype, inverted.dtype)
+
+            out = np.empty_like(matrix)
+            result = AdjacencyMatrix.invert_directed_graph(matrix, out=out)
+            self.assertIs(out, result)
+            numpy.testing.assert_array_equal(matrix.T, out)
+
 
 class TestAdjacencyList(unittest.TestCase):
 
@@ -176,3 +188,42 @@ class TestAdjacencyList(unittest.TestCase):
             adj_list = GraphGenerator.matrix_to_list(matrix)
             student_answer = AdjacencyList.list_to_matrix(adj_list)
             numpy.testing.assert_array_equal(matrix, student_answer)
+
+    def test_list_to_matrix_dtype(self):
+        matrix, _, _ = GraphGenerator.generate_directed_graph(6)
+        adj_list = GraphGenerator.matrix_to_list(matrix)
+        for dtype in (bool, np.uint8, np.float32):
+            student_answer = AdjacencyList.list_to_matrix(adj_list, dtype)
+            self.assertEqual(np.dtype(dtype), student_answer.dtype)
+            numpy.testing.assert_array_equal(matrix.astype(dtype),
+                                             student_answer)
+
+    def test_list_to_matrix_sparse(self):
+        n_cases = 5
+        for i in range(n_cases):
+            size = i + 5
+            matrix, _, _ = GraphGenerator.generate_directed_graph(size)
+            adj_list = GraphGenerator.matrix_to_list(matrix)
+            student_answer = AdjacencyList.list_to_matrix(adj_list,
+                                                          sparse=True)
+            numpy.testing.assert_array_equal(matrix,
+                                             student_answer.to_matrix())
+
+    def test_list_to_matrix_vertex_ids(self):
+        adj_list = {'a': ['b', 'c'], 'b': ['c'], 'c': ['a', 'd']}
+        index = AdjacencyList.vertex_index(adj_list)
+        self.assertEqual({'a': 0, 'b': 1, 'c': 2, 'd': 3}, index)
+        student_answer = AdjacencyList.list_to_matrix(adj_list)
+        expected = np.zeros((4, 4), dtype=np.uint8)
+        for k, lst in adj_list.items():
+            for v in lst:
+                expected[index[k], index[v]] = 1
+        numpy.testing.assert_array_equal(expected, student_answer)
+
+        # Unordered integer keys keep mapping to themselves
+        adj_list = {2: [0], 0: [1], 1: [2, 0]}
+        self.assertEqual({0: 0, 1: 1, 2: 2},
+                         AdjacencyList.vertex_index(adj_list))
+        numpy.testing.assert_array_equal(
+            [[0, 1, 0], [1, 0, 1], [1, 0, 0]],
+            AdjacencyList.list_to_matrix(adj_list))
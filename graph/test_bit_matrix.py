@@ -0,0 +1,57 @@
+import numpy as np
+import numpy.testing
+import unittest
+
+from bit_matrix import BitAdjacencyMatrix
+from test_adjacency_matrix_list import GraphGenerator
+
+
+class TestBitAdjacencyMatrix(unittest.TestCase):
+
+    def test_round_trip(self):
+        n_cases = 10
+        for i in range(n_cases):
+            size = i + 5
+            matrix, _, _ = GraphGenerator.generate_directed_graph(size)
+            packed = BitAdjacencyMatrix.from_matrix(matrix)
+            self.assertEqual((size, (size + 7) // 8), packed.bits.shape)
+            numpy.testing.assert_array_equal(matrix, packed.to_matrix())
+
+    def test_counts(self):
+        n_cases = 10
+        for i in range(n_cases):
+            size = i + 5
+            matrix, n_edges, odd_neighbours = \
+                GraphGenerator.generate_undirected_graph(size)
+            packed = BitAdjacencyMatrix.from_matrix(matrix)
+            self.assertEqual(size, packed.count_vertices_undirected_graph())
+            self.assertEqual(n_edges, packed.count_edges_undirected_graph())
+            self.assertEqual(odd_neighbours,
+                             packed.count_odd_neighbours_undirected_graph())
+            numpy.testing.assert_array_equal(matrix.sum(axis=1),
+                                             packed.degrees())
+
+    def test_invert_directed_graph(self):
+        n_cases = 10
+        for i in range(n_cases):
+            size = i + 5
+            matrix, _, _ = GraphGenerator.generate_directed_graph(size)
+            packed = BitAdjacencyMatrix.from_matrix(matrix)
+            numpy.testing.assert_array_equal(
+                matrix.T, packed.invert_directed_graph().to_matrix())
+
+    def test_invert_directed_graph_in_blocks(self):
+        matrix, _, _ = GraphGenerator.generate_directed_graph(37)
+        packed = BitAdjacencyMatrix.from_matrix(matrix)
+        packed.BLOCK_BYTES = 8 * 37
+        numpy.testing.assert_array_equal(
+            matrix.T, packed.invert_directed_graph().to_matrix())
+
+    def test_neighbours(self):
+        matrix, _, _ = GraphGenerator.generate_directed_graph(13)
+        packed = BitAdjacencyMatrix.from_matrix(matrix)
+        for i in range(13):
+            numpy.testing.assert_array_equal(np.flatnonzero(matrix[i]),
+                                             packed.neighbours(i))
+            for j in range(13):
+                self.assertEqual(bool(matrix[i, j]), packed.has_edge(i, j))
@@ -0,0 +1,73 @@
+import numpy as np
+import numpy.testing
+import unittest
+
+from adjacency_list import AdjacencyList
+from csr_graph import CSRGraph
+from test_adjacency_matrix_list import GraphGenerator
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    def test_counts_undirected_graph(self):
+        n_cases = 10
+        for i in range(n_cases):
+            size = i + 5
+            matrix, n_edges, odd_neighbours = \
+                GraphGenerator.generate_undirected_graph(size)
+            graph = CSRGraph.from_matrix(matrix)
+            self.assertEqual(size, graph.count_vertices_undirected_graph())
+            self.assertEqual(n_edges, graph.count_edges_undirected_graph())
+            self.assertEqual(odd_neighbours,
+                             graph.count_odd_neighbours_undirected_graph())
+
+    def test_counts_directed_graph(self):
+        n_cases = 5
+        for i in range(n_cases):
+            size = i + 5
+            matrix, n_edges, _ = GraphGenerator.generate_directed_graph(size)
+            graph = CSRGraph.from_matrix(matrix)
+            self.assertEqual(size, graph.count_vertices_directed_graph())
+            self.assertEqual(n_edges, graph.count_edges_directed_graph())
+
+    def test_invert_directed_graph(self):
+        n_cases = 5
+        for i in range(n_cases):
+            size = i + 5
+            matrix, _, _ = GraphGenerator.generate_directed_graph(size)
+            inverted = CSRGraph.from_matrix(matrix).invert_directed_graph()
+            numpy.testing.assert_array_equal(matrix.T, inverted.to_matrix())
+            # Neighbours stay sorted, like the rows of a transposed matrix
+            expected = CSRGraph.from_matrix(matrix.T)
+            numpy.testing.assert_array_equal(expected.indptr, inverted.indptr)
+            numpy.testing.assert_array_equal(expected.indices,
+                                             inverted.indices)
+
+    def test_list_round_trip(self):
+        n_cases = 5
+        for i in range(n_cases):
+            size = i + 5
+            matrix, _, _ = GraphGenerator.generate_directed_graph(size)
+            adj_list = GraphGenerator.matrix_to_list(matrix)
+            graph = CSRGraph.from_list(adj_list)
+            numpy.testing.assert_array_equal(matrix, graph.to_matrix())
+            as_list = graph.to_list()
+            self.assertEqual(adj_list, {k: list(v)
+                                        for k, v in as_list.items()})
+            self.assertEqual(
+                AdjacencyList.count_edges_directed_graph(adj_list),
+                AdjacencyList.count_edges_directed_graph(as_list))
+
+    def test_to_list_is_zero_copy(self):
+        matrix, _, _ = GraphGenerator.generate_directed_graph(8)
+        graph = CSRGraph.from_matrix(matrix)
+        for neighbours in graph.to_list().values():
+            self.assertTrue(np.shares_memory(neighbours, graph.indices) or
+                            len(neighbours) == 0)
+
+    def test_empty_graph(self):
+        graph = CSRGraph.from_matrix(np.zeros((4, 4), dtype=np.uint8))
+        self.assertEqual(0, graph.count_edges_directed_graph())
+        self.assertEqual(0, graph.count_odd_neighbours_undirected_graph())
+        self.assertEqual(4, graph.invert_directed_graph()
+                         .count_vertices_directed_graph())
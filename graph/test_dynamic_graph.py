@@ -0,0 +1,65 @@
+import numpy as np
+import numpy.testing
+import unittest
+
+from adjacency_list import AdjacencyList
+from dynamic_graph import DynamicGraph
+from test_adjacency_matrix_list import GraphGenerator
+
+
+class TestDynamicGraph(unittest.TestCase):
+
+    def assert_counters(self, graph):
+        adj_list = graph.to_list()
+        if graph.directed:
+            n_edges = AdjacencyList.count_edges_directed_graph(adj_list)
+        else:
+            n_edges = AdjacencyList.count_edges_undirected_graph(adj_list)
+        self.assertEqual(n_edges, graph.count_edges())
+        self.assertEqual(
+            AdjacencyList.count_odd_neighbours_undirected_graph(adj_list),
+            graph.count_odd_neighbours())
+        numpy.testing.assert_array_equal(
+            [len(adj_list[v]) for v in range(graph.count_vertices())],
+            graph.degrees())
+
+    def test_from_list(self):
+        matrix, n_edges, odd_neighbours = \
+            GraphGenerator.generate_undirected_graph(12)
+        graph = DynamicGraph.from_list(GraphGenerator.matrix_to_list(matrix))
+        self.assertEqual(12, graph.count_vertices())
+        self.assertEqual(n_edges, graph.count_edges())
+        self.assertEqual(odd_neighbours, graph.count_odd_neighbours())
+        self.assertEqual(GraphGenerator.matrix_to_list(matrix),
+                         graph.to_list())
+
+    def test_random_updates(self):
+        rng = np.random.default_rng(0)
+        for directed in (False, True):
+            graph = DynamicGraph(directed=directed)
+            edges = set()
+            for _ in range(500):
+                u, v = rng.integers(30, size=2).tolist()
+                if u == v:
+                    continue
+                key = (u, v) if directed else (min(u, v), max(u, v))
+                if rng.random() < 0.6:
+                    self.assertEqual(key not in edges, graph.add_edge(u, v))
+                    edges.add(key)
+                else:
+                    self.assertEqual(key in edges, graph.remove_edge(u, v))
+                    edges.discard(key)
+                self.assertEqual(len(edges), graph.count_edges())
+            self.assert_counters(graph)
+
+    def test_growth(self):
+        graph = DynamicGraph()
+        self.assertEqual(0, graph.count_vertices())
+        self.assertTrue(graph.add_edge(3, 40))
+        self.assertEqual(41, graph.count_vertices())
+        self.assertEqual(2, graph.count_odd_neighbours())
+        self.assertEqual(1, graph.degree(40))
+        self.assertFalse(graph.remove_edge(50, 3))
+        self.assertTrue(graph.remove_edge(40, 3))
+        self.assertEqual(0, graph.count_odd_neighbours())
+        self.assertFalse(graph.has_edge(3, 40))
@@ -0,0 +1,91 @@
+import numpy as np
+import numpy.testing
+import os
+import tempfile
+import unittest
+
+from adjacency_list import AdjacencyList
+from edge_stream import EdgeStream
+from graph_storage import GraphStorage
+from test_adjacency_matrix_list import GraphGenerator
+
+
+class TestEdgeStream(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.matrix, self.n_edges, _ = \
+            GraphGenerator.generate_directed_graph(12)
+        self.edges = [tuple(e) for e in np.argwhere(self.matrix).tolist()]
+        self.path = os.path.join(self.directory.name, 'edges.txt')
+        with open(self.path, 'w') as f:
+            f.write('# source target\n')
+            for u, v in self.edges:
+                f.write('%d %d\n' % (u, v))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def sources(self):
+        return [self.path, iter(self.edges)]
+
+    def test_read_chunks(self):
+        chunks = list(EdgeStream.read_chunks(self.path, chunk_size=7))
+        self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+        numpy.testing.assert_array_equal(self.edges, np.concatenate(chunks))
+
+    def test_csv(self):
+        path = os.path.join(self.directory.name, 'edges.csv')
+        with open(path, 'w') as f:
+            for u, v in self.edges:
+                f.write('%d,%d,1.0\n' % (u, v))
+        numpy.testing.assert_array_equal(
+            self.matrix, EdgeStream.to_matrix(path, delimiter=',',
+                                              chunk_size=5))
+
+    def test_to_matrix(self):
+        for source in self.sources():
+            numpy.testing.assert_array_equal(
+                self.matrix, EdgeStream.to_matrix(source, chunk_size=5))
+
+    def test_to_matrix_growth(self):
+        # Each chunk of one edge raises the highest vertex id
+        edges = [(v, v + 1) for v in range(20)]
+        matrix = EdgeStream.to_matrix(edges, chunk_size=1)
+        self.assertEqual((21, 21), matrix.shape)
+        numpy.testing.assert_array_equal(numpy.eye(21, k=1), matrix)
+        matrix = EdgeStream.to_matrix(edges, n_vertices=30, chunk_size=1)
+        self.assertEqual((30, 30), matrix.shape)
+
+    def test_to_list(self):
+        expected = GraphGenerator.matrix_to_list(self.matrix)
+        for source in self.sources():
+            adj_list = EdgeStream.to_list(source, chunk_size=5)
+            self.assertEqual(expected, adj_list)
+            self.assertEqual(
+                self.n_edges,
+                AdjacencyList.count_edges_directed_graph(adj_list))
+
+    def test_to_csr(self):
+        for source in self.sources():
+            graph = EdgeStream.to_csr(source, chunk_size=5)
+            numpy.testing.assert_array_equal(self.matrix, graph.to_matrix())
+
+    def test_to_csr_file(self):
+        path = os.path.join(self.directory.name, 'graph.bin')
+        EdgeStream.to_csr(self.path, path=path, chunk_size=5)
+        numpy.testing.assert_array_equal(
+            self.matrix, GraphStorage.load_csr(path).to_matrix())
+
+    def test_undirected(self):
+        edges = [(0, 1), (1, 2), (3, 1)]
+        degrees = EdgeStream.count_degrees(edges, directed=False)
+        numpy.testing.assert_array_equal([1, 3, 1, 1], degrees)
+        graph = EdgeStream.to_csr(iter(edges), directed=False)
+        self.assertEqual(3, graph.count_edges_undirected_graph())
+        matrix = EdgeStream.to_matrix(edges, directed=False)
+        numpy.testing.assert_array_equal(matrix, matrix.T)
+
+    def test_degrees_include_targets(self):
+        degrees = EdgeStream.count_degrees([(0, 5)], n_vertices=2)
+        numpy.testing.assert_array_equal([1, 0, 0, 0, 0, 0], degrees)
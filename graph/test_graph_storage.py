@@ -0,0 +1,95 @@
+import numpy as np
+import numpy.testing
+import os
+import tempfile
+import unittest
+
+from adjacency_list import AdjacencyList
+from adjacency_matrix import AdjacencyMatrix
+from csr_graph import CSRGraph
+from graph_storage import GraphStorage
+from test_adjacency_matrix_list import GraphGenerator
+
+
+class TestGraphStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'graph.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matrix_round_trip(self):
+        matrix, n_edges, odd_neighbours = \
+            GraphGenerator.generate_undirected_graph(9)
+        GraphStorage.save_matrix(self.path, matrix)
+        loaded = GraphStorage.load_matrix(self.path)
+        self.assertIsInstance(loaded, np.memmap)
+        numpy.testing.assert_array_equal(matrix, loaded)
+        self.assertEqual(n_edges,
+                         AdjacencyMatrix.count_edges_undirected_graph(loaded))
+        self.assertEqual(
+            odd_neighbours,
+            AdjacencyMatrix.count_odd_neighbours_undirected_graph(loaded))
+
+    def test_csr_round_trip(self):
+        matrix, n_edges, odd_neighbours = \
+            GraphGenerator.generate_undirected_graph(11)
+        GraphStorage.save_csr(self.path, CSRGraph.from_matrix(matrix))
+        loaded = GraphStorage.load(self.path)
+        self.assertIsInstance(loaded.indices, np.memmap)
+        self.assertIsNone(loaded.weights)
+        numpy.testing.assert_array_equal(matrix, loaded.to_matrix())
+        self.assertEqual(n_edges, loaded.count_edges_undirected_graph())
+
+        adj_list = loaded.to_list()
+        self.assertEqual(n_edges,
+                         AdjacencyList.count_edges_undirected_graph(adj_list))
+        self.assertEqual(
+            odd_neighbours,
+            AdjacencyList.count_odd_neighbours_undirected_graph(adj_list))
+
+    def test_weighted_csr_round_trip(self):
+        rng = np.random.default_rng(0)
+        weights = rng.random((9, 9))
+        weights[weights < 0.6] = 0
+        GraphStorage.save_csr(self.path,
+                              CSRGraph.from_matrix(weights, weighted=True))
+        loaded = GraphStorage.load_csr(self.path)
+        self.assertIsInstance(loaded.weights, np.memmap)
+        numpy.testing.assert_array_equal(
+            weights, loaded.to_matrix(dtype=weights.dtype))
+        GraphStorage.save_csr(self.path, CSRGraph.from_matrix(
+            np.zeros((3, 3)), weighted=True))
+        self.assertEqual(0, len(GraphStorage.load_csr(self.path).weights))
+
+    def test_save_list(self):
+        matrix, _, _ = GraphGenerator.generate_directed_graph(7)
+        GraphStorage.save_list(self.path,
+                               GraphGenerator.matrix_to_list(matrix))
+        numpy.testing.assert_array_equal(
+            matrix, GraphStorage.load_csr(self.path).to_matrix())
+
+    def test_empty_csr(self):
+        GraphStorage.save_csr(self.path, CSRGraph.from_matrix(
+            np.zeros((3, 3), dtype=np.uint8)))
+        loaded = GraphStorage.load_csr(self.path)
+        self.assertEqual(3, loaded.count_vertices_directed_graph())
+        self.assertEqual(0, loaded.count_edges_directed_graph())
+
+    def test_read_only(self):
+        matrix, _, _ = GraphGenerator.generate_directed_graph(5)
+        GraphStorage.save_matrix(self.path, matrix)
+        loaded = GraphStorage.load_matrix(self.path)
+        with self.assertRaises(ValueError):
+            loaded[0, 0] = 1
+
+    def test_wrong_kind(self):
+        GraphStorage.save_matrix(self.path, np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            GraphStorage.load_csr(self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'not a graph')
+        with self.assertRaises(ValueError):
+            GraphStorage.load(self.path)
@@ -0,0 +1,58 @@
+import numpy as np
+import numpy.testing
+import unittest
+
+from adjacency_matrix import AdjacencyMatrix
+from csr_graph import CSRGraph
+from parallel import ParallelGraph, SharedArrays
+from traversal import Traversal
+from test_adjacency_matrix_list import GraphGenerator
+
+
+def range_sum(arrays, start, stop):
+    return int(arrays['values'][start:stop].sum())
+
+
+class TestParallelGraph(unittest.TestCase):
+
+    def test_map_vertex_ranges(self):
+        values = np.arange(100)
+        for max_workers in (1, 2):
+            results = ParallelGraph.map_vertex_ranges(
+                range_sum, {'values': values}, len(values), max_workers,
+                n_ranges=4)
+            self.assertEqual(4, len(results))
+            self.assertEqual(int(values.sum()), sum(results))
+            # Ranges are contiguous and in vertex order
+            self.assertEqual(range_sum({'values': values}, 0, 25),
+                             results[0])
+
+    def test_count_odd_neighbours_matrix(self):
+        matrix, _, odd_neighbours = \
+            GraphGenerator.generate_undirected_graph(40)
+        for max_workers in (1, 2):
+            self.assertEqual(
+                odd_neighbours,
+                ParallelGraph.count_odd_neighbours_matrix(matrix,
+                                                          max_workers))
+            numpy.testing.assert_array_equal(
+                matrix.sum(axis=1),
+                ParallelGraph.degrees_matrix(matrix, max_workers))
+        self.assertEqual(
+            AdjacencyMatrix.count_odd_neighbours_undirected_graph(matrix),
+            ParallelGraph.count_odd_neighbours_matrix(matrix, 2))
+
+    def test_bfs_csr(self):
+        matrix, _, _ = GraphGenerator.generate_directed_graph(20)
+        matrix[np.random.random(matrix.shape) < 0.8] = 0
+        graph = CSRGraph.from_matrix(matrix)
+        sources = [0, 5, 7, 19]
+        expected = [Traversal.bfs_csr(graph, s) for s in sources]
+        for max_workers in (1, 2):
+            numpy.testing.assert_array_equal(
+                expected, ParallelGraph.bfs_csr(graph, sources, max_workers))
+
+    def test_shared_arrays_released(self):
+        with SharedArrays({'a': np.arange(5), 'b': np.zeros(0)}) as shared:
+            self.assertEqual({'a', 'b'}, set(shared.descriptors))
+        self.assertEqual([], shared.blocks)
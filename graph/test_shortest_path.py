@@ -0,0 +1,92 @@
+import numpy as np
+import numpy.testing
+import unittest
+
+from csr_graph import CSRGraph
+from shortest_path import ShortestPath
+
+
+def weighted_graph(size, density=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, 10, size=(size, size)).astype(np.float64)
+    weights[rng.random((size, size)) > density] = 0
+    np.fill_diagonal(weights, 0)
+    return weights
+
+
+def reference_distances(adj_matrix):
+    # Floyd-Warshall
+    distances = np.where(adj_matrix > 0, adj_matrix, np.inf)
+    np.fill_diagonal(distances, 0)
+    for k in range(len(adj_matrix)):
+        distances = np.minimum(distances,
+                               distances[:, k, None] + distances[None, k, :])
+    return distances
+
+
+class TestShortestPath(unittest.TestCase):
+
+    def test_dijkstra(self):
+        for seed in range(5):
+            matrix = weighted_graph(15, seed=seed)
+            expected = reference_distances(matrix)
+            graph = CSRGraph.from_matrix(matrix, weighted=True)
+            for source in range(15):
+                distances, predecessors = ShortestPath.dijkstra(graph, source)
+                numpy.testing.assert_array_equal(expected[source], distances)
+                for target in np.flatnonzero(np.isfinite(distances)):
+                    path = ShortestPath.path(predecessors, target)
+                    self.assertEqual([source, target], [path[0], path[-1]])
+                    self.assertEqual(distances[target],
+                                     matrix[path[:-1], path[1:]].sum())
+
+    def test_formats(self):
+        matrix = weighted_graph(10)
+        adj_list = {i: np.flatnonzero(matrix[i]).tolist() for i in range(10)}
+        weights = {i: matrix[i][adj_list[i]].tolist() for i in range(10)}
+        expected = ShortestPath.dijkstra_matrix(matrix, 0)[0]
+        numpy.testing.assert_array_equal(
+            expected, ShortestPath.dijkstra_list(adj_list, weights, 0)[0])
+        numpy.testing.assert_array_equal(reference_distances(matrix)[0],
+                                         expected)
+
+    def test_bidirectional_dijkstra(self):
+        for seed in range(5):
+            matrix = weighted_graph(15, density=0.15, seed=seed)
+            expected = reference_distances(matrix)
+            graph = CSRGraph.from_matrix(matrix, weighted=True)
+            reverse = graph.invert_directed_graph()
+            for source in range(15):
+                for target in range(15):
+                    distance, path = ShortestPath.bidirectional_dijkstra(
+                        graph, source, target, reverse)
+                    self.assertEqual(expected[source, target], distance)
+                    if np.isfinite(distance):
+                        self.assertEqual([source, target],
+                                         [path[0], path[-1]])
+                        self.assertEqual(distance,
+                                         matrix[path[:-1], path[1:]].sum())
+                    else:
+                        self.assertEqual([], path)
+
+    def test_all_pairs(self):
+        matrix = weighted_graph(12)
+        graph = CSRGraph.from_matrix(matrix, weighted=True)
+        expected = reference_distances(matrix)
+        numpy.testing.assert_array_equal(
+            expected, ShortestPath.all_pairs(graph, max_workers=1))
+        numpy.testing.assert_array_equal(
+            expected, ShortestPath.all_pairs(graph, max_workers=2))
+        numpy.testing.assert_array_equal(
+            expected[[3, 5]], ShortestPath.all_pairs(graph, [3, 5], 1))
+
+    def test_unweighted(self):
+        graph = CSRGraph.from_list({0: [1], 1: [2], 2: []})
+        numpy.testing.assert_array_equal(
+            [0, 1, 2], ShortestPath.dijkstra(graph, 0)[0])
+
+    def test_negative_weights(self):
+        matrix = weighted_graph(5, density=1)
+        matrix[0, 1] = -1
+        with self.assertRaises(ValueError):
+            ShortestPath.dijkstra_matrix(matrix, 0)
@@ -0,0 +1,101 @@
+import collections
+import numpy as np
+import numpy.testing
+import unittest
+
+from csr_graph import CSRGraph
+from traversal import Traversal
+from test_adjacency_matrix_list import GraphGenerator
+
+
+def reference_bfs(adj_list, source):
+    distances = {source: 0}
+    queue = collections.deque([source])
+    while queue:
+        u = queue.popleft()
+        for v in adj_list[u]:
+            if v not in distances:
+                distances[v] = distances[u] + 1
+                queue.append(v)
+    return [distances.get(v, -1) for v in range(len(adj_list))]
+
+
+def reference_dfs(adj_list, source, visited=None):
+    visited = [] if visited is None else visited
+    visited.append(source)
+    for v in adj_list[source]:
+        if v not in visited:
+            reference_dfs(adj_list, v, visited)
+    return visited
+
+
+def sparse_graph(size, n_edges, directed=True):
+    rng = np.random.default_rng(size)
+    matrix = np.zeros((size, size), dtype=np.uint8)
+    matrix[rng.integers(size, size=n_edges),
+           rng.integers(size, size=n_edges)] = 1
+    np.fill_diagonal(matrix, 0)
+    if not directed:
+        matrix |= matrix.T
+    return matrix
+
+
+class TestTraversal(unittest.TestCase):
+
+    def formats(self, matrix):
+        adj_list = GraphGenerator.matrix_to_list(matrix)
+        return adj_list, [
+            (Traversal.bfs_list, Traversal.dfs_list,
+             Traversal.connected_components_list, adj_list),
+            (Traversal.bfs_matrix, Traversal.dfs_matrix,
+             Traversal.connected_components_matrix, matrix),
+            (Traversal.bfs_csr, Traversal.dfs_csr,
+             Traversal.connected_components_csr,
+             CSRGraph.from_matrix(matrix)),
+        ]
+
+    def test_bfs(self):
+        for size in range(5, 25, 4):
+            matrix = sparse_graph(size, size)
+            adj_list, formats = self.formats(matrix)
+            for source in range(size):
+                expected = reference_bfs(adj_list, source)
+                for bfs, _, _, graph in formats:
+                    numpy.testing.assert_array_equal(expected,
+                                                     bfs(graph, source))
+
+    def test_dfs(self):
+        for size in range(5, 25, 4):
+            matrix = sparse_graph(size, 2 * size)
+            adj_list, formats = self.formats(matrix)
+            for source in range(size):
+                expected = reference_dfs(adj_list, source)
+                for _, dfs, _, graph in formats:
+                    numpy.testing.assert_array_equal(expected,
+                                                     dfs(graph, source))
+
+    def test_connected_components(self):
+        for size in range(5, 25, 4):
+            matrix = sparse_graph(size, size // 2, directed=False)
+            adj_list, formats = self.formats(matrix)
+            for _, _, components, graph in formats:
+                labels = components(graph)
+                for v in range(size):
+                    reachable = np.array(reference_bfs(adj_list, v)) >= 0
+                    numpy.testing.assert_array_equal(
+                        reachable, labels == labels[v])
+                # Components are numbered in order of their lowest vertex
+                _, first = np.unique(labels, return_index=True)
+                self.assertTrue(np.all(np.diff(first) > 0))
+
+    def test_deep_path(self):
+        size = 50000
+        indptr = np.append(np.arange(size), size - 1)
+        graph = CSRGraph(indptr, np.arange(1, size))
+        numpy.testing.assert_array_equal(np.arange(size),
+                                         Traversal.dfs_csr(graph, 0))
+        numpy.testing.assert_array_equal(np.arange(size),
+                                         Traversal.bfs_csr(graph, 0))
+        adj_list = graph.to_list()
+        numpy.testing.assert_array_equal(np.arange(size),
+                                         Traversal.dfs_list(adj_list, 0))
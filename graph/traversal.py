@@ -0,0 +1,257 @@
+import itertools
+import numpy as np
+import typing
+
+from csr_graph import CSRGraph
+
+############################################################################
+# Iterative graph traversals for the adjacency list, adjacency matrix and
+# CSR formats. None of them recurse, so they work on graphs of any depth.
+# Breadth-first search expands a whole frontier at a time; for the matrix
+# and CSR formats that expansion is a single array operation. The
+# adjacency list format expects the vertices to be numbered 0..V-1.
+############################################################################
+
+Expand = typing.Callable[[np.ndarray], np.ndarray]
+Neighbours = typing.Callable[[int], typing.Iterable[int]]
+
+
+class Traversal(object):
+
+    @staticmethod
+    def _expand_list(adj_list: typing.Dict[int, typing.List[int]]) -> Expand:
+        def expand(frontier: np.ndarray) -> np.ndarray:
+            neighbours = itertools.chain.from_iterable(
+                adj_list[v] for v in frontier.tolist())
+            return np.fromiter(neighbours, dtype=np.int64)
+        return expand
+
+    @staticmethod
+    def _expand_matrix(adj_matrix: np.array) -> Expand:
+        def expand(frontier: np.ndarray) -> np.ndarray:
+            return np.flatnonzero(np.any(adj_matrix[frontier], axis=0))
+        return expand
+
+    @staticmethod
+    def _expand_csr(graph: CSRGraph) -> Expand:
+        def expand(frontier: np.ndarray) -> np.ndarray:
+            starts = graph.indptr[frontier].astype(np.int64)
+            lengths = graph.indptr[frontier + 1] - starts
+            # Positions in indices of all neighbours of the frontier: every
+            # run starts at starts[i] and is lengths[i] long
+            offsets = np.cumsum(lengths) - lengths
+            positions = np.arange(int(lengths.sum())) + \
+                np.repeat(starts - offsets, lengths)
+            return graph.indices[positions]
+        return expand
+
+    @staticmethod
+    def _bfs(expand: Expand, source: int,
+             distances: np.ndarray) -> np.ndarray:
+        """
+        Breadth-first search, one frontier at a time. Writes the hop
+        distance of every reached vertex into distances, in which
+        unvisited vertices must be negative.
+
+        :param expand: Function returning the neighbours of a frontier
+        :param source: The vertex to start from
+        :param distances: Preallocated distance array
+        :return: numpy array with all vertices reached, in BFS order
+        """
+
+        frontier = np.array([source], dtype=np.int64)
+        distances[source] = 0
+        reached = [frontier]
+        depth = 0
+        while len(frontier):
+            depth += 1
+            candidates = expand(frontier)
+            frontier = np.unique(candidates[distances[candidates] < 0])
+            distances[frontier] = depth
+            reached.append(frontier)
+        return np.concatenate(reached)
+
+    @staticmethod
+    def _dfs(neighbours: Neighbours, n: int, source: int) -> np.ndarray:
+        """
+        Depth-first search with an explicit stack of neighbour iterators,
+        which visits the vertices in the same order as the recursive
+        algorithm.
+
+        :param neighbours: Function returning the neighbours of a vertex
+        :param n: The number of vertices
+        :param source: The vertex to start from
+        :return: numpy array with all vertices reached, in preorder
+        """
+
+        visited = np.zeros(n, dtype=bool)
+        order = np.empty(n, dtype=np.int64)
+        visited[source] = True
+        order[0] = source
+        n_visited = 1
+        stack = [iter(neighbours(source))]
+        while stack:
+            for v in stack[-1]:
+                if not visited[v]:
+                    visited[v] = True
+                    order[n_visited] = v
+                    n_visited += 1
+                    stack.append(iter(neighbours(v)))
+                    break
+            else:
+                stack.pop()
+        return order[:n_visited]
+
+    @staticmethod
+    def _components(expand: Expand, n: int) -> np.ndarray:
+        labels = np.full(n, -1, dtype=np.int64)
+        distances = np.full(n, -1, dtype=np.int64)
+        label = 0
+        for v in range(n):
+            if labels[v] < 0:
+                labels[Traversal._bfs(expand, v, distances)] = label
+                label += 1
+        return labels
+
+    @staticmethod
+    def bfs_list(adj_list: typing.Dict[int, typing.List[int]],
+                 source: int) -> np.ndarray:
+        """
+        Computes the number of edges on the shortest path from source to
+        every vertex
+
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        :param source: The vertex to start from
+        :return: numpy array with the hop distance to every vertex, or -1
+        for vertices that cannot be reached
+        """
+
+        distances = np.full(len(adj_list), -1, dtype=np.int64)
+        Traversal._bfs(Traversal._expand_list(adj_list), source, distances)
+        return distances
+
+    @staticmethod
+    def bfs_matrix(adj_matrix: np.array, source: int) -> np.ndarray:
+        """
+        Computes the number of edges on the shortest path from source to
+        every vertex
+
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        :param source: The vertex to start from
+        :return: numpy array with the hop distance to every vertex, or -1
+        for vertices that cannot be reached
+        """
+
+        distances = np.full(len(adj_matrix), -1, dtype=np.int64)
+        Traversal._bfs(Traversal._expand_matrix(adj_matrix), source,
+                       distances)
+        return distances
+
+    @staticmethod
+    def bfs_csr(graph: CSRGraph, source: int) -> np.ndarray:
+        """
+        Computes the number of edges on the shortest path from source to
+        every vertex
+
+        :param graph: The graph in compressed sparse row format
+        :param source: The vertex to start from
+        :return: numpy array with the hop distance to every vertex, or -1
+        for vertices that cannot be reached
+        """
+
+        distances = np.full(graph.count_vertices_directed_graph(), -1,
+                            dtype=np.int64)
+        Traversal._bfs(Traversal._expand_csr(graph), source, distances)
+        return distances
+
+    @staticmethod
+    def dfs_list(adj_list: typing.Dict[int, typing.List[int]],
+                 source: int) -> np.ndarray:
+        """
+        Lists the vertices reachable from source in depth-first preorder
+
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        :param source: The vertex to start from
+        :return: numpy array with the reachable vertices in visiting order
+        """
+
+        return Traversal._dfs(adj_list.__getitem__, len(adj_list), source)
+
+    @staticmethod
+    def dfs_matrix(adj_matrix: np.array, source: int) -> np.ndarray:
+        """
+        Lists the vertices reachable from source in depth-first preorder
+
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        :param source: The vertex to start from
+        :return: numpy array with the reachable vertices in visiting order
+        """
+
+        return Traversal._dfs(
+            lambda v: np.flatnonzero(adj_matrix[v]).tolist(),
+            len(adj_matrix), source)
+
+    @staticmethod
+    def dfs_csr(graph: CSRGraph, source: int) -> np.ndarray:
+        """
+        Lists the vertices reachable from source in depth-first preorder
+
+        :param graph: The graph in compressed sparse row format
+        :param source: The vertex to start from
+        :return: numpy array with the reachable vertices in visiting order
+        """
+
+        return Traversal._dfs(lambda v: graph.neighbours(v).tolist(),
+                              graph.count_vertices_directed_graph(), source)
+
+    @staticmethod
+    def connected_components_list(
+            adj_list: typing.Dict[int, typing.List[int]]) -> np.ndarray:
+        """
+        Labels the connected components of an undirected graph
+
+        :param adj_list: The graph in adjacency list format, where
+        adj_list[i] consists of a list, where each element of that list
+        indicates an edge to a specific vertex
+        :return: numpy array with the component of every vertex, numbered
+        from 0 in order of their lowest vertex
+        """
+
+        return Traversal._components(Traversal._expand_list(adj_list),
+                                     len(adj_list))
+
+    @staticmethod
+    def connected_components_matrix(adj_matrix: np.array) -> np.ndarray:
+        """
+        Labels the connected components of an undirected graph
+
+        :param adj_matrix: The graph in adjacency matrix format, where
+        adj_matrix[i][j] indicates whether there is an edge between vertex i
+        and j
+        :return: numpy array with the component of every vertex, numbered
+        from 0 in order of their lowest vertex
+        """
+
+        return Traversal._components(Traversal._expand_matrix(adj_matrix),
+                                     len(adj_matrix))
+
+    @staticmethod
+    def connected_components_csr(graph: CSRGraph) -> np.ndarray:
+        """
+        Labels the connected components of an undirected graph
+
+        :param graph: The graph in compressed sparse row format
+        :return: numpy array with the component of every vertex, numbered
+        from 0 in order of their lowest vertex
+        """
+
+        return Traversal._components(Traversal._expand_csr(graph),
+                                     graph.count_vertices_directed_graph())
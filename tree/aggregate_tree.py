@@ -0,0 +1,53 @@
+from balanced_tree import AVLNode, AVLTree, _height
+
+
+class AggregateNode(AVLNode):
+
+    def __init__(self, info, left, right):
+        super().__init__(info, left, right)
+        # Number of leafs and highest value in the subtree
+        self.leafs = 1
+        self.highest = info
+
+
+class AggregateTree(AVLTree):
+    """
+    AVL tree in which every node also caches the number of leafs and the
+    highest value of its subtree, next to its height. The caches are
+    recomputed bottom-up along the changed path by add and remove, in
+    O(log n), so the aggregates of the whole tree are read from the root in
+    O(1) instead of traversing all nodes.
+    """
+
+    node_class = AggregateNode
+
+    def _update(self, node: AggregateNode) -> None:
+        left, right = node.left, node.right
+        node.height = max(_height(left), _height(right)) + 1
+        if left or right:
+            node.leafs = (left.leafs if left else 0) + \
+                (right.leafs if right else 0)
+        else:
+            node.leafs = 1
+        # The highest value of a binary search tree is on the far right
+        node.highest = right.highest if right else node.info
+
+    def count_leafs(self) -> int:
+        """
+        Returns the number of leafs in the tree in O(1)
+
+        :return: the number of leafs, 0 for an empty tree
+        """
+
+        return self.root.leafs if self.root else 0
+
+    def get_highest_value(self):
+        """
+        Returns the highest value in the tree in O(1)
+
+        :return: the highest value within the tree
+        """
+
+        if not self.root:
+            raise ValueError('the tree is empty')
+        return self.root.highest
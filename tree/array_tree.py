@@ -0,0 +1,406 @@
+import numpy as np
+import typing
+
+from node import Node
+
+# Child index of a missing child
+NONE = -1
+# Value of the right column for slots on the free list
+FREE = -2
+
+
+def balanced_layout(n: int) -> typing.Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Computes the shape of a perfectly balanced binary search tree on the
+    sorted positions 0..n-1. Each subtree covers a range of positions and
+    is rooted at its middle; all ranges of one level are split at once, so
+    this takes O(n) time in O(log n) array operations.
+
+    :param n: The number of nodes
+    :return: a Tuple consisting of
+      - the position of the root, NONE if n is 0
+      - numpy array with the position of the left child of every position
+      - numpy array with the position of the right child of every position
+    """
+
+    dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+    left = np.full(n, NONE, dtype=dtype)
+    right = np.full(n, NONE, dtype=dtype)
+    # Ranges [low, high) of the subtrees on the current level
+    low = np.zeros(1 if n else 0, dtype=np.int64)
+    high = np.full(len(low), n, dtype=np.int64)
+    while len(low):
+        mid = (low + high) // 2
+        has_left = low < mid
+        has_right = mid + 1 < high
+        left[mid[has_left]] = ((low + mid) // 2)[has_left]
+        right[mid[has_right]] = ((mid + 1 + high) // 2)[has_right]
+        low = np.concatenate([low[has_left], mid[has_right] + 1])
+        high = np.concatenate([mid[has_left], high[has_right]])
+    return (n // 2 if n else NONE), left, right
+
+
+def sorted_unique(values: typing.Iterable) -> np.ndarray:
+    """
+    Sorts values and removes duplicates. Equivalent to np.unique, which is
+    much slower than a sort for large integer arrays in recent NumPy
+    versions.
+
+    :param values: The values
+    :return: numpy array with the distinct values in increasing order
+    """
+
+    if not isinstance(values, np.ndarray):
+        values = np.array(list(values))
+    values = np.sort(values, axis=None)
+    keep = np.ones(len(values), dtype=bool)
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def exact_key(value, dtype: np.dtype):
+    """
+    Converts a value to a scalar of the dtype of a typed tree, if that
+    does not change it. Casting silently truncates (2.5 becomes 2 in an
+    integer tree) or overflows, which would store or find a different key.
+
+    :param value: The value to convert
+    :param dtype: The dtype of the values in the tree
+    :return: the value as a scalar of dtype, None if it cannot be
+    represented exactly
+    """
+
+    try:
+        key = np.dtype(dtype).type(value)
+    except (OverflowError, TypeError, ValueError):
+        return None
+    return key if key == value else None
+
+
+class ArrayTree(object):
+    """
+    A binary search tree stored in parallel NumPy columns instead of Node
+    objects. Slot i holds the value info[i] and the slot indices of its
+    children left[i] and right[i] (NONE if missing). Slots of removed nodes
+    are kept on a free list, linked through the left column and marked
+    with FREE in the right column, and are reused by add.
+    """
+
+    def __init__(self, capacity: int = 16, dtype: np.dtype = np.int64):
+        """
+        Creates an empty tree
+
+        :param capacity: The number of nodes to allocate room for
+        :param dtype: The dtype of the values
+        """
+
+        capacity = max(capacity, 1)
+        self.info = np.zeros(capacity, dtype=dtype)
+        self.left = np.full(capacity, NONE, dtype=np.int32)
+        self.right = np.full(capacity, NONE, dtype=np.int32)
+        self.root = NONE
+        self.size = 0
+        # Slots below high_water have been used at some point
+        self.high_water = 0
+        self.free = NONE
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes used by the columns
+        """
+
+        return self.info.nbytes + self.left.nbytes + self.right.nbytes
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.info)
+        index_dtype = self.left.dtype
+        if capacity > np.iinfo(index_dtype).max:
+            index_dtype = np.int64
+        for name, fill in (('info', 0), ('left', NONE), ('right', NONE)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill,
+                          dtype=old.dtype if name == 'info' else index_dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _allocate(self, value) -> int:
+        if self.free != NONE:
+            slot = self.free
+            self.free = int(self.left[slot])
+        else:
+            if self.high_water == len(self.info):
+                self._grow()
+            slot = self.high_water
+            self.high_water += 1
+        self.info[slot] = value
+        self.left[slot] = NONE
+        self.right[slot] = NONE
+        self.size += 1
+        return slot
+
+    def _release(self, slot: int) -> None:
+        self.left[slot] = self.free
+        self.right[slot] = FREE
+        self.free = slot
+        self.size -= 1
+
+    def search(self, value) -> typing.Tuple[int, int]:
+        """
+        Returns a Tuple with the following two slots:
+         - the parent of the node with a certain value
+         - the node with a certain value
+        If the tree does not contain the value, the second slot is NONE and
+        the first is the slot below which it should be placed. Like
+        binary_tree.search, the parent of the root is the root itself.
+
+        :param value: The value to look for
+        :return: tuple of the slots as described above
+        """
+
+        key = exact_key(value, self.info.dtype)
+        # A value the dtype cannot hold is in no slot, but still compares
+        # correctly, to find where it would be placed
+        return self._search(value if key is None else key)
+
+    def _search(self, key) -> typing.Tuple[int, int]:
+        info, left, right = self.info, self.left, self.right
+        parent = node = self.root
+        while node != NONE:
+            current = info[node]
+            if key == current:
+                break
+            parent = node
+            node = int(left[node] if key < current else right[node])
+        return parent, node
+
+    def add(self, value) -> bool:
+        """
+        Adds a new node to the binary search tree, if the value does not
+        exist yet in the tree.
+
+        :param value: the value to be added
+        :return: true upon success, false upon failure
+        """
+
+        key = exact_key(value, self.info.dtype)
+        if key is None:
+            raise ValueError('%r cannot be stored exactly as %s'
+                             % (value, self.info.dtype))
+        parent, node = self._search(key)
+        if node != NONE:
+            return False
+        slot = self._allocate(key)
+        if parent == NONE:
+            self.root = slot
+        elif key > self.info[parent]:
+            self.right[parent] = slot
+        else:
+            self.left[parent] = slot
+        return True
+
+    def remove(self, value) -> bool:
+        """
+        Removes the node with a certain value from the binary search tree,
+        if it exists. A node with two children takes over the value of its
+        in-order successor, which is removed instead.
+
+        :param value: the value to be deleted
+        :return: true iff the value was found and has been deleted
+        """
+
+        key = exact_key(value, self.info.dtype)
+        if key is None:
+            return False
+        parent, node = self._search(key)
+        if node == NONE:
+            return False
+        left, right = self.left, self.right
+        if left[node] != NONE and right[node] != NONE:
+            # Find the smallest value in the right subtree
+            parent, successor = node, int(right[node])
+            while left[successor] != NONE:
+                parent, successor = successor, int(left[successor])
+            self.info[node] = self.info[successor]
+            node = successor
+
+        # node has at most one child now, which takes its place
+        child = int(left[node] if left[node] != NONE else right[node])
+        if node == self.root:
+            self.root = child
+        elif left[parent] == node:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self._release(node)
+        return True
+
+    def _used(self) -> np.ndarray:
+        return self.right[:self.high_water] != FREE
+
+    def count_leafs(self) -> int:
+        """
+        Counts the number of leafs in the tree
+
+        :return: the number of leafs
+        """
+
+        left = self.left[:self.high_water]
+        right = self.right[:self.high_water]
+        return int(np.count_nonzero((left == NONE) & (right == NONE)))
+
+    def get_height(self) -> int:
+        """
+        Determines the height of the tree, one level at a time. A tree of
+        just the root node has height 0, like binary_tree.get_height.
+
+        :return: the height of the tree
+        """
+
+        if self.root == NONE:
+            return 0
+        level = np.array([self.root])
+        height = -1
+        while len(level):
+            height += 1
+            children = np.concatenate([self.left[level], self.right[level]])
+            level = children[children != NONE]
+        return height
+
+    def get_highest_value(self):
+        """
+        Gets the highest value in the tree
+
+        :return: the highest value within the tree
+        """
+
+        return self.info[:self.high_water][self._used()].max()
+
+    def find_violation(self) -> int:
+        """
+        Finds the first node, in level order, that breaks the binary search
+        tree property, see binary_tree.find_violation. All nodes of a level
+        are checked against the bounds of their ancestors at once.
+
+        :return: the slot of the first violating node, NONE if it is a
+        valid binary search tree
+        """
+
+        info, left, right = self.info, self.left, self.right
+        level = np.array([self.root] if self.root != NONE else [],
+                         dtype=np.int64)
+        # Bounds of every node in the level, only valid where has_low/high
+        low = high = info[level]
+        has_low = has_high = np.zeros(len(level), dtype=bool)
+        while len(level):
+            values = info[level]
+            bad = (has_low & (values <= low)) | (has_high & (values >= high))
+            if bad.any():
+                return int(level[np.argmax(bad)])
+            # Interleave the children, so the next level stays in order
+            children = np.stack([left[level], right[level]], axis=1).ravel()
+            low = np.stack([low, values], axis=1).ravel()
+            high = np.stack([values, high], axis=1).ravel()
+            bounded = np.ones(len(level), dtype=bool)
+            has_low = np.stack([has_low, bounded], axis=1).ravel()
+            has_high = np.stack([bounded, has_high], axis=1).ravel()
+            keep = children != NONE
+            level, low, high = children[keep], low[keep], high[keep]
+            has_low, has_high = has_low[keep], has_high[keep]
+        return NONE
+
+    def is_binary_search_tree(self) -> bool:
+        """
+        Returns whether the tree is a valid binary search tree
+
+        :return: true iff it is a valid binary search tree
+        """
+
+        return self.find_violation() == NONE
+
+    @staticmethod
+    def from_sorted(values: np.ndarray) -> 'ArrayTree':
+        """
+        Builds a perfectly balanced tree from strictly increasing values in
+        O(n). Slot i holds values[i].
+
+        :param values: The values, in strictly increasing order
+        :return: ArrayTree holding the values
+        """
+
+        values = np.asarray(values)
+        if np.any(values[1:] <= values[:-1]):
+            raise ValueError('values must be strictly increasing')
+        tree = ArrayTree(dtype=values.dtype)
+        if len(values):
+            tree.root, tree.left, tree.right = balanced_layout(len(values))
+            tree.info = values.copy()
+            tree.size = tree.high_water = len(values)
+        return tree
+
+    @staticmethod
+    def from_iterable(values: typing.Iterable) -> 'ArrayTree':
+        """
+        Builds a perfectly balanced tree from values in any order, which are
+        sorted and deduplicated first.
+
+        :param values: The values
+        :return: ArrayTree holding the distinct values
+        """
+
+        return ArrayTree.from_sorted(sorted_unique(values))
+
+    @staticmethod
+    def from_node(root: typing.Optional[Node],
+                  dtype: np.dtype = np.int64) -> 'ArrayTree':
+        """
+        Copies a tree of Node objects into an ArrayTree, in preorder
+
+        :param root: The root of the tree
+        :param dtype: The dtype of the values
+        :return: ArrayTree with the same structure
+        """
+
+        tree = ArrayTree(dtype=dtype)
+        # Stack of (node, slot of parent, whether it is a left child)
+        stack = [(root, NONE, False)] if root else []
+        while stack:
+            node, parent, is_left = stack.pop()
+            slot = tree._allocate(node.info)
+            if parent == NONE:
+                tree.root = slot
+            elif is_left:
+                tree.left[parent] = slot
+            else:
+                tree.right[parent] = slot
+            if node.right:
+                stack.append((node.right, slot, False))
+            if node.left:
+                stack.append((node.left, slot, True))
+        return tree
+
+    def to_node(self) -> typing.Optional[Node]:
+        """
+        Copies the tree into a tree of Node objects
+
+        :return: the root Node, or None for an empty tree
+        """
+
+        if self.root == NONE:
+            return None
+        info = self.info.tolist()
+        left, right = self.left.tolist(), self.right.tolist()
+        root = Node(info[self.root], None, None)
+        stack = [(root, self.root)]
+        while stack:
+            node, slot = stack.pop()
+            if left[slot] != NONE:
+                node.left = Node(info[left[slot]], None, None)
+                stack.append((node.left, left[slot]))
+            if right[slot] != NONE:
+                node.right = Node(info[right[slot]], None, None)
+                stack.append((node.right, right[slot]))
+        return root
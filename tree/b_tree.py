@@ -0,0 +1,361 @@
+import numpy as np
+import typing
+
+from array_tree import exact_key
+
+############################################################################
+# B-tree: every node holds up to 2t-1 sorted keys in a NumPy array and, if
+# it is not a leaf, one child more than it has keys. All leaves are on the
+# same level, and every node except the root holds at least t-1 keys, so
+# the height is about log_t(n) instead of the log2(n) of a binary tree.
+# Within a node the keys are searched with np.searchsorted. Updates follow
+# the single-pass algorithms of Cormen et al.: add splits full nodes and
+# remove refills minimal nodes on the way down, so they never go back up.
+############################################################################
+
+
+def _padding(dtype: np.dtype):
+    if np.issubdtype(dtype, np.floating):
+        return np.inf
+    return np.iinfo(dtype).max
+
+
+class BTreeNode(object):
+
+    def __init__(self, capacity: int, dtype: np.dtype, leaf: bool):
+        # Only keys[:n] are in use, the rest is padded with the largest
+        # value of the dtype, so keys can be searched without slicing
+        self.keys = np.full(capacity, _padding(dtype), dtype=dtype)
+        self.n = 0
+        # None for leaves, otherwise the list of n + 1 children
+        self.children = None if leaf else []
+
+    @property
+    def leaf(self) -> bool:
+        return self.children is None
+
+    def _insert_key(self, i: int, value) -> None:
+        self.keys[i + 1:self.n + 1] = self.keys[i:self.n]
+        self.keys[i] = value
+        self.n += 1
+
+    def _delete_key(self, i: int):
+        value = self.keys[i]
+        self.keys[i:self.n - 1] = self.keys[i + 1:self.n]
+        self.n -= 1
+        self.keys[self.n] = _padding(self.keys.dtype)
+        return value
+
+
+class BTree(object):
+    """
+    Ordered set of values with the search/add/remove contract of the
+    binary search trees, stored in a B-tree of minimum degree t.
+    """
+
+    def __init__(self, t: int = 128, dtype: np.dtype = np.int64):
+        """
+        Creates an empty tree
+
+        :param t: The minimum degree, every node holds at most 2t-1 keys
+        :param dtype: The dtype of the values
+        """
+
+        if t < 2:
+            raise ValueError('minimum degree must be at least 2')
+        self.t = t
+        self.dtype = np.dtype(dtype)
+        self.root = self._new_node(leaf=True)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, value) -> bool:
+        return self.search(value)[1] is not None
+
+    def __iter__(self) -> typing.Iterator:
+        """
+        Generates the values in increasing order, keeping only the path from
+        the root to the current node in memory
+        """
+
+        # Stack of (node, i): yield key i-1 of node, then visit child i
+        stack = [(self.root, 0)]
+        while stack:
+            node, i = stack.pop()
+            if node.leaf:
+                yield from node.keys[:node.n].tolist()
+                continue
+            if i > 0:
+                yield node.keys[i - 1].item()
+            if i < node.n:
+                stack.append((node, i + 1))
+            stack.append((node.children[i], 0))
+
+    def _new_node(self, leaf: bool) -> BTreeNode:
+        return BTreeNode(2 * self.t - 1, self.dtype, leaf)
+
+    def search(self, value) -> typing.Tuple[BTreeNode, typing.Optional[int]]:
+        """
+        Returns a Tuple with the following two elements:
+         - the node that holds a certain value
+         - the position of the value within the keys of that node
+        If the tree does not contain the value, the node is the leaf the
+        value would be added to and the position is None, so like for
+        binary_tree.search the second element tells whether the value was
+        found.
+
+        :param value: The value to look for
+        :return: tuple as described above
+        """
+
+        key = exact_key(value, self.dtype)
+        if key is not None:
+            return self._search(key)
+        # A value the dtype cannot hold is in no node. It can sort past the
+        # padding, so stay within the keys in use to find its leaf.
+        node = self.root
+        while not node.leaf:
+            i = int(node.keys.searchsorted(value))
+            node = node.children[min(i, node.n)]
+        return node, None
+
+    def _search(self, key) -> typing.Tuple[BTreeNode, typing.Optional[int]]:
+        node = self.root
+        while True:
+            keys = node.keys
+            i = int(keys.searchsorted(key))
+            if i < node.n and keys[i] == key:
+                return node, i
+            if node.leaf:
+                return node, None
+            node = node.children[i]
+
+    def search_many(self, values: np.array) -> typing.Tuple[
+            np.ndarray, typing.List[typing.Optional[BTreeNode]], np.ndarray]:
+        """
+        Searches a batch of values at once, see search. The batch is sorted
+        and descends the tree in groups: every node visited searches all
+        values that reached it with a single call to np.searchsorted.
+
+        :param values: numpy array with the values to search
+        :return: a Tuple consisting of
+          - boolean numpy array of whether each value was found
+          - list with the node that holds each value, None if absent
+          - numpy array with the position of each value in its node, -1 if
+            absent
+        """
+
+        values = np.asarray(values).ravel()
+        order = np.argsort(values, kind='stable')
+        ordered = values[order]
+        found = np.zeros(len(values), dtype=bool)
+        positions = np.full(len(values), -1, dtype=np.int64)
+        nodes = [None] * len(values)
+        # Stack of (node, range [low, high) of ordered that reached it)
+        stack = [(self.root, 0, len(values))] if len(values) else []
+        while stack:
+            node, low, high = stack.pop()
+            reached = ordered[low:high]
+            i = node.keys[:node.n].searchsorted(reached)
+            hit = node.keys[np.minimum(i, node.n - 1)] == reached
+            hit &= i < node.n
+            for k in order[low:high][hit].tolist():
+                nodes[k] = node
+            found[order[low:high][hit]] = True
+            positions[order[low:high][hit]] = i[hit]
+            if node.leaf:
+                continue
+            # i is non-decreasing, so every child gets a contiguous run
+            starts = np.flatnonzero(np.diff(i)) + 1
+            for start, stop in zip([0] + starts.tolist(),
+                                   starts.tolist() + [high - low]):
+                # The value equal to a key comes last in its run
+                if hit[stop - 1]:
+                    stop -= 1
+                if start < stop:
+                    stack.append((node.children[int(i[start])],
+                                  low + start, low + stop))
+
+        return found, nodes, positions
+
+    def _split_child(self, parent: BTreeNode, i: int) -> None:
+        """
+        Splits the full i-th child of parent in two nodes of t-1 keys, and
+        moves its median key up into parent
+
+        :param parent: A node that is not full
+        :param i: The position of the full child
+        """
+
+        t = self.t
+        child = parent.children[i]
+        sibling = self._new_node(child.leaf)
+        sibling.keys[:t - 1] = child.keys[t:]
+        sibling.n = t - 1
+        if not child.leaf:
+            sibling.children = child.children[t:]
+            del child.children[t:]
+        child.n = t - 1
+        parent._insert_key(i, child.keys[t - 1])
+        child.keys[t - 1:] = _padding(self.dtype)
+        parent.children.insert(i + 1, sibling)
+
+    def add(self, value) -> bool:
+        """
+        Adds a value to the tree, if it does not exist yet in the tree.
+
+        :param value: the value to be added
+        :return: true upon success, false upon failure
+        """
+
+        key = exact_key(value, self.dtype)
+        if key is None:
+            raise ValueError('%r cannot be stored exactly as %s'
+                             % (value, self.dtype))
+        # Compare and store the converted value from here on
+        value = key
+        if self._search(value)[1] is not None:
+            return False
+        if self.root.n == 2 * self.t - 1:
+            root = self._new_node(leaf=False)
+            root.children.append(self.root)
+            self.root = root
+            self._split_child(root, 0)
+
+        node = self.root
+        while not node.leaf:
+            i = int(node.keys.searchsorted(value))
+            if node.children[i].n == 2 * self.t - 1:
+                self._split_child(node, i)
+                if value > node.keys[i]:
+                    i += 1
+            node = node.children[i]
+        node._insert_key(int(node.keys.searchsorted(value)), value)
+        self.size += 1
+        return True
+
+    def _merge(self, parent: BTreeNode, i: int) -> BTreeNode:
+        """
+        Merges the (i+1)-th child of parent and key i of parent into the
+        i-th child
+
+        :param parent: The parent of the children to merge
+        :param i: The position of the left child
+        :return: the merged child
+        """
+
+        left = parent.children[i]
+        right = parent.children.pop(i + 1)
+        left.keys[left.n] = parent._delete_key(i)
+        left.keys[left.n + 1:left.n + 1 + right.n] = right.keys[:right.n]
+        left.n += 1 + right.n
+        if not left.leaf:
+            left.children.extend(right.children)
+        return left
+
+    def _fill(self, parent: BTreeNode, i: int) -> BTreeNode:
+        """
+        Makes sure the i-th child of parent holds at least t keys, by
+        borrowing a key from a sibling or merging with one
+
+        :param parent: A node with at least t keys, or the root
+        :param i: The position of the child
+        :return: the child that now holds what the i-th child held
+        """
+
+        child = parent.children[i]
+        if child.n >= self.t:
+            return child
+        if i > 0 and parent.children[i - 1].n >= self.t:
+            # Rotate the last key of the left sibling through the parent
+            sibling = parent.children[i - 1]
+            child._insert_key(0, parent.keys[i - 1])
+            parent.keys[i - 1] = sibling._delete_key(sibling.n - 1)
+            if not child.leaf:
+                child.children.insert(0, sibling.children.pop())
+            return child
+        if i < parent.n and parent.children[i + 1].n >= self.t:
+            # Rotate the first key of the right sibling through the parent
+            sibling = parent.children[i + 1]
+            child._insert_key(child.n, parent.keys[i])
+            parent.keys[i] = sibling._delete_key(0)
+            if not child.leaf:
+                child.children.append(sibling.children.pop(0))
+            return child
+        return self._merge(parent, i if i < parent.n else i - 1)
+
+    def remove(self, value) -> bool:
+        """
+        Removes a value from the tree, if it exists. A value in an internal
+        node is replaced by its predecessor or successor, which is removed
+        from the leaf it is in instead.
+
+        :param value: the value to be deleted
+        :return: true iff the value was found and has been deleted
+        """
+
+        value = exact_key(value, self.dtype)
+        if value is None or self._search(value)[1] is None:
+            return False
+
+        node = self.root
+        while True:
+            i = int(node.keys.searchsorted(value))
+            if i < node.n and node.keys[i] == value:
+                if node.leaf:
+                    node._delete_key(i)
+                    break
+                left, right = node.children[i], node.children[i + 1]
+                if left.n >= self.t:
+                    predecessor = left
+                    while not predecessor.leaf:
+                        predecessor = predecessor.children[predecessor.n]
+                    value = node.keys[i] = predecessor.keys[predecessor.n - 1]
+                    node = left
+                elif right.n >= self.t:
+                    successor = right
+                    while not successor.leaf:
+                        successor = successor.children[0]
+                    value = node.keys[i] = successor.keys[0]
+                    node = right
+                else:
+                    node = self._merge(node, i)
+            else:
+                node = self._fill(node, i)
+
+        if self.root.n == 0 and not self.root.leaf:
+            self.root = self.root.children[0]
+        self.size -= 1
+        return True
+
+    def get_height(self) -> int:
+        """
+        Determines the height of the tree. All leaves are on the same level,
+        so this follows the leftmost path. A tree of just the root node has
+        height 0.
+
+        :return: the height of the tree
+        """
+
+        height = 0
+        node = self.root
+        while not node.leaf:
+            node = node.children[0]
+            height += 1
+        return height
+
+    def get_highest_value(self):
+        """
+        Gets the highest value in the tree
+
+        :return: the highest value within the tree
+        """
+
+        if not self.size:
+            raise ValueError('the tree is empty')
+        node = self.root
+        while not node.leaf:
+            node = node.children[node.n]
+        return node.keys[node.n - 1].item()
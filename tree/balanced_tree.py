@@ -0,0 +1,400 @@
+import typing
+
+from node import Node
+from binary_tree import search
+
+############################################################################
+# Self-balancing binary search trees with the search/add/remove semantics
+# of binary_tree.py. Both keep the height of the tree O(log n), and both
+# update iteratively, so they work for any number of values without
+# hitting the recursion limit. Because rebalancing can change the root,
+# the trees are wrapped in a class that owns the root.
+############################################################################
+
+
+class AVLNode(Node):
+
+    def __init__(self, info, left, right):
+        super().__init__(info, left, right)
+        # Height of the subtree, a single node has height 0
+        self.height = 0
+
+
+def _height(node: typing.Optional[AVLNode]) -> int:
+    return node.height if node else -1
+
+
+class AVLTree(object):
+    """
+    AVL tree: the heights of the two subtrees of every node differ by at
+    most one.
+    """
+
+    node_class = AVLNode
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _update(self, node: AVLNode) -> None:
+        """
+        Recomputes the fields of node that are derived from its children.
+        Called bottom-up on every node whose subtree changed.
+
+        :param node: The node to update
+        """
+
+        node.height = max(_height(node.left), _height(node.right)) + 1
+
+    def _rotate_left(self, node: AVLNode) -> AVLNode:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node: AVLNode) -> AVLNode:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node: AVLNode) -> AVLNode:
+        """
+        Updates node and restores the AVL condition at it
+
+        :param node: A node whose subtrees are balanced
+        :return: the root of the rebalanced subtree
+        """
+
+        self._update(node)
+        balance = _height(node.left) - _height(node.right)
+        if balance > 1:
+            if _height(node.left.left) < _height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if _height(node.right.right) < _height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _retrace(self, path: typing.List[AVLNode]) -> None:
+        """
+        Rebalances the nodes on a path from the root, bottom-up, and links
+        every rebalanced subtree back into its parent
+
+        :param path: The nodes from the root down to the changed node
+        """
+
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree = self._rebalance(node)
+            if i == 0:
+                self.root = subtree
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+
+    def search(self, value) -> typing.Tuple[typing.Optional[AVLNode],
+                                            typing.Optional[AVLNode]]:
+        """
+        Returns the parent of the node with a certain value and the node
+        itself, see binary_tree.search
+
+        :param value: The value to look for
+        :return: tuple of the parent and the node
+        """
+
+        return search(self.root, value)
+
+    def add(self, value) -> bool:
+        """
+        Adds a new node to the tree, if the value does not exist yet in the
+        tree, and rebalances it.
+
+        :param value: the value to be added
+        :return: true upon success, false upon failure
+        """
+
+        path = []
+        node = self.root
+        while node:
+            if value == node.info:
+                return False
+            path.append(node)
+            node = node.left if value < node.info else node.right
+
+        new = self.node_class(value, None, None)
+        self._update(new)
+        if not path:
+            self.root = new
+        elif value < path[-1].info:
+            path[-1].left = new
+        else:
+            path[-1].right = new
+        self.size += 1
+        self._retrace(path)
+        return True
+
+    def remove(self, value) -> bool:
+        """
+        Removes the node with a certain value from the tree, if it exists,
+        and rebalances it. A node with two children takes over the value of
+        its in-order successor, which is removed instead.
+
+        :param value: the value to be deleted
+        :return: true iff the value was found and has been deleted
+        """
+
+        path = []
+        node = self.root
+        while node and node.info != value:
+            path.append(node)
+            node = node.left if value < node.info else node.right
+        if not node:
+            return False
+
+        if node.left and node.right:
+            path.append(node)
+            successor = node.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            node.info = successor.info
+            node = successor
+
+        child = node.left or node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self.size -= 1
+        self._retrace(path)
+        return True
+
+    def get_height(self) -> int:
+        """
+        Determines the height of the tree in O(1)
+
+        :return: the height of the tree, 0 for a single node or empty tree
+        """
+
+        return max(_height(self.root), 0)
+
+
+class RedBlackNode(Node):
+
+    def __init__(self, info, left, right, parent=None):
+        super().__init__(info, left, right)
+        self.parent = parent
+        self.red = True
+
+
+def _is_red(node: typing.Optional[RedBlackNode]) -> bool:
+    return node is not None and node.red
+
+
+class RedBlackTree(object):
+    """
+    Red-black tree: no red node has a red child, and every path from a node
+    down to a missing child passes the same number of black nodes. It
+    rotates less than an AVL tree on updates, at the cost of a height of up
+    to 2 log2(n + 1).
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _replace_child(self, parent: typing.Optional[RedBlackNode],
+                       old: RedBlackNode,
+                       new: typing.Optional[RedBlackNode]) -> None:
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+        if new:
+            new.parent = parent
+
+    def _rotate_left(self, node: RedBlackNode) -> None:
+        pivot = node.right
+        node.right = pivot.left
+        if pivot.left:
+            pivot.left.parent = node
+        self._replace_child(node.parent, node, pivot)
+        pivot.left = node
+        node.parent = pivot
+
+    def _rotate_right(self, node: RedBlackNode) -> None:
+        pivot = node.left
+        node.left = pivot.right
+        if pivot.right:
+            pivot.right.parent = node
+        self._replace_child(node.parent, node, pivot)
+        pivot.right = node
+        node.parent = pivot
+
+    def search(self, value) -> typing.Tuple[
+            typing.Optional[RedBlackNode], typing.Optional[RedBlackNode]]:
+        """
+        Returns the parent of the node with a certain value and the node
+        itself, see binary_tree.search
+
+        :param value: The value to look for
+        :return: tuple of the parent and the node
+        """
+
+        return search(self.root, value)
+
+    def add(self, value) -> bool:
+        """
+        Adds a new node to the tree, if the value does not exist yet in the
+        tree, and restores the red-black conditions.
+
+        :param value: the value to be added
+        :return: true upon success, false upon failure
+        """
+
+        parent, found = self.search(value)
+        if found:
+            return False
+        node = RedBlackNode(value, None, None, parent)
+        if parent is None:
+            self.root = node
+        elif value < parent.info:
+            parent.left = node
+        else:
+            parent.right = node
+        self.size += 1
+
+        # Only a red node with a red parent can violate the conditions
+        while _is_red(node.parent):
+            parent = node.parent
+            grandparent = parent.parent
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if _is_red(uncle):
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                    continue
+                if node is parent.right:
+                    self._rotate_left(parent)
+                    node, parent = parent, node
+                parent.red = False
+                grandparent.red = True
+                self._rotate_right(grandparent)
+            else:
+                uncle = grandparent.left
+                if _is_red(uncle):
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                    continue
+                if node is parent.left:
+                    self._rotate_right(parent)
+                    node, parent = parent, node
+                parent.red = False
+                grandparent.red = True
+                self._rotate_left(grandparent)
+        self.root.red = False
+        return True
+
+    def remove(self, value) -> bool:
+        """
+        Removes the node with a certain value from the tree, if it exists,
+        and restores the red-black conditions. A node with two children
+        takes over the value of its in-order successor, which is removed
+        instead.
+
+        :param value: the value to be deleted
+        :return: true iff the value was found and has been deleted
+        """
+
+        _, node = self.search(value)
+        if not node:
+            return False
+        if node.left and node.right:
+            successor = node.right
+            while successor.left:
+                successor = successor.left
+            node.info = successor.info
+            node = successor
+
+        child = node.left or node.right
+        parent = node.parent
+        self._replace_child(parent, node, child)
+        self.size -= 1
+        if not node.red:
+            self._fix_removal(child, parent)
+        return True
+
+    def _fix_removal(self, node: typing.Optional[RedBlackNode],
+                     parent: typing.Optional[RedBlackNode]) -> None:
+        """
+        Restores the black heights after a black node was removed from
+        below parent. node, which may be missing, is one black node short.
+
+        :param node: The node that took the place of the removed node
+        :param parent: The parent of node
+        """
+
+        while node is not self.root and not _is_red(node):
+            if node is parent.left:
+                sibling = parent.right
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_left(parent)
+                    sibling = parent.right
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.right):
+                    sibling.left.red = False
+                    sibling.red = True
+                    self._rotate_right(sibling)
+                    sibling = parent.right
+                sibling.red = parent.red
+                parent.red = False
+                sibling.right.red = False
+                self._rotate_left(parent)
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_right(parent)
+                    sibling = parent.left
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.left):
+                    sibling.right.red = False
+                    sibling.red = True
+                    self._rotate_left(sibling)
+                    sibling = parent.left
+                sibling.red = parent.red
+                parent.red = False
+                sibling.left.red = False
+                self._rotate_right(parent)
+            node = self.root
+        if node:
+            node.red = False
@@ -0,0 +1,455 @@
+import argparse
+import numpy as np
+import os
+import tempfile
+import threading
+import time
+import typing
+
+import binary_tree
+import tree_storage
+from array_tree import ArrayTree
+from aggregate_tree import AggregateTree
+from b_tree import BTree
+from concurrent_tree import ConcurrentTree
+from balanced_tree import AVLTree, RedBlackTree
+from node import Node
+from persistent_tree import PersistentTree
+
+############################################################################
+# Benchmarks for the tree functions. Run `python benchmark.py` to run all
+# of them, or `python benchmark.py <name>` to run a single one.
+############################################################################
+
+
+def time_call(func: typing.Callable, *args, repeat: int = 3) -> float:
+    """
+    Times a function call
+
+    :param func: The function to call
+    :param args: The arguments to call the function with
+    :param repeat: The number of times to call the function
+    :return: The fastest time of all calls, in seconds
+    """
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, size: int, timings: typing.Dict[str, float]) -> None:
+    """
+    Prints one line of benchmark results
+
+    :param name: The name of the benchmarked operation
+    :param size: The size of the input
+    :param timings: Mapping of implementation name to time in seconds
+    """
+
+    columns = '  '.join('%s=%9.5fs' % (k, v) for k, v in timings.items())
+    print('%-32s n=%-8d %s' % (name, size, columns))
+
+
+def streams(size: int) -> typing.Dict[str, typing.List[int]]:
+    """
+    Generates the insert streams the trees are benchmarked on
+
+    :param size: The number of keys in every stream
+    :return: Mapping of stream name to list of keys
+    """
+
+    rng = np.random.default_rng(0)
+    return {
+        'sorted': list(range(size)),
+        'reverse': list(range(size, 0, -1)),
+        'random': rng.permutation(size).tolist(),
+    }
+
+
+def build_unbalanced(keys: typing.List[int]) -> Node:
+    root = Node(keys[0], None, None)
+    for key in keys[1:]:
+        binary_tree.add(root, key)
+    return root
+
+
+def build(tree_class: type, keys: typing.List[int]):
+    tree = tree_class()
+    for key in keys:
+        tree.add(key)
+    return tree
+
+
+def search_all(search: typing.Callable, keys: typing.List[int]) -> None:
+    for key in keys:
+        search(key)
+
+
+def bench_balanced_tree() -> None:
+    for size in (1000, 4000):
+        for name, keys in streams(size).items():
+            root = build_unbalanced(keys)
+            avl = build(AVLTree, keys)
+            red_black = build(RedBlackTree, keys)
+            report('add (%s)' % name, size, {
+                'unbalanced': time_call(build_unbalanced, keys, repeat=1),
+                'avl': time_call(build, AVLTree, keys, repeat=1),
+                'red-black': time_call(build, RedBlackTree, keys, repeat=1),
+            })
+            report('search (%s)' % name, size, {
+                'unbalanced': time_call(
+                    search_all, lambda k: binary_tree.search(root, k), keys,
+                    repeat=1),
+                'avl': time_call(search_all, avl.search, keys),
+                'red-black': time_call(search_all, red_black.search, keys),
+            })
+
+
+def reference_count_leafs(root: Node) -> int:
+    if not root.left and not root.right:
+        return 1
+    n_leaves_in_subtree = 0
+    if root.left:
+        n_leaves_in_subtree += reference_count_leafs(root.left)
+    if root.right:
+        n_leaves_in_subtree += reference_count_leafs(root.right)
+    return n_leaves_in_subtree
+
+
+def reference_get_height(root: Node) -> int:
+    if not root or (not root.left and not root.right):
+        return 0
+    return max(reference_get_height(root.left),
+               reference_get_height(root.right)) + 1
+
+
+def reference_get_highest_value(root: Node) -> int:
+    if not root.left and not root.right:
+        return root.info
+    value_left = 0
+    value_right = 0
+    if root.left:
+        value_left = reference_get_highest_value(root.left)
+    if root.right:
+        value_right = reference_get_highest_value(root.right)
+    return max(root.info, value_left, value_right)
+
+
+def reference_is_binary_search_tree(root: Node) -> bool:
+    if not root:
+        return True
+    if root.left and root.left.info > root.info:
+        return False
+    if root.right and root.right.info < root.info:
+        return False
+    return reference_is_binary_search_tree(root.left) and \
+        reference_is_binary_search_tree(root.right)
+
+
+def bench_iterative() -> None:
+    for size in (10000, 100000):
+        keys = streams(size)['random']
+        root = build_unbalanced(keys)
+        for name, reference, current in (
+                ('count_leafs', reference_count_leafs,
+                 binary_tree.count_leafs),
+                ('get_height', reference_get_height, binary_tree.get_height),
+                ('get_highest_value', reference_get_highest_value,
+                 binary_tree.get_highest_value),
+                ('is_binary_search_tree', reference_is_binary_search_tree,
+                 binary_tree.is_binary_search_tree)):
+            timings = {'recursive': time_call(reference, root),
+                       'iterative': time_call(current, root)}
+            report(name, size, timings)
+            print('%-32s %s' % ('', '  '.join(
+                '%s=%.2fM nodes/s' % (k, size / v / 1e6)
+                for k, v in timings.items())))
+
+
+def bench_bulk_load() -> None:
+    rng = np.random.default_rng(0)
+    for size in (10 ** 5, 10 ** 6):
+        keys = rng.integers(10 * size, size=size)
+        timings = {}
+        if size <= 10 ** 5:
+            timings['avl.add'] = time_call(build, AVLTree, keys.tolist(),
+                                           repeat=1)
+        timings['build_from_iterable'] = time_call(
+            binary_tree.build_from_iterable, keys, repeat=1)
+        timings['ArrayTree'] = time_call(ArrayTree.from_iterable, keys)
+        report('bulk load', size, timings)
+    size = 10 ** 7
+    keys = rng.integers(10 * size, size=size)
+    report('bulk load', size, {
+        'ArrayTree': time_call(ArrayTree.from_iterable, keys, repeat=1),
+    })
+
+
+def add_all(root: Node, keys: typing.List[int]) -> None:
+    for key in keys:
+        binary_tree.add(root, key)
+
+
+def bench_batch() -> None:
+    rng = np.random.default_rng(0)
+    for size in (10 ** 4, 10 ** 5):
+        root = binary_tree.build_from_iterable(rng.integers(4 * size,
+                                                            size=size))
+        keys = rng.integers(4 * size, size=size)
+        report('search batch', size, {
+            'search': time_call(search_all,
+                                lambda k: binary_tree.search(root, k),
+                                keys.tolist()),
+            'search_many': time_call(binary_tree.search_many, root, keys),
+        })
+
+        new_keys = rng.integers(8 * size, size=size)
+        report('add batch', size, {
+            'add': time_call(add_all, binary_tree.build_from_sorted(
+                np.arange(0, 8 * size, 2)), new_keys.tolist(), repeat=1),
+            'add_many': time_call(binary_tree.add_many,
+                                  binary_tree.build_from_sorted(
+                                      np.arange(0, 8 * size, 2)),
+                                  new_keys, repeat=1),
+        })
+
+
+def bench_validate() -> None:
+    rng = np.random.default_rng(0)
+    for size in (10 ** 5, 10 ** 6):
+        tree = ArrayTree.from_iterable(rng.permutation(size))
+        root = tree.to_node()
+        timings = {
+            'Node': time_call(binary_tree.is_binary_search_tree, root),
+            'ArrayTree': time_call(tree.is_binary_search_tree),
+        }
+        report('is_binary_search_tree', size, timings)
+
+
+def bench_b_tree() -> None:
+    rng = np.random.default_rng(0)
+    for size in (10 ** 5, 10 ** 6):
+        keys = rng.permutation(size).tolist()
+        queries = rng.integers(2 * size, size=10 ** 5)
+        avl = build(AVLTree, keys)
+        trees = {'avl': avl}
+        for t in (16, 128):
+            trees['b-tree(t=%d)' % t] = build(lambda: BTree(t), keys)
+        report('search', size, {
+            name: time_call(search_all, tree.search, queries.tolist(),
+                            repeat=1)
+            for name, tree in trees.items()})
+        report('search batch', size, {
+            'node': time_call(binary_tree.search_many, avl.root, queries),
+            'b-tree(t=128)': time_call(trees['b-tree(t=128)'].search_many,
+                                       queries),
+        })
+
+
+def load_and_search(path: str, keys: np.ndarray) -> None:
+    tree = tree_storage.load_array_tree(path)
+    for key in keys.tolist():
+        tree.search(key)
+
+
+def bench_storage() -> None:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tree.bin')
+        for size in (10 ** 5, 10 ** 6):
+            keys = rng.permutation(size)
+            queries = rng.integers(size, size=1000)
+            tree = ArrayTree.from_iterable(keys)
+            timings = {}
+            if size <= 10 ** 5:
+                timings['add'] = time_call(build_unbalanced, keys.tolist(),
+                                           repeat=1)
+            timings['save'] = time_call(tree_storage.save_array_tree, path,
+                                        tree)
+            timings['load+1000 searches'] = time_call(load_and_search, path,
+                                                      queries)
+            timings['load_tree'] = time_call(tree_storage.load_tree, path,
+                                             repeat=1)
+            report('restart', size, timings)
+
+
+def poll(tree) -> None:
+    tree.get_height()
+    tree.count_leafs()
+    tree.get_highest_value()
+
+
+def poll_node(root: Node) -> None:
+    binary_tree.get_height(root)
+    binary_tree.count_leafs(root)
+    binary_tree.get_highest_value(root)
+
+
+def bench_aggregates() -> None:
+    for size in (10 ** 4, 10 ** 5):
+        keys = streams(size)['random']
+        tree = build(AggregateTree, keys)
+        report('poll aggregates', size, {
+            'traversal': time_call(poll_node, tree.root),
+            'cached': time_call(poll, tree),
+        })
+        report('add', size, {
+            'avl': time_call(build, AVLTree, keys, repeat=1),
+            'aggregate': time_call(build, AggregateTree, keys, repeat=1),
+        })
+
+
+def remove_all(root: Node, keys: typing.List[int]) -> None:
+    for key in keys:
+        _, root = binary_tree.remove(root, key)
+
+
+def remove_all_avl(tree: AVLTree, keys: typing.List[int]) -> None:
+    for key in keys:
+        tree.remove(key)
+
+
+def bench_remove() -> None:
+    rng = np.random.default_rng(0)
+    for size in (10 ** 5, 10 ** 6):
+        keys = rng.permutation(size)
+        batch = keys[:size // 10]
+        remaining = keys[size // 10:]
+        timings = {
+            'remove': time_call(remove_all, binary_tree.build_from_iterable(
+                keys), batch.tolist(), repeat=1),
+            'remove_many': time_call(binary_tree.remove_many,
+                                     binary_tree.build_from_iterable(keys),
+                                     batch, repeat=1),
+            'rebuild': time_call(binary_tree.build_from_iterable, remaining,
+                                 repeat=1),
+        }
+        if size <= 10 ** 5:
+            timings['avl.remove'] = time_call(
+                remove_all_avl, build(AVLTree, keys.tolist()),
+                batch.tolist(), repeat=1)
+        report('remove 10%', size, timings)
+        print('%-32s %s' % ('', '  '.join(
+            '%s=%.2fM keys/s' % (k, len(batch) / v / 1e6)
+            for k, v in timings.items() if k != 'rebuild')))
+
+
+def build_persistent(keys: typing.List[int]) -> PersistentTree:
+    tree = PersistentTree()
+    for key in keys:
+        tree = tree.add(key)
+    return tree
+
+
+def bench_persistent() -> None:
+    for size in (10 ** 4, 10 ** 5):
+        keys = streams(size)['random']
+        avl = build(AVLTree, keys)
+        persistent = build_persistent(keys)
+        report('add', size, {
+            'avl': time_call(build, AVLTree, keys, repeat=1),
+            'persistent': time_call(build_persistent, keys, repeat=1),
+        })
+        report('search', size, {
+            'avl': time_call(search_all, avl.search, keys, repeat=1),
+            'persistent': time_call(search_all, persistent.search, keys,
+                                    repeat=1),
+        })
+
+
+class GlobalLockTree(object):
+    """
+    The simplest thread-safe tree, which takes one lock for every operation
+    """
+
+    def __init__(self):
+        self.tree = AVLTree()
+        self.lock = threading.Lock()
+
+    def __contains__(self, value) -> bool:
+        with self.lock:
+            return self.tree.search(value)[1] is not None
+
+    def add(self, value) -> bool:
+        with self.lock:
+            return self.tree.add(value)
+
+    def remove(self, value) -> bool:
+        with self.lock:
+            return self.tree.remove(value)
+
+
+def run_threads(tree, operations: typing.List[np.ndarray]) -> None:
+    def work(ops: np.ndarray) -> None:
+        for op, value in ops.tolist():
+            if op == 0:
+                value in tree
+            elif op == 1:
+                tree.add(value)
+            else:
+                tree.remove(value)
+
+    threads = [threading.Thread(target=work, args=(ops,))
+               for ops in operations]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def bench_concurrent() -> None:
+    rng = np.random.default_rng(0)
+    size, n_threads, n_ops = 10 ** 5, 4, 50000
+    keys = rng.permutation(size).tolist()
+    for write_fraction in (0.0, 0.01, 0.1, 0.5):
+        operations = []
+        for _ in range(n_threads):
+            ops = rng.choice(3, size=n_ops, p=[1 - write_fraction,
+                                               write_fraction / 2,
+                                               write_fraction / 2])
+            operations.append(np.stack(
+                [ops, rng.integers(2 * size, size=n_ops)], axis=1))
+        timings = {}
+        for name, tree_class in (('global lock', GlobalLockTree),
+                                 ('seqlock', ConcurrentTree)):
+            tree = tree_class()
+            for key in keys:
+                tree.add(key)
+            timings[name] = time_call(run_threads, tree, operations,
+                                      repeat=1)
+        report('%d threads, %d%% writes' % (n_threads, 100 * write_fraction),
+               n_threads * n_ops, timings)
+        print('%-32s %s' % ('', '  '.join(
+            '%s=%.2fM ops/s' % (k, n_threads * n_ops / v / 1e6)
+            for k, v in timings.items())))
+
+
+BENCHMARKS = {
+    'balanced_tree': bench_balanced_tree,
+    'iterative': bench_iterative,
+    'bulk_load': bench_bulk_load,
+    'batch': bench_batch,
+    'validate': bench_validate,
+    'b_tree': bench_b_tree,
+    'storage': bench_storage,
+    'aggregates': bench_aggregates,
+    'remove': bench_remove,
+    'persistent': bench_persistent,
+    'concurrent': bench_concurrent,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help='benchmarks to run, one of %s (default: all)'
+                             % ', '.join(BENCHMARKS))
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmark(s): %s' % ', '.join(sorted(unknown)))
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -1,68 +1,89 @@
+import bisect
+import collections
 import numpy as np
 import typing
 
 from node import Node
+from array_tree import balanced_layout, sorted_unique
 from binary_tree_visualization import visualize_tree
 
 
 def count_leafs(root: Node) -> int:
     """
-    Counts the number of leafs in a binary tree. Recursive function.
+    Counts the number of leafs in a binary tree. Iterative function, which
+    keeps the unvisited children along the current path on a stack instead
+    of recursing, so it needs O(height) memory.
 
     :param root: The root of the (sub)tree
     :return: the number of leafs
     """
-    
-    if not root.left and not root.right:
-        # If node is leaf, return 1
-        return 1
-
-    # Traverse subtree
-    n_leaves_in_subtree = 0
-    if root.left:
-        n_leaves_in_subtree += count_leafs(root.left)
-    if root.right:        
-        n_leaves_in_subtree += count_leafs(root.right)
-    
-    return n_leaves_in_subtree
+
+    n_leafs = 0
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        left, right = node.left, node.right
+        if right:
+            stack.append(right)
+        if left:
+            stack.append(left)
+        elif not right:
+            # Node is a leaf
+            n_leafs += 1
+
+    return n_leafs
 
 
 def get_height(root: Node) -> int:
     """
-    Determines the height of a binary tree. Recursive function.
+    Determines the height of a binary tree. Iterative function, which
+    descends along left children and keeps the right children it passes,
+    with their depths, on a stack, so it needs O(height) memory.
 
     :param root: The root of the (sub)tree
     :return: the height of the (sub)tree
     """
-    
-    if not root or (not root.left and not root.right):
-        return 0
-    
-    height_left = get_height(root.left)
-    height_right = get_height(root.right)
-    
-    return max(height_left, height_right) + 1
+
+    height = 0
+    nodes, depths = [], []
+    node, depth = root, 0
+    while True:
+        while node:
+            if node.right:
+                nodes.append(node.right)
+                depths.append(depth + 1)
+            node = node.left
+            depth += 1
+        # The last node of the descent was at depth - 1
+        height = max(height, depth - 1)
+        if not nodes:
+            return height
+        node, depth = nodes.pop(), depths.pop()
 
 
 def get_highest_value(root: Node) -> int:
     """
     Gets the highest value out of a binary tree (not a binary search tree!!)
-    Recursive function.
+    Iterative function, which keeps the unvisited children along the
+    current path on a stack instead of recursing, so it needs O(height)
+    memory.
 
     :param root: The root of the (sub)tree
     :return: the highest value within this (sub)tree
     """
 
-    if not root.left and not root.right:
-        return root.info
+    value = root.info
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.info > value:
+            value = node.info
+        if node.left:
+            stack.append(node.left)
+        if node.right:
+            stack.append(node.right)
 
-    value_left = 0
-    value_right = 0
-    if root.left:
-        value_left = get_highest_value(root.left)
-    if root.right:
-        value_right = get_highest_value(root.right)
-    return max(root.info, value_left, value_right)
+    return value
 
 
 def get_greatest_smaller_value(root: Node) -> Node:
@@ -103,7 +124,7 @@ def get_smallest_greater_value(root: Node) -> Node:
     value = root.right
     
     while True:
-        if value.info <= root.info or not value.right:
+        if value.info <= root.info or not value.left:
             # Value is smaller than root, or node has no left child
             break
         value = value.left
@@ -111,30 +132,138 @@ def get_smallest_greater_value(root: Node) -> Node:
     return value
 
 
+def find_violation(root: Node) -> typing.Optional[Node]:
+    """
+    Finds the first node, in pre-order, that breaks the binary search tree
+    property: all values in the left subtree of a node are smaller than its
+    value, and all values in the right subtree are greater. Every node is
+    checked once against the bounds its ancestors impose on it. Instead of
+    recursing, the check descends along left children, which only tightens
+    the upper bound, and keeps the right children it passes on a stack, with
+    their bounds on two parallel stacks.
+
+    :param root: The root of the (sub)tree
+    :return: the first violating Node, None if it is a valid binary search
+    tree
+    """
+
+    # Bounds are None if unbounded
+    nodes, lows, highs = [], [], []
+    node, low, high = root, None, None
+    while True:
+        while node:
+            info = node.info
+            if (low is not None and info <= low) or \
+                    (high is not None and info >= high):
+                return node
+            if node.right:
+                nodes.append(node.right)
+                lows.append(info)
+                highs.append(high)
+            node = node.left
+            high = info
+        if not nodes:
+            return None
+        node, low, high = nodes.pop(), lows.pop(), highs.pop()
+
+
 def is_binary_search_tree(root: Node) -> bool:
     """
-    Returns whether the tree is a valid binary search tree. Hint:
-    Recursive function. You can under some assumptions make use of
-    get_smallest_greater_value and get_greatest_smaller_value.
+    Returns whether the tree is a valid binary search tree, in a single
+    pass over the nodes, see find_violation.
 
     :param root: The root of the (sub)tree
     :return: true iff it is a valid binary search tree
     """
 
-    if not root:
-        return True
+    return find_violation(root) is None
 
-    if root.left and root.left.info > root.info:
-        return False
 
-    if root.right and root.right.info < root.info:
-        return False
-    
-    # Recursively check child nodes
-    if not is_binary_search_tree(root.left) or not is_binary_search_tree(root.right):
-        return False
-        
-    return True
+def inorder(root: typing.Optional[Node]) -> typing.Iterator:
+    """
+    Generates the values of the tree in in-order (left subtree, node,
+    right subtree), which is increasing order for a binary search tree.
+    Only the path from the root to the current node is kept in memory.
+
+    :param root: The root of the (sub)tree
+    :return: iterator over the values
+    """
+
+    stack = []
+    node = root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node.info
+        node = node.right
+
+
+def preorder(root: typing.Optional[Node]) -> typing.Iterator:
+    """
+    Generates the values of the tree in pre-order (node, left subtree,
+    right subtree). Only the right children of the path from the root to
+    the current node are kept in memory.
+
+    :param root: The root of the (sub)tree
+    :return: iterator over the values
+    """
+
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        while node:
+            yield node.info
+            if node.right:
+                stack.append(node.right)
+            node = node.left
+
+
+def postorder(root: typing.Optional[Node]) -> typing.Iterator:
+    """
+    Generates the values of the tree in post-order (left subtree, right
+    subtree, node). Only the path from the root to the current node is
+    kept in memory.
+
+    :param root: The root of the (sub)tree
+    :return: iterator over the values
+    """
+
+    stack = []
+    node = root
+    last = None
+    while stack or node:
+        if node:
+            stack.append(node)
+            node = node.left
+            continue
+        top = stack[-1]
+        if top.right and top.right is not last:
+            node = top.right
+        else:
+            yield top.info
+            last = stack.pop()
+
+
+def levelorder(root: typing.Optional[Node]) -> typing.Iterator:
+    """
+    Generates the values of the tree level by level, from left to right.
+    Unlike the other traversals this keeps the nodes of up to two levels
+    in memory, at most n / 2 + 1 nodes for a balanced tree.
+
+    :param root: The root of the (sub)tree
+    :return: iterator over the values
+    """
+
+    queue = collections.deque([root] if root else [])
+    while queue:
+        node = queue.popleft()
+        yield node.info
+        if node.left:
+            queue.append(node.left)
+        if node.right:
+            queue.append(node.right)
 
 
 def search(root: Node, value: int) -> typing.Tuple[typing.Optional[Node], typing.Optional[Node]]:
@@ -192,24 +321,62 @@ def add(root: Node, value: int) -> bool:
 def insert(root: Node, value: int) -> typing.Tuple[bool, typing.Optional[Node]]:
     """
     NOTE: Heb deze zelf toegevoegd
-    This actually inserts value in the binary search tree.
+    This actually inserts value in the binary search tree. Iterative
+    function.
 
     :param root: the root of the (sub)tree
     :param value: the value to be added
     :return: the new binary search tree, with the new node
     """
-    
-    # TODO: write test for this
 
     if not root:
         return Node(value, None, None)
 
-    if value == root.info:
-        return root
-    elif value > root.info:
-        root.right = insert(root.right, value)
+    node = root
+    while value != node.info:
+        if value > node.info:
+            if not node.right:
+                node.right = Node(value, None, None)
+                break
+            node = node.right
+        else:
+            if not node.left:
+                node.left = Node(value, None, None)
+                break
+            node = node.left
+
+    return root
+
+
+def _unlink(root: Node, parent: Node, node: Node) -> typing.Optional[Node]:
+    """
+    Removes node, found below parent by search, from the tree. A node with
+    two children takes over the value of its in-order successor, the
+    leftmost node of its right subtree, which is spliced out instead. A
+    node with at most one child is replaced by that child. Iterative
+    function.
+
+    :param root: the root of the tree
+    :param parent: the parent of node, or root if node is the root
+    :param node: the node to be removed
+    :return: the root node of the new tree
+    """
+
+    if node.left and node.right:
+        parent, successor = node, node.right
+        while successor.left:
+            parent, successor = successor, successor.left
+        node.info = successor.info
+        node = successor
+
+    # node has at most one child now, which takes its place
+    child = node.left if node.left else node.right
+    if node is root:
+        return child
+    if parent.left is node:
+        parent.left = child
     else:
-        root.left = insert(root.left, value)
+        parent.right = child
 
     return root
 
@@ -220,6 +387,7 @@ def remove(root: Node, value: int) -> typing.Tuple[bool, typing.Optional[Node]]:
     for each node all values in the left sub-tree are smaller than its value,
     and all values in the right subtree are greater than its value.
     Only removes the node with the value, if it does exist in the tree.
+    Iterative function.
 
     :param root: the root of the (sub)tree
     :param value: the value to be deleted
@@ -228,19 +396,280 @@ def remove(root: Node, value: int) -> typing.Tuple[bool, typing.Optional[Node]]:
       - the root node of the new tree
     """
 
-    # TODO: check TestTreeFunctions.test_delete_manual, die faalt nog
-
-    if not root:
-        # value was not found in this subtree
+    parent, node = search(root, value)
+    if not node:
+        # value was not found in this tree
         return False, root
-    
-    success = True
-    if value > root.info:
-        success, root.right = remove(root.right, value)
-    elif value < root.info:
-        success, root.left = remove(root.left, value)
-    else:
-        # Root has value, so remove root
-        return True, None
 
-    return success, root
+    return True, _unlink(root, parent, node)
+
+
+def build_from_sorted(array: np.array) -> typing.Optional[Node]:
+    """
+    Builds a perfectly balanced binary search tree from strictly increasing
+    values in O(n). The shape is computed with array operations, so the
+    only per-value work is creating and linking the Node objects.
+
+    :param array: The values, in strictly increasing order
+    :return: the root of the new tree, None if array is empty
+    """
+
+    array = np.asarray(array)
+    if np.any(array[1:] <= array[:-1]):
+        raise ValueError('array must be strictly increasing')
+    root, left, right = balanced_layout(len(array))
+    nodes = [Node(value, None, None) for value in array.tolist()]
+    for node, i, j in zip(nodes, left.tolist(), right.tolist()):
+        if i >= 0:
+            node.left = nodes[i]
+        if j >= 0:
+            node.right = nodes[j]
+
+    return nodes[root] if nodes else None
+
+
+def build_from_iterable(values: typing.Iterable) -> typing.Optional[Node]:
+    """
+    Builds a perfectly balanced binary search tree from values in any
+    order. The values are sorted and deduplicated with NumPy first.
+
+    :param values: The values
+    :return: the root of the new tree, None if there are no values
+    """
+
+    return build_from_sorted(sorted_unique(values))
+
+
+def _prepare_batch(values: np.array) \
+        -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sorts and deduplicates a batch of values
+
+    :param values: The batch
+    :return: a Tuple consisting of
+      - the distinct values in increasing order
+      - for every value in the batch, its position in the distinct values
+      - for every distinct value, its first position in the batch
+    """
+
+    values = np.asarray(values).ravel()
+    order = np.argsort(values, kind='stable')
+    ordered = values[order]
+    first = np.ones(len(values), dtype=bool)
+    np.not_equal(ordered[1:], ordered[:-1], out=first[1:])
+    inverse = np.empty(len(values), dtype=np.int64)
+    inverse[order] = np.cumsum(first) - 1
+
+    return ordered[first], inverse, order[first]
+
+
+def _descend(root: typing.Optional[Node], keys: np.ndarray) -> typing.Tuple[
+        list, list, np.ndarray, list]:
+    """
+    Searches all keys in a single descent of the tree. Every node splits
+    the range of keys that reached it into the keys that go left, the key
+    equal to it, and the keys that go right, so every node is visited at
+    most once per batch.
+
+    :param root: The root of the tree
+    :param keys: The keys to search, distinct and in increasing order
+    :return: a Tuple consisting of
+      - for every key, the parent as returned by search
+      - for every key, the node as returned by search
+      - for every key that was found, the depth of its node
+      - list of (parent, is_left, low, high) for every missing child below
+        which the keys[low:high] should have been
+    """
+
+    n = len(keys)
+    parents = [None] * n
+    nodes = [None] * n
+    depths = [0] * n
+    gaps = []
+    # Python floats and ints compare much faster than NumPy scalars
+    keys = keys.tolist()
+    stack = [(root, root, 0, 0, n)] if root and n else []
+    while stack:
+        node, parent, depth, low, high = stack.pop()
+        if high - low == 1:
+            # A single key is left, continue like search
+            key = keys[low]
+            while node.info != key:
+                child = node.left if key < node.info else node.right
+                if not child:
+                    parents[low] = node
+                    gaps.append((node, key < node.info, low, high))
+                    break
+                parent, node, depth = node, child, depth + 1
+            else:
+                parents[low], nodes[low], depths[low] = parent, node, depth
+            continue
+        info = node.info
+        i = bisect.bisect_left(keys, info, low, high)
+        j = i + 1 if i < high and keys[i] == info else i
+        if i < j:
+            parents[i], nodes[i], depths[i] = parent, node, depth
+        if low < i:
+            if node.left:
+                stack.append((node.left, node, depth + 1, low, i))
+            else:
+                parents[low:i] = [node] * (i - low)
+                gaps.append((node, True, low, i))
+        if j < high:
+            if node.right:
+                stack.append((node.right, node, depth + 1, j, high))
+            else:
+                parents[j:high] = [node] * (high - j)
+                gaps.append((node, False, j, high))
+
+    return parents, nodes, np.array(depths, dtype=np.int64), gaps
+
+
+def search_many(root: Node, values: np.array) -> typing.Tuple[
+        np.ndarray, typing.List[typing.Optional[Node]],
+        typing.List[typing.Optional[Node]]]:
+    """
+    Searches a batch of values at once, see search. The batch is sorted
+    and searched in a single descent of the tree.
+
+    :param root: The root of the (sub)tree
+    :param values: numpy array with the values to search
+    :return: a Tuple consisting of
+      - boolean numpy array of whether each value was found
+      - list with the parent (as returned by search) for each value
+      - list with the node (as returned by search) for each value
+    """
+
+    keys, inverse, _ = _prepare_batch(values)
+    parents, nodes, _, _ = _descend(root, keys)
+    parents = [parents[k] for k in inverse.tolist()]
+    nodes = [nodes[k] for k in inverse.tolist()]
+    found = np.fromiter((node is not None for node in nodes), dtype=bool,
+                        count=len(nodes))
+
+    return found, parents, nodes
+
+
+def add_many(root: typing.Optional[Node], values: np.array) \
+        -> typing.Tuple[np.ndarray, typing.Optional[Node]]:
+    """
+    Adds a batch of values to the binary search tree, see add. The batch
+    is sorted and merged into the tree in a single descent: all new values
+    that end up below the same missing child are inserted there as one
+    balanced subtree. An empty tree is built from the batch directly.
+
+    :param root: the root of the (sub)tree, None for an empty tree
+    :param values: numpy array with the values to be added
+    :return: a Tuple consisting of
+      - boolean numpy array of whether each value was added. Of duplicate
+        values in the batch only the first can be added.
+      - the root node of the new tree
+    """
+
+    keys, _, first = _prepare_batch(values)
+    if root is None:
+        added = np.zeros(len(np.asarray(values).ravel()), dtype=bool)
+        added[first] = True
+        return added, build_from_sorted(keys)
+
+    _, nodes, _, gaps = _descend(root, keys)
+    values_list = keys.tolist()
+    for parent, is_left, start, stop in gaps:
+        if stop - start == 1:
+            # Most gaps get a single value, skip the array operations
+            subtree = Node(values_list[start], None, None)
+        else:
+            subtree = build_from_sorted(keys[start:stop])
+        if is_left:
+            parent.left = subtree
+        else:
+            parent.right = subtree
+
+    added = np.zeros(len(np.asarray(values).ravel()), dtype=bool)
+    added[first[[node is None for node in nodes]]] = True
+
+    return added, root
+
+
+def remove_many(root: Node, values: np.array) \
+        -> typing.Tuple[np.ndarray, typing.Optional[Node]]:
+    """
+    Removes a batch of values from the binary search tree, see remove. The
+    batch is sorted and located in a single descent, after which the nodes
+    are removed deepest first, so removing one node never moves another
+    node of the batch.
+
+    :param root: the root of the (sub)tree
+    :param values: numpy array with the values to be deleted
+    :return: a Tuple consisting of
+      - boolean numpy array of whether each value was found and has been
+        deleted. Of duplicate values in the batch only the first counts.
+      - the root node of the new tree
+    """
+
+    keys, _, first = _prepare_batch(values)
+    parents, nodes, depths, _ = _descend(root, keys)
+    found = np.array([node is not None for node in nodes], dtype=bool)
+    for k in np.flatnonzero(found)[np.argsort(-depths[found],
+                                              kind='stable')].tolist():
+        root = _unlink(root, parents[k], nodes[k])
+
+    removed = np.zeros(len(np.asarray(values).ravel()), dtype=bool)
+    removed[first[found]] = True
+
+    return removed, root
+
+
+class BST(object):
+    """
+    Container around a binary search tree of Node objects, which keeps
+    track of the root and the number of values. Iterating over it
+    generates the values in increasing order, see inorder.
+    """
+
+    def __init__(self, values: typing.Iterable = ()):
+        """
+        Creates a balanced tree of the distinct values
+
+        :param values: The initial values, in any order
+        """
+
+        values = sorted_unique(values)
+        self.root = build_from_sorted(values)
+        self.size = len(values)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> typing.Iterator:
+        return inorder(self.root)
+
+    def __contains__(self, value) -> bool:
+        return search(self.root, value)[1] is not None
+
+    def add(self, value) -> bool:
+        """
+        Adds a value to the tree, if it does not exist yet in the tree
+
+        :param value: the value to be added
+        :return: true upon success, false upon failure
+        """
+
+        if self.root is None:
+            self.root = Node(value, None, None)
+        elif not add(self.root, value):
+            return False
+        self.size += 1
+        return True
+
+    def remove(self, value) -> bool:
+        """
+        Removes a value from the tree, if it exists
+
+        :param value: the value to be deleted
+        :return: true iff the value was found and has been deleted
+        """
+
+        removed, self.root = remove(self.root, value)
+        self.size -= removed
+        return removed
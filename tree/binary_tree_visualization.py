@@ -1,4 +1,6 @@
+import json
 import numpy as np
+import sys
 import typing
 
 from node import Node
@@ -9,8 +11,17 @@ from node import Node
 # to obtain a nice visualization of the given tree. 
 # A more basic visualization function that prints trees in a less
 # nice manner is given by visualize_tree(root: Node, type: str, depth: int)
+#
+# Large trees can be exported with write_text, write_dot and write_json,
+# which stream their output one node at a time and keep only the path to
+# the current node in memory. All functions take a max_depth to show only
+# the top levels, and focus(root, value) gives the subtree of a value.
 ############################################################################
 
+# visualize_tree prints deeper trees with write_text instead of drawing
+# lines longer than this
+MAX_WIDTH = 1 << 16
+
 # def visualize_tree(root: Node, type: str, depth: int) -> None:
 #     print('%s%s> %s' % ('--' * depth, type, root.info))
 #     if root is None:
@@ -26,12 +37,8 @@ def num_digits(n: int):
 
     :param n: The integer to analyze
     """
-    if n == 0:
-        return 1
-    d = (n < 0) # Account for the minus sign
-    n = np.abs(n)
-    d += int(np.ceil(np.log10(n+0.1)))
-    return d
+    # Includes the minus sign, like the printed value
+    return len(str(n))
 
 def preorder_traversal(root: Node) -> dict:
     """
@@ -64,15 +71,63 @@ def preorder_traversal(root: Node) -> dict:
             position = parent_position * 2 + 1
     return tree
 
-def visualize_tree(root: Node) -> None:
+def iter_levels(root: Node, max_depth: typing.Optional[int] = None) \
+        -> typing.Iterator[typing.List[typing.Tuple[typing.Any, int]]]:
+    """
+    Generates the levels of the tree one at a time. Only the current level
+    is kept in memory.
+
+    :param root: The root of the (sub)tree
+    :param max_depth: The depth of the last level to generate, None for all
+    :return: iterator over lists of tuples containing the value of a node
+             and its position in the level, like preorder_traversal
+    """
+    level = [(root, 0)] if root else []
+    depth = 0
+    while level and (max_depth is None or depth <= max_depth):
+        yield [(node.info, position) for node, position in level]
+        next_level = []
+        for node, position in level:
+            if node.left:
+                next_level.append((node.left, position * 2))
+            if node.right:
+                next_level.append((node.right, position * 2 + 1))
+        level = next_level
+        depth += 1
+
+def focus(root: Node, value) -> typing.Optional[Node]:
+    """
+    Finds the subtree of a value in a binary search tree, to visualize or
+    export only that part of the tree
+
+    :param root: The root of the tree
+    :param value: The value to look for
+    :return: the Node with the value, None if it is not in the tree
     """
-    Prints a visualization of the tree with connector lines
+    node = root
+    while node and node.info != value:
+        node = node.left if value < node.info else node.right
+    return node
+
+def visualize_tree(root: Node, max_depth: typing.Optional[int] = None,
+                   file: typing.Optional[typing.TextIO] = None) -> None:
+    """
+    Prints a visualization of the tree with connector lines, one level at a
+    time. The width doubles with every level, so trees with too many levels
+    to draw within MAX_WIDTH are printed with write_text instead.
 
     :param root: The root of the (sub)tree
+    :param max_depth: The depth of the last level to print, None for all
+    :param file: The file to print to, by default sys.stdout
     """
-    tree_preorder = preorder_traversal(root)
-    nlevels = len(tree_preorder.items())
-    for row, nodes in tree_preorder.items():
+    nlevels = 0
+    for _ in iter_levels(root, max_depth):
+        nlevels += 1
+        # Stop counting as soon as the levels are too wide
+        if 2 ** (nlevels + 1) > MAX_WIDTH:
+            write_text(root, file or sys.stdout, max_depth)
+            return
+    for row, nodes in enumerate(iter_levels(root, max_depth)):
         level_inv = nlevels - row
         # Is the width of the space at the begining of each line.
         # Between 2 consevutive values in a level there are 2 * space_width spaces
@@ -102,7 +157,102 @@ def visualize_tree(root: Node) -> None:
                 connector_line += '¯' * (space_width - 1)
             prev_position = position
         if row != 0:
-            print(connector_line)
-        print(number_line)
-    print('\n')
-    return
\ No newline at end of file
+            print(connector_line, file=file)
+        print(number_line, file=file)
+    print('\n', file=file)
+    return
+
+def _preorder(root: Node, max_depth: typing.Optional[int]) \
+        -> typing.Iterator[typing.Tuple[Node, str, int]]:
+    """
+    Generates (node, 'L', 'R' or 'T' for the root, depth) in preorder,
+    keeping only the right children along the current path in memory
+    """
+    stack = [(root, 'T', 0)] if root else []
+    while stack:
+        node, side, depth = stack.pop()
+        yield node, side, depth
+        if max_depth is not None and depth >= max_depth:
+            continue
+        if node.right:
+            stack.append((node.right, 'R', depth + 1))
+        if node.left:
+            stack.append((node.left, 'L', depth + 1))
+
+def _truncated(node: Node, depth: int, max_depth: typing.Optional[int]) -> bool:
+    return max_depth is not None and depth >= max_depth and \
+        (node.left is not None or node.right is not None)
+
+def write_text(root: Node, file: typing.TextIO,
+               max_depth: typing.Optional[int] = None) -> None:
+    """
+    Writes the tree as indented text, one node per line in preorder, in the
+    format of the basic visualize_tree above. Nodes whose children are cut
+    off by max_depth are followed by a line with '...'.
+
+    :param root: The root of the (sub)tree
+    :param file: The file to write to
+    :param max_depth: The depth of the last level to write, None for all
+    """
+    for node, side, depth in _preorder(root, max_depth):
+        file.write('%s%s> %s\n' % ('--' * depth, side, node.info))
+        if _truncated(node, depth, max_depth):
+            file.write('%s...\n' % ('--' * (depth + 1)))
+
+def write_dot(root: Node, file: typing.TextIO,
+              max_depth: typing.Optional[int] = None) -> None:
+    """
+    Writes the tree in the Graphviz DOT language. Nodes are numbered in
+    preorder, and nodes whose children are cut off by max_depth are drawn
+    dashed.
+
+    :param root: The root of the (sub)tree
+    :param file: The file to write to
+    :param max_depth: The depth of the last level to write, None for all
+    """
+    file.write('digraph tree {\n')
+    # Stack of the ids of the nodes on the path to the current node
+    path = []
+    for number, (node, side, depth) in enumerate(_preorder(root, max_depth)):
+        del path[depth:]
+        style = ', style=dashed' if _truncated(node, depth, max_depth) else ''
+        file.write('  n%d [label=%s%s];\n'
+                   % (number, json.dumps(str(node.info)), style))
+        if path:
+            file.write('  n%d -> n%d [label=%s];\n' % (path[-1], number, side))
+        path.append(number)
+    file.write('}\n')
+
+def _json_value(value):
+    # NumPy scalars are not JSON serializable
+    return value.item() if isinstance(value, np.generic) else value
+
+def write_json(root: Node, file: typing.TextIO,
+               max_depth: typing.Optional[int] = None) -> None:
+    """
+    Writes the tree as nested JSON objects {"info": ..., "left": ...,
+    "right": ...}, with null for missing children. Nodes whose children are
+    cut off by max_depth get "truncated": true instead of left and right.
+
+    :param root: The root of the (sub)tree
+    :param file: The file to write to
+    :param max_depth: The depth of the last level to write, None for all
+    """
+    # Stack of text to write and (node, depth) to expand, in reverse order
+    stack = [(root, 0)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            file.write(item)
+            continue
+        node, depth = item
+        if node is None:
+            file.write('null')
+            continue
+        file.write('{"info": %s' % json.dumps(_json_value(node.info)))
+        if _truncated(node, depth, max_depth):
+            file.write(', "truncated": true}')
+            continue
+        stack.extend(['}', (node.right, depth + 1), ', "right": ',
+                      (node.left, depth + 1), ', "left": '])
+    file.write('\n')
@@ -0,0 +1,121 @@
+import threading
+import time
+import typing
+
+from balanced_tree import AVLTree
+from binary_tree import inorder
+
+############################################################################
+# Thread-safe wrapper around a binary search tree. Writers are serialized
+# by a lock and make the version counter odd while they change the tree
+# (a sequence lock). Readers take no lock: they read the version, search
+# the tree and read the version again, and only trust the result if no
+# writer was active in between. A read that keeps colliding with writers
+# falls back to taking the lock, so readers always make progress.
+############################################################################
+
+
+class ConcurrentTree(object):
+    """
+    Set of values backed by a mutable tree, an AVLTree by default, that can
+    be shared by any number of reader and writer threads. The tree must
+    follow the search contract of binary_tree.search: search(value) returns
+    a pair whose second element is None iff the value is absent, and add
+    and remove update the tree in place and return whether they changed
+    it. This holds for the binary search trees in this package and BTree,
+    but not for PersistentTree, which needs no locking anyway.
+
+    Unlocked readers can see a half-applied update, so the tree must never
+    link its nodes into a cycle while updating, which holds for the
+    rotations, splicing, splits and merges of these trees.
+    """
+
+    # Optimistic attempts before a read takes the writer lock
+    MAX_RETRIES = 8
+
+    def __init__(self, tree=None):
+        """
+        Wraps a tree. The tree must not be used directly anymore.
+
+        :param tree: The tree to wrap, a new AVLTree by default
+        """
+
+        if tree is None:
+            tree = AVLTree()
+        for method in ('search', 'add', 'remove'):
+            if not callable(getattr(tree, method, None)):
+                raise TypeError('%s has no %s method'
+                                % (type(tree).__name__, method))
+        self.tree = tree
+        self._lock = threading.Lock()
+        # Odd while a writer is changing the tree
+        self._version = 0
+
+    def _write(self, update: typing.Callable, value) -> bool:
+        with self._lock:
+            self._version += 1
+            try:
+                return update(value)
+            finally:
+                self._version += 1
+
+    def _read(self, query: typing.Callable, *args):
+        for _ in range(self.MAX_RETRIES):
+            version = self._version
+            if version % 2:
+                # Let the writer finish
+                time.sleep(0)
+                continue
+            try:
+                result = query(*args)
+            except (AttributeError, TypeError, IndexError):
+                # The search went astray in a half-applied update, e.g. into
+                # a missing child or past the keys of a B-tree node being
+                # split or merged
+                continue
+            if self._version == version:
+                return result
+        with self._lock:
+            return query(*args)
+
+    def _contains(self, value) -> bool:
+        return self.tree.search(value)[1] is not None
+
+    def __contains__(self, value) -> bool:
+        return self._read(self._contains, value)
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def add(self, value) -> bool:
+        """
+        Adds a value to the tree, if it does not exist yet in the tree
+
+        :param value: the value to be added
+        :return: true upon success, false upon failure
+        """
+
+        return self._write(self.tree.add, value)
+
+    def remove(self, value) -> bool:
+        """
+        Removes a value from the tree, if it exists
+
+        :param value: the value to be deleted
+        :return: true iff the value was found and has been deleted
+        """
+
+        return self._write(self.tree.remove, value)
+
+    def to_list(self) -> typing.List:
+        """
+        Returns all values in increasing order, as a consistent copy. This
+        blocks writers while it runs.
+
+        :return: list of the values
+        """
+
+        with self._lock:
+            if hasattr(self.tree, '__iter__'):
+                return list(self.tree)
+            return list(inorder(self.tree.root))
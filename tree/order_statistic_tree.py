@@ -0,0 +1,116 @@
+import typing
+
+from balanced_tree import AVLNode, AVLTree, _height
+
+
+class OrderStatisticNode(AVLNode):
+
+    def __init__(self, info, left, right):
+        super().__init__(info, left, right)
+        # Number of nodes in the subtree
+        self.size = 1
+
+
+def _size(node: typing.Optional[OrderStatisticNode]) -> int:
+    return node.size if node else 0
+
+
+class OrderStatisticTree(AVLTree):
+    """
+    AVL tree in which every node also stores the size of its subtree. The
+    sizes are maintained by add and remove, so the position of a value in
+    sorted order (rank), the value at a position (select) and the number of
+    values in a range are found in a single descent, in O(log n).
+    """
+
+    node_class = OrderStatisticNode
+
+    def _update(self, node: OrderStatisticNode) -> None:
+        node.height = max(_height(node.left), _height(node.right)) + 1
+        node.size = _size(node.left) + _size(node.right) + 1
+
+    def _count_below(self, value, inclusive: bool) -> int:
+        count = 0
+        node = self.root
+        while node:
+            if value < node.info or (value == node.info and not inclusive):
+                node = node.left
+            else:
+                count += _size(node.left) + 1
+                node = node.right
+        return count
+
+    def rank(self, value) -> int:
+        """
+        Counts the values in the tree that are smaller than value, which is
+        the position value has or would have in sorted order
+
+        :param value: The value to rank, which need not be in the tree
+        :return: the number of smaller values
+        """
+
+        return self._count_below(value, inclusive=False)
+
+    def select(self, k: int):
+        """
+        Finds the k-th smallest value in the tree, counting from 0
+
+        :param k: The position in sorted order, 0 <= k < len(self)
+        :return: the value at position k
+        """
+
+        if not 0 <= k < self.size:
+            raise IndexError('position %d out of range' % k)
+        node = self.root
+        while True:
+            n_left = _size(node.left)
+            if k == n_left:
+                return node.info
+            if k < n_left:
+                node = node.left
+            else:
+                k -= n_left + 1
+                node = node.right
+
+    def count_range(self, low, high) -> int:
+        """
+        Counts the values v in the tree with low <= v <= high
+
+        :param low: The lower bound of the range
+        :param high: The upper bound of the range
+        :return: the number of values in the range
+        """
+
+        if high < low:
+            return 0
+        return self._count_below(high, inclusive=True) - \
+            self._count_below(low, inclusive=False)
+
+    def range_iter(self, low, high) -> typing.Iterator:
+        """
+        Generates the values v in the tree with low <= v <= high in
+        increasing order. Subtrees outside the range are skipped, so this
+        takes O(log n + number of values generated).
+
+        :param low: The lower bound of the range
+        :param high: The upper bound of the range
+        :return: iterator over the values in the range
+        """
+
+        # Stack of the nodes whose value and right subtree are still to do
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                if node.info < low:
+                    # Everything on the left is too small
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+                continue
+            node = stack.pop()
+            if node.info > high:
+                return
+            yield node.info
+            node = node.right
@@ -0,0 +1,162 @@
+import typing
+
+from balanced_tree import AVLNode, _height
+from binary_tree import inorder, search
+
+############################################################################
+# Persistent AVL tree. Nodes are never changed once they are part of a
+# tree: add and remove copy only the nodes on the path from the root to
+# the change (O(log n) of them) and return a new tree, which shares all
+# other subtrees with the old one. Every PersistentTree is therefore an
+# immutable snapshot. A writer can publish a new version by assigning it to
+# a shared variable, while readers keep using the version they hold,
+# without any locking.
+############################################################################
+
+
+def _node(info, left: typing.Optional[AVLNode],
+          right: typing.Optional[AVLNode]) -> AVLNode:
+    node = AVLNode(info, left, right)
+    node.height = max(_height(left), _height(right)) + 1
+    return node
+
+
+def _balance(info, left: typing.Optional[AVLNode],
+             right: typing.Optional[AVLNode]) -> AVLNode:
+    """
+    Creates a node from a value and two balanced subtrees whose heights
+    differ by at most two, rotating into new nodes if needed
+
+    :param info: The value of the node
+    :param left: The left subtree
+    :param right: The right subtree
+    :return: the root of the new, balanced subtree
+    """
+
+    balance = _height(left) - _height(right)
+    if balance > 1:
+        if _height(left.left) < _height(left.right):
+            pivot = left.right
+            return _node(pivot.info, _node(left.info, left.left, pivot.left),
+                         _node(info, pivot.right, right))
+        return _node(left.info, left.left, _node(info, left.right, right))
+    if balance < -1:
+        if _height(right.right) < _height(right.left):
+            pivot = right.left
+            return _node(pivot.info, _node(info, left, pivot.left),
+                         _node(right.info, pivot.right, right.right))
+        return _node(right.info, _node(info, left, right.left), right.right)
+    return _node(info, left, right)
+
+
+def _rebuild(path: typing.List[typing.Tuple[AVLNode, bool]],
+             subtree: typing.Optional[AVLNode]) -> typing.Optional[AVLNode]:
+    """
+    Copies the nodes on a path bottom-up, with the new subtree in place of
+    the child the path ended in
+
+    :param path: The (node, whether the path went left) pairs from the
+    root down
+    :param subtree: The new subtree below the last node of the path
+    :return: the new root
+    """
+
+    for node, went_left in reversed(path):
+        if went_left:
+            subtree = _balance(node.info, subtree, node.right)
+        else:
+            subtree = _balance(node.info, node.left, subtree)
+    return subtree
+
+
+class PersistentTree(object):
+    """
+    Immutable AVL tree, see the comment at the top of this file. Updates
+    return a new PersistentTree and leave the tree they are called on
+    unchanged.
+    """
+
+    def __init__(self, root: typing.Optional[AVLNode] = None, size: int = 0):
+        self.root = root
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> typing.Iterator:
+        return inorder(self.root)
+
+    def __contains__(self, value) -> bool:
+        return search(self.root, value)[1] is not None
+
+    def search(self, value) -> typing.Tuple[typing.Optional[AVLNode],
+                                            typing.Optional[AVLNode]]:
+        """
+        Returns the parent of the node with a certain value and the node
+        itself, see binary_tree.search
+
+        :param value: The value to look for
+        :return: tuple of the parent and the node
+        """
+
+        return search(self.root, value)
+
+    def get_height(self) -> int:
+        """
+        Determines the height of the tree in O(1)
+
+        :return: the height of the tree, 0 for a single node or empty tree
+        """
+
+        return max(_height(self.root), 0)
+
+    def add(self, value) -> 'PersistentTree':
+        """
+        Adds a value, copying the path from the root to the new node
+
+        :param value: the value to be added
+        :return: the new tree, or this tree if it already holds the value
+        """
+
+        path = []
+        node = self.root
+        while node:
+            if value == node.info:
+                return self
+            went_left = value < node.info
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        return PersistentTree(_rebuild(path, _node(value, None, None)),
+                              self.size + 1)
+
+    def remove(self, value) -> 'PersistentTree':
+        """
+        Removes a value, copying the path from the root to the removed node.
+        A node with two children is replaced by a copy holding the value of
+        its in-order successor, which is removed from the right subtree.
+
+        :param value: the value to be deleted
+        :return: the new tree, or this tree if it does not hold the value
+        """
+
+        path = []
+        node = self.root
+        while node and node.info != value:
+            went_left = value < node.info
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        if not node:
+            return self
+
+        if not node.left or not node.right:
+            subtree = node.left if node.left else node.right
+        else:
+            # Remove the leftmost node of the right subtree
+            right_path = []
+            successor = node.right
+            while successor.left:
+                right_path.append((successor, True))
+                successor = successor.left
+            right = _rebuild(right_path, successor.right)
+            subtree = _balance(successor.info, node.left, right)
+        return PersistentTree(_rebuild(path, subtree), self.size - 1)
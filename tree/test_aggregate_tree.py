@@ -0,0 +1,42 @@
+import numpy as np
+import unittest
+
+from aggregate_tree import AggregateTree
+from binary_tree import count_leafs, get_height, get_highest_value
+from test_balanced_tree import check_avl
+
+
+class TestAggregateTree(unittest.TestCase):
+
+    def test_random_updates(self):
+        rng = np.random.default_rng(0)
+        tree = AggregateTree()
+        for value in rng.integers(300, size=3000).tolist():
+            if rng.random() < 0.6:
+                tree.add(value)
+            else:
+                tree.remove(value)
+            if tree.root is None:
+                self.assertEqual(0, tree.count_leafs())
+                continue
+            self.assertEqual(count_leafs(tree.root), tree.count_leafs())
+            self.assertEqual(get_height(tree.root), tree.get_height())
+            self.assertEqual(get_highest_value(tree.root),
+                             tree.get_highest_value())
+        check_avl(tree.root)
+
+    def test_empty(self):
+        tree = AggregateTree()
+        self.assertEqual(0, tree.count_leafs())
+        self.assertEqual(0, tree.get_height())
+        with self.assertRaises(ValueError):
+            tree.get_highest_value()
+        tree.add(5)
+        self.assertEqual(1, tree.count_leafs())
+        self.assertEqual(5, tree.get_highest_value())
+        tree.remove(5)
+        self.assertEqual(0, tree.count_leafs())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import numpy as np
+import unittest
+
+from array_tree import ArrayTree, NONE
+from binary_tree import count_leafs, get_height, get_highest_value
+from test_binary_tree import TreeGenerator
+
+
+def inorder(tree: ArrayTree) -> list:
+    values, stack, slot = [], [], tree.root
+    while stack or slot != NONE:
+        while slot != NONE:
+            stack.append(slot)
+            slot = int(tree.left[slot])
+        slot = stack.pop()
+        values.append(int(tree.info[slot]))
+        slot = int(tree.right[slot])
+    return values
+
+
+class TestArrayTree(unittest.TestCase):
+
+    def test_aggregates(self):
+        for root, rep, _ in TreeGenerator.all_bt_cases():
+            tree = ArrayTree.from_node(root)
+            self.assertEqual(len(rep), len(tree))
+            self.assertEqual(count_leafs(root), tree.count_leafs())
+            self.assertEqual(get_height(root), tree.get_height())
+            self.assertEqual(get_highest_value(root),
+                             tree.get_highest_value())
+
+    def test_search(self):
+        for root, rep, _, _ in TreeGenerator.all_bst_cases():
+            tree = ArrayTree.from_node(root)
+            for value in range(20):
+                parent, node = tree.search(value)
+                self.assertEqual(value in list(rep), node != NONE)
+                if node != NONE:
+                    self.assertEqual(value, tree.info[node])
+
+    def test_add_remove(self):
+        rng = np.random.default_rng(0)
+        tree = ArrayTree(capacity=2)
+        values = set()
+        for value in rng.integers(200, size=2000).tolist():
+            if rng.random() < 0.6:
+                self.assertEqual(value not in values, tree.add(value))
+                values.add(value)
+            else:
+                self.assertEqual(value in values, tree.remove(value))
+                values.discard(value)
+            self.assertEqual(len(values), len(tree))
+        self.assertEqual(sorted(values), inorder(tree))
+        self.assertEqual(max(values), tree.get_highest_value())
+        self.assertEqual(count_leafs(tree.to_node()), tree.count_leafs())
+        self.assertEqual(get_height(tree.to_node()), tree.get_height())
+        # Removed slots are reused before the columns grow
+        self.assertLessEqual(tree.high_water, 2 * 200)
+
+    def test_inexact_values(self):
+        tree = ArrayTree()
+        for value in (0, 2, 4):
+            tree.add(value)
+        for value in (2.5, 2 ** 70, np.inf, np.nan):
+            with self.assertRaises(ValueError):
+                tree.add(value)
+            self.assertEqual(NONE, tree.search(value)[1])
+            self.assertFalse(tree.remove(value))
+        self.assertEqual(3, len(tree))
+        self.assertEqual([0, 2, 4], inorder(tree))
+        # Exact values of another type are converted
+        self.assertFalse(tree.add(2.0))
+        self.assertTrue(tree.add(np.int8(3)))
+        self.assertNotEqual(NONE, tree.search(3.0)[1])
+        self.assertTrue(tree.remove(3.0))
+
+    def test_remove_root(self):
+        tree = ArrayTree()
+        for value in (3, 1, 5, 4, 6):
+            tree.add(value)
+        self.assertTrue(tree.remove(3))
+        self.assertEqual([1, 4, 5, 6], inorder(tree))
+        for value in (1, 4, 5, 6):
+            self.assertTrue(tree.remove(value))
+        self.assertEqual(NONE, tree.root)
+        self.assertEqual(0, tree.count_leafs())
+        self.assertEqual(0, tree.get_height())
+        self.assertIsNone(tree.to_node())
+
+    def test_find_violation(self):
+        for root, _, _ in TreeGenerator.all_bt_cases():
+            tree = ArrayTree.from_node(root)
+            node = tree.find_violation()
+            self.assertNotEqual(NONE, node)
+            self.assertFalse(tree.is_binary_search_tree())
+        for root, _, _, _ in TreeGenerator.all_bst_cases():
+            self.assertTrue(ArrayTree.from_node(root).is_binary_search_tree())
+        self.assertEqual(NONE, ArrayTree().find_violation())
+
+        tree = ArrayTree.from_sorted(np.arange(100))
+        self.assertTrue(tree.is_binary_search_tree())
+        # Slot 60 is deep down in the right subtree of the root 50, and has
+        # 61 in its right subtree and 62 as its right child
+        for value, expected in ((49, 60), (50, 60), (61, 61), (62, 62)):
+            tree.info[60] = value
+            self.assertEqual(expected, tree.find_violation())
+
+    def test_memory(self):
+        tree = ArrayTree(capacity=1000)
+        self.assertEqual(16 * 1000, tree.nbytes)
+
+    def test_from_sorted(self):
+        for n in (0, 1, 2, 3, 10, 255, 256, 1000):
+            tree = ArrayTree.from_sorted(np.arange(n) * 3)
+            self.assertEqual(n, len(tree))
+            self.assertEqual(list(range(0, 3 * n, 3)), inorder(tree))
+            expected_height = int(np.ceil(np.log2(n + 1))) - 1 if n else 0
+            self.assertEqual(expected_height, tree.get_height())
+            tree.add(-1)
+            self.assertEqual(n + 1, len(tree))
+            self.assertEqual(-1, inorder(tree)[0])
+        with self.assertRaises(ValueError):
+            ArrayTree.from_sorted([1, 3, 3])
+
+    def test_from_iterable(self):
+        values = [5, 3, 9, 3, 1, 5]
+        tree = ArrayTree.from_iterable(iter(values))
+        self.assertEqual([1, 3, 5, 9], inorder(tree))
@@ -0,0 +1,141 @@
+import numpy as np
+import unittest
+
+from b_tree import BTree
+from concurrent_tree import ConcurrentTree
+
+
+def check_b_tree(tree: BTree) -> None:
+    """
+    Asserts the B-tree conditions: keys sorted within and across nodes,
+    between t-1 and 2t-1 keys per node but the root, n + 1 children per
+    internal node and all leaves on the same level
+    """
+
+    leaf_depths = set()
+    stack = [(tree.root, 0, None, None)]
+    while stack:
+        node, depth, low, high = stack.pop()
+        keys = node.keys[:node.n]
+        assert np.all(keys[1:] > keys[:-1])
+        assert low is None or np.all(keys > low)
+        assert high is None or np.all(keys < high)
+        assert node.n <= 2 * tree.t - 1
+        assert node is tree.root or node.n >= tree.t - 1
+        if node.leaf:
+            leaf_depths.add(depth)
+            continue
+        assert len(node.children) == node.n + 1
+        bounds = [low] + keys.tolist() + [high]
+        for i, child in enumerate(node.children):
+            stack.append((child, depth + 1, bounds[i], bounds[i + 1]))
+    assert len(leaf_depths) == 1
+
+
+class TestBTree(unittest.TestCase):
+
+    def test_random_updates(self):
+        rng = np.random.default_rng(0)
+        for t in (2, 3, 16):
+            tree = BTree(t)
+            values = set()
+            for value in rng.integers(500, size=4000).tolist():
+                if rng.random() < 0.6:
+                    self.assertEqual(value not in values, tree.add(value))
+                    values.add(value)
+                else:
+                    self.assertEqual(value in values, tree.remove(value))
+                    values.discard(value)
+                self.assertEqual(len(values), len(tree))
+            check_b_tree(tree)
+            self.assertEqual(sorted(values), list(tree))
+            self.assertEqual(max(values), tree.get_highest_value())
+            for value in sorted(values):
+                self.assertTrue(tree.remove(value))
+            check_b_tree(tree)
+            self.assertEqual([], list(tree))
+            self.assertEqual(0, tree.get_height())
+            with self.assertRaises(ValueError):
+                tree.get_highest_value()
+
+    def test_search(self):
+        tree = BTree(2)
+        for value in range(0, 100, 2):
+            tree.add(value)
+        self.assertGreater(tree.get_height(), 2)
+        for value in range(-1, 101):
+            node, i = tree.search(value)
+            if value % 2 or not 0 <= value < 100:
+                # The leaf the value would be added to
+                self.assertIsNone(i)
+                self.assertTrue(node.leaf)
+                self.assertNotIn(value, tree)
+            else:
+                self.assertEqual(value, node.keys[i])
+                self.assertIn(value, tree)
+
+    def test_search_many(self):
+        rng = np.random.default_rng(1)
+        tree = BTree(4)
+        for value in rng.integers(1000, size=300).tolist():
+            tree.add(value)
+        queries = rng.integers(-10, 1010, size=500)
+        found, nodes, positions = tree.search_many(queries)
+        for k, value in enumerate(queries.tolist()):
+            node, i = tree.search(value)
+            self.assertEqual(i is not None, found[k])
+            if found[k]:
+                self.assertIs(node, nodes[k])
+                self.assertEqual(i, positions[k])
+            else:
+                self.assertIsNone(nodes[k])
+                self.assertEqual(-1, positions[k])
+        found, _, _ = BTree().search_many([1, 2])
+        self.assertFalse(np.any(found))
+
+    def test_search_contract(self):
+        # The B-tree can stand in for the binary search trees
+        tree = ConcurrentTree(BTree(2))
+        for value in range(20):
+            self.assertTrue(tree.add(value))
+        self.assertFalse(tree.add(3))
+        self.assertTrue(tree.remove(3))
+        self.assertFalse(tree.remove(3))
+        for value in range(-1, 21):
+            self.assertEqual(0 <= value < 20 and value != 3, value in tree)
+        self.assertEqual(19, len(tree))
+
+    def test_inexact_values(self):
+        tree = BTree(2)
+        for value in range(0, 10, 2):
+            tree.add(value)
+        for value in (2.5, 2 ** 70, np.inf, np.nan):
+            with self.assertRaises(ValueError):
+                tree.add(value)
+            self.assertIsNone(tree.search(value)[1])
+            self.assertNotIn(value, tree)
+            self.assertFalse(tree.remove(value))
+        self.assertEqual(5, len(tree))
+        self.assertEqual([0, 2, 4, 6, 8], list(tree))
+        check_b_tree(tree)
+        # Exact values of another type are converted
+        self.assertFalse(tree.add(2.0))
+        self.assertTrue(tree.add(np.int8(3)))
+        self.assertIn(3.0, tree)
+        self.assertTrue(tree.remove(3.0))
+        self.assertIs(int, type(tree.get_highest_value()))
+
+    def test_dtype(self):
+        tree = BTree(2, dtype=np.float64)
+        for value in (0.5, -2.25, 3.0, np.inf, 1e-3):
+            self.assertTrue(tree.add(value))
+        self.assertEqual([-2.25, 1e-3, 0.5, 3.0, np.inf], list(tree))
+        self.assertIn(np.inf, tree)
+        self.assertTrue(tree.remove(np.inf))
+        self.assertEqual(3.0, tree.get_highest_value())
+        with self.assertRaises(ValueError):
+            BTree(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
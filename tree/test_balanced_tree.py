@@ -0,0 +1,90 @@
+import numpy as np
+import unittest
+
+from balanced_tree import AVLTree, RedBlackTree
+from binary_tree import get_height, is_binary_search_tree
+
+
+def inorder(root) -> list:
+    values, stack = [], []
+    while stack or root:
+        while root:
+            stack.append(root)
+            root = root.left
+        root = stack.pop()
+        values.append(root.info)
+        root = root.right
+    return values
+
+
+def check_avl(root) -> int:
+    if root is None:
+        return -1
+    left, right = check_avl(root.left), check_avl(root.right)
+    assert abs(left - right) <= 1, 'unbalanced at %s' % root.info
+    assert root.height == max(left, right) + 1
+    return root.height
+
+
+def check_red_black(root, parent=None) -> int:
+    if root is None:
+        return 1
+    assert root.parent is parent
+    assert parent or not root.red, 'the root must be black'
+    if root.red:
+        assert not (root.left and root.left.red)
+        assert not (root.right and root.right.red)
+    left = check_red_black(root.left, root)
+    assert left == check_red_black(root.right, root)
+    return left + (not root.red)
+
+
+class TestBalancedTrees(unittest.TestCase):
+
+    def trees(self):
+        return [(AVLTree(), lambda t: check_avl(t.root)),
+                (RedBlackTree(), lambda t: check_red_black(t.root))]
+
+    def test_random_updates(self):
+        rng = np.random.default_rng(0)
+        for tree, check in self.trees():
+            values = set()
+            for value in rng.integers(300, size=3000).tolist():
+                if rng.random() < 0.6:
+                    self.assertEqual(value not in values, tree.add(value))
+                    values.add(value)
+                else:
+                    self.assertEqual(value in values, tree.remove(value))
+                    values.discard(value)
+                parent, node = tree.search(value)
+                self.assertEqual(value in values, node is not None)
+            check(tree)
+            self.assertEqual(sorted(values), inorder(tree.root))
+            self.assertEqual(len(values), len(tree))
+            self.assertTrue(is_binary_search_tree(tree.root))
+
+    def test_sorted_inserts(self):
+        n = 2 ** 12 - 1
+        for stream in (range(n), range(n, 0, -1)):
+            for tree, check in self.trees():
+                for value in stream:
+                    tree.add(value)
+                check(tree)
+                # AVL height <= 1.44 log2(n), red-black <= 2 log2(n + 1)
+                self.assertLessEqual(get_height(tree.root),
+                                     2 * np.log2(n + 1))
+        tree = AVLTree()
+        for value in range(n):
+            tree.add(value)
+        self.assertEqual(get_height(tree.root), tree.get_height())
+        self.assertEqual(11, tree.get_height())
+
+    def test_remove_all(self):
+        for tree, check in self.trees():
+            for value in range(100):
+                tree.add(value)
+            for value in list(range(0, 100, 2)) + list(range(99, 0, -2)):
+                self.assertTrue(tree.remove(value))
+                check(tree)
+            self.assertIsNone(tree.root)
+            self.assertFalse(tree.remove(5))
@@ -64,6 +64,12 @@ class TreeGenerator(object):
         ]
 
 
+def count_nodes(root: typing.Optional[Node]) -> int:
+    if root is None:
+        return 0
+    return 1 + count_nodes(root.left) + count_nodes(root.right)
+
+
 class TestTreeFunctions(unittest.TestCase):
 
     def test_count_leafs(self):
@@ -94,6 +100,9 @@ class TestTreeFunctions(unittest.TestCase):
         for tree, _, _, sgv in TreeGenerator.all_bst_cases():
             node = get_smallest_greater_value(tree)
             self.assertEqual(sgv, node.info)
+        # The right child has no right child, but a smaller left child
+        tree = Node(5, None, Node(8, Node(7, Node(6, None, None), None), None))
+        self.assertEqual(6, get_smallest_greater_value(tree).info)
 
     def test_is_binary_search_tree(self):
         for tree, _, _ in TreeGenerator.all_bt_cases():
@@ -104,6 +113,20 @@ class TestTreeFunctions(unittest.TestCase):
             is_bst = is_binary_search_tree(tree)
             self.assertTrue(is_bst)
 
+    def test_find_violation(self):
+        for tree, _, _, _ in TreeGenerator.all_bst_cases():
+            self.assertIsNone(find_violation(tree))
+        self.assertIsNone(find_violation(None))
+        # Every node is ordered with respect to its children, but 7 is in
+        # the left subtree of 5
+        bad = Node(7, None, None)
+        root = Node(5, Node(3, Node(1, None, None), bad), Node(8, None, None))
+        self.assertIs(bad, find_violation(root))
+        self.assertFalse(is_binary_search_tree(root))
+        # Values must be distinct
+        duplicate = Node(5, None, None)
+        self.assertIs(duplicate, find_violation(Node(5, duplicate, None)))
+
     def test_search(self):
         for tree, rep, _, _ in TreeGenerator.all_bst_cases():
             for value in range(20):
@@ -123,6 +146,151 @@ class TestTreeFunctions(unittest.TestCase):
                 self.assertFalse(child is None)
                 self.assertTrue(is_binary_search_tree(tree))
 
+    def test_insert(self):
+        for tree, rep, _, _ in TreeGenerator.all_bst_cases():
+            for value in range(20):
+                tree = insert(tree, value)
+                parent, child = search(tree, value)
+                self.assertFalse(child is None)
+                self.assertTrue(is_binary_search_tree(tree))
+            self.assertEqual(len(set(rep) | set(range(20))),
+                             count_nodes(tree))
+        root = insert(None, 5)
+        self.assertEqual(5, root.info)
+
+    def test_deep_tree(self):
+        # Degenerate trees much deeper than the recursion limit
+        n = 20000
+        root = None
+        for value in range(n - 1, -1, -1):
+            root = Node(value, None, root)
+        self.assertEqual(n - 1, get_height(root))
+        self.assertEqual(1, count_leafs(root))
+        self.assertEqual(n - 1, get_highest_value(root))
+        self.assertTrue(is_binary_search_tree(root))
+        insert(root, n)
+        self.assertEqual(n, get_height(root))
+        success, root = remove(root, n // 2)
+        self.assertTrue(success)
+        self.assertEqual(n - 1, get_height(root))
+        self.assertEqual(n, sum(1 for _ in inorder(root)))
+
+    def test_build_from_sorted(self):
+        for n in (0, 1, 2, 3, 10, 255, 256, 1000):
+            root = build_from_sorted(np.arange(n))
+            if n == 0:
+                self.assertIsNone(root)
+                continue
+            self.assertEqual(n, sum(1 for _ in inorder(root)))
+            self.assertTrue(is_binary_search_tree(root))
+            self.assertEqual(int(np.ceil(np.log2(n + 1))) - 1,
+                             get_height(root))
+            for value in range(n):
+                self.assertIsNotNone(search(root, value)[1])
+        with self.assertRaises(ValueError):
+            build_from_sorted([2, 1])
+
+    def test_build_from_iterable(self):
+        rng = np.random.default_rng(0)
+        values = rng.integers(1000, size=500)
+        root = build_from_iterable(values)
+        self.assertEqual(len(np.unique(values)), count_nodes(root))
+        self.assertTrue(is_binary_search_tree(root))
+        root = build_from_iterable(iter([3, 1, 2, 3]))
+        self.assertEqual(2, root.info)
+        self.assertEqual(1, get_height(root))
+
+    def test_traversals(self):
+        def reference(root, order):
+            if root is None:
+                return []
+            left = reference(root.left, order)
+            right = reference(root.right, order)
+            return {'in': left + [root.info] + right,
+                    'pre': [root.info] + left + right,
+                    'post': left + right + [root.info]}[order]
+
+        for tree, rep, _ in TreeGenerator.all_bt_cases():
+            self.assertEqual(reference(tree, 'in'), list(inorder(tree)))
+            self.assertEqual(reference(tree, 'pre'), list(preorder(tree)))
+            self.assertEqual(reference(tree, 'post'), list(postorder(tree)))
+            # generate_structure lays the values out in level order
+            self.assertEqual(rep.tolist(), list(levelorder(tree)))
+        for traversal in (inorder, preorder, postorder, levelorder):
+            self.assertEqual([], list(traversal(None)))
+
+        n = 20000
+        root = None
+        for value in range(n):
+            root = Node(value, root, None)
+        self.assertEqual(list(range(n)), list(inorder(root)))
+        self.assertEqual(list(range(n - 1, -1, -1)), list(preorder(root)))
+        self.assertEqual(list(range(n)), list(postorder(root)))
+
+    def test_bst(self):
+        bst = BST([5, 3, 8, 3, 1])
+        self.assertEqual(4, len(bst))
+        self.assertEqual([1, 3, 5, 8], list(bst))
+        self.assertIn(8, bst)
+        self.assertNotIn(4, bst)
+        self.assertTrue(bst.add(4))
+        self.assertFalse(bst.add(4))
+        self.assertEqual([1, 3, 4, 5, 8], list(bst))
+        self.assertEqual(5, len(bst))
+        empty = BST()
+        self.assertEqual(0, len(empty))
+        self.assertNotIn(1, empty)
+        self.assertTrue(empty.add(1))
+        self.assertEqual([1], list(empty))
+        self.assertTrue(bst.remove(3))
+        self.assertFalse(bst.remove(3))
+        self.assertEqual([1, 4, 5, 8], list(bst))
+        self.assertEqual(4, len(bst))
+
+    def test_search_many(self):
+        values = np.array([5, -1, 45, 3, 45, 100, 200, 0])
+        for tree, _, _, _ in TreeGenerator.all_bst_cases():
+            found, parents, nodes = search_many(tree, values)
+            for i, value in enumerate(values):
+                parent, node = search(tree, value)
+                self.assertEqual(node is not None, found[i])
+                self.assertIs(parent, parents[i])
+                self.assertIs(node, nodes[i])
+        found, parents, nodes = search_many(None, values)
+        self.assertFalse(np.any(found))
+
+    def test_add_many(self):
+        rng = np.random.default_rng(0)
+        for tree, rep, _, _ in TreeGenerator.all_bst_cases():
+            values = rng.integers(-50, 150, size=100)
+            added, tree = add_many(tree, values)
+            expected = set(rep.tolist()) | set(values.tolist())
+            self.assertTrue(is_binary_search_tree(tree))
+            self.assertEqual(len(expected), count_nodes(tree))
+            self.assertEqual(len(expected) - len(rep), np.sum(added))
+            # Only the first of duplicate values is added
+            _, first = np.unique(values, return_index=True)
+            self.assertTrue(np.all(added[first] == ~np.isin(values[first], rep)))
+            self.assertTrue(np.all(search_many(tree, values)[0]))
+        added, tree = add_many(None, [3, 1, 3, 2])
+        self.assertEqual([True, True, False, True], added.tolist())
+        self.assertEqual([1, 2, 3], list(inorder(tree)))
+        added, tree = add_many(None, [])
+        self.assertEqual(0, added.size)
+        self.assertIsNone(tree)
+
+    def test_remove_many(self):
+        values = np.array([2, 20, 2, 0, 6])
+        for tree, rep, _, _ in TreeGenerator.all_bst_cases():
+            removed, tree = remove_many(tree, values)
+            self.assertTrue(np.all(removed == np.isin(values, rep) &
+                                   (np.arange(len(values)) != 2)))
+            self.assertFalse(np.any(search_many(tree, values)[0]))
+            self.assertTrue(is_binary_search_tree(tree))
+        removed, tree = remove_many(Node(1, None, None), [1, 1])
+        self.assertEqual([True, False], removed.tolist())
+        self.assertIsNone(tree)
+
     def test_delete(self):
         for value in range(20):
             for tree, rep, _, _ in TreeGenerator.all_bst_cases():
@@ -135,6 +303,34 @@ class TestTreeFunctions(unittest.TestCase):
                 self.assertTrue(child is None)
                 self.assertTrue(is_binary_search_tree(tree))
     
+    def test_delete_keeps_subtrees(self):
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            values = set(rng.integers(100, size=60).tolist())
+            root = build_from_iterable(rng.permutation(list(values)))
+            for value in rng.permutation(list(values)).tolist():
+                result, root = remove(root, value)
+                self.assertTrue(result)
+                values.remove(value)
+                self.assertEqual(sorted(values), list(inorder(root)))
+                self.assertTrue(is_binary_search_tree(root))
+            self.assertIsNone(root)
+
+    def test_remove_many_keeps_subtrees(self):
+        rng = np.random.default_rng(1)
+        values = rng.permutation(500)
+        root = Node(int(values[0]), None, None)
+        _, root = add_many(root, values[1:])
+        batch = rng.integers(-10, 510, size=300)
+        removed, root = remove_many(root, batch)
+        self.assertEqual(np.unique(batch[(batch >= 0) & (batch < 500)]).size,
+                         np.sum(removed))
+        self.assertEqual(sorted(set(range(500)) - set(batch.tolist())),
+                         list(inorder(root)))
+        self.assertTrue(is_binary_search_tree(root))
+        removed, root = remove_many(root, np.arange(500))
+        self.assertIsNone(root)
+
     def test_delete_manual(self):
         # original tree
         ll = Node(0, None, None)
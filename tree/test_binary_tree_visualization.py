@@ -0,0 +1,105 @@
+import io
+import json
+import numpy as np
+import unittest
+
+from binary_tree import build_from_sorted, get_height
+from binary_tree_visualization import *
+from node import Node
+from test_binary_tree import TreeGenerator
+
+
+def to_dict(root: Node) -> dict:
+    if root is None:
+        return None
+    return {'info': int(root.info), 'left': to_dict(root.left),
+            'right': to_dict(root.right)}
+
+
+def chain(n: int) -> Node:
+    root = None
+    for value in range(n - 1, -1, -1):
+        root = Node(value, None, root)
+    return root
+
+
+class TestVisualization(unittest.TestCase):
+
+    def test_num_digits(self):
+        for n in (0, 7, -7, 10, 99, -100, 123456789, np.int64(-42)):
+            self.assertEqual(len(str(n)), num_digits(n))
+
+    def test_iter_levels(self):
+        for root, rep, _, _ in TreeGenerator.all_bst_cases():
+            levels = list(iter_levels(root))
+            self.assertEqual(get_height(root) + 1, len(levels))
+            self.assertEqual(rep.tolist(),
+                             [value for level in levels for value, _ in level])
+            self.assertEqual(2, len(list(iter_levels(root, max_depth=1))))
+        self.assertEqual([], list(iter_levels(None)))
+
+    def test_visualize_tree(self):
+        root, _, _, _ = TreeGenerator.bst_height_2()
+        out = io.StringIO()
+        visualize_tree(root, file=out)
+        self.assertEqual('        3\n'
+                         '    /¯¯¯¯¯¯\\    \n'
+                         '    1       5\n'
+                         '  /¯¯\\    /¯¯\\  \n'
+                         '  0   2   4   6\n'
+                         '\n\n', out.getvalue())
+        out = io.StringIO()
+        visualize_tree(chain(100), max_depth=3, file=out)
+        self.assertEqual(4 + 3 + 2, len(out.getvalue().splitlines()))
+        # Too many levels to draw, falls back to write_text
+        for n in (16, 20000):
+            out = io.StringIO()
+            visualize_tree(chain(n), file=out)
+            expected = io.StringIO()
+            write_text(chain(n), expected)
+            self.assertEqual(expected.getvalue(), out.getvalue())
+
+    def test_write_text(self):
+        root, _, _, _ = TreeGenerator.bst_height_2()
+        out = io.StringIO()
+        write_text(focus(root, 5), out)
+        self.assertEqual('T> 5\n--L> 4\n--R> 6\n', out.getvalue())
+        out = io.StringIO()
+        write_text(root, out, max_depth=0)
+        self.assertEqual('T> 3\n--...\n', out.getvalue())
+        self.assertIsNone(focus(root, 7))
+
+    def test_write_dot(self):
+        root, rep, _, _ = TreeGenerator.bst_slides()
+        out = io.StringIO()
+        write_dot(root, out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual('digraph tree {', lines[0])
+        self.assertEqual('}', lines[-1])
+        self.assertEqual(len(rep), sum('[label="' in line for line in lines))
+        self.assertEqual(len(rep) - 1, sum('->' in line for line in lines))
+
+    def test_write_json(self):
+        for root, _, _, _ in TreeGenerator.all_bst_cases():
+            out = io.StringIO()
+            write_json(root, out)
+            self.assertEqual(to_dict(root), json.loads(out.getvalue()))
+        out = io.StringIO()
+        write_json(build_from_sorted(np.arange(7)), out, max_depth=1)
+        self.assertEqual({'info': 3,
+                          'left': {'info': 1, 'truncated': True},
+                          'right': {'info': 5, 'truncated': True}},
+                         json.loads(out.getvalue()))
+
+    def test_deep_tree(self):
+        # Degenerate trees much deeper than the recursion limit
+        root = chain(20000)
+        for write in (write_text, write_dot, write_json):
+            write(root, io.StringIO())
+        out = io.StringIO()
+        write_text(focus(root, 19998), out)
+        self.assertEqual(2, len(out.getvalue().splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
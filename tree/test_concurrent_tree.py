@@ -0,0 +1,126 @@
+import numpy as np
+import threading
+import unittest
+
+from b_tree import BTree
+from balanced_tree import AVLTree, RedBlackTree
+from concurrent_tree import ConcurrentTree
+from test_balanced_tree import check_avl
+
+
+class PausingTree(AVLTree):
+    """
+    AVLTree that pauses in the middle of the rotation of the root 1, when
+    the root has already lost its right child 2 but is still the root
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def _update(self, node):
+        super()._update(node)
+        if node.info == 1 and node.right is None and self.root is node:
+            self.paused.set()
+            self.resume.wait()
+
+
+class TestConcurrentTree(unittest.TestCase):
+
+    def test_single_thread(self):
+        tree = ConcurrentTree()
+        for value in (5, 3, 8, 3):
+            tree.add(value)
+        self.assertEqual(3, len(tree))
+        self.assertIn(3, tree)
+        self.assertTrue(tree.remove(3))
+        self.assertFalse(tree.remove(3))
+        self.assertNotIn(3, tree)
+        self.assertEqual([5, 8], tree.to_list())
+        tree = ConcurrentTree(RedBlackTree())
+        self.assertTrue(tree.add(1))
+        self.assertIn(1, tree)
+        tree = ConcurrentTree(BTree(2))
+        for value in (5, 3, 8, 3):
+            tree.add(value)
+        self.assertEqual([3, 5, 8], tree.to_list())
+        with self.assertRaises(TypeError):
+            ConcurrentTree({1, 2})
+
+    def test_half_applied_update(self):
+        tree = ConcurrentTree(PausingTree())
+        tree.add(1)
+        tree.add(2)
+        # Never leave the writer hanging, even if an assertion fails
+        self.addCleanup(tree.tree.resume.set)
+        writer = threading.Thread(target=tree.add, args=(3,))
+        writer.start()
+        self.assertTrue(tree.tree.paused.wait(5))
+        # An unsynchronized search misses 2 now
+        self.assertIsNone(tree.tree.search(2)[1])
+        result = []
+        reader = threading.Thread(target=lambda: result.append(2 in tree))
+        reader.start()
+        reader.join(0.1)
+        # The reader saw the writer and waits for the lock
+        self.assertTrue(reader.is_alive())
+        tree.tree.resume.set()
+        writer.join()
+        reader.join()
+        self.assertEqual([True], result)
+        self.assertEqual([1, 2, 3], tree.to_list())
+
+    def check_stress(self, tree: ConcurrentTree) -> None:
+        # Even values are always in the tree, values >= 1000 never are and
+        # the odd values below 1000 are added and removed by the writers
+        for value in range(0, 1000, 2):
+            tree.add(value)
+        done = threading.Event()
+        errors = []
+
+        def read(seed):
+            rng = np.random.default_rng(seed)
+            while not done.is_set():
+                for value in rng.integers(2000, size=100).tolist():
+                    present = value in tree
+                    if value >= 1000 and present or \
+                            value % 2 == 0 and value < 1000 and not present:
+                        errors.append(value)
+
+        def write(seed):
+            rng = np.random.default_rng(seed)
+            for value in rng.integers(500, size=3000).tolist():
+                if rng.random() < 0.5:
+                    tree.add(2 * value + 1)
+                else:
+                    tree.remove(2 * value + 1)
+
+        readers = [threading.Thread(target=read, args=(seed,))
+                   for seed in range(4)]
+        writers = [threading.Thread(target=write, args=(seed,))
+                   for seed in range(10, 12)]
+        for thread in readers + writers:
+            thread.start()
+        for writer in writers:
+            writer.join()
+        done.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual([], errors)
+        values = tree.to_list()
+        self.assertEqual(len(values), len(tree))
+        self.assertEqual(sorted(set(values)), values)
+        self.assertTrue(set(range(0, 1000, 2)) <= set(values))
+
+    def test_stress(self):
+        tree = ConcurrentTree()
+        self.check_stress(tree)
+        check_avl(tree.tree.root)
+        # Readers can run into B-tree nodes in the middle of a split or merge
+        self.check_stress(ConcurrentTree(BTree(2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
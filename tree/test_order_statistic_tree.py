@@ -0,0 +1,58 @@
+import bisect
+import numpy as np
+import unittest
+
+from order_statistic_tree import OrderStatisticTree
+from test_balanced_tree import check_avl, inorder
+
+
+def check_sizes(root) -> int:
+    if root is None:
+        return 0
+    size = check_sizes(root.left) + check_sizes(root.right) + 1
+    assert root.size == size, 'wrong size at %s' % root.info
+    return size
+
+
+class TestOrderStatisticTree(unittest.TestCase):
+
+    def random_tree(self, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        tree = OrderStatisticTree()
+        for value in rng.integers(200, size=300).tolist():
+            tree.add(value)
+        for value in rng.integers(200, size=150).tolist():
+            tree.remove(value)
+        return tree
+
+    def test_sizes(self):
+        tree = self.random_tree()
+        self.assertEqual(len(tree), check_sizes(tree.root))
+        check_avl(tree.root)
+
+    def test_rank_select(self):
+        tree = self.random_tree()
+        values = inorder(tree.root)
+        for k, value in enumerate(values):
+            self.assertEqual(value, tree.select(k))
+            self.assertEqual(k, tree.rank(value))
+        for value in range(-5, 205):
+            self.assertEqual(bisect.bisect_left(values, value),
+                             tree.rank(value))
+        self.assertRaises(IndexError, tree.select, len(values))
+        self.assertRaises(IndexError, tree.select, -1)
+        self.assertRaises(IndexError, OrderStatisticTree().select, 0)
+
+    def test_ranges(self):
+        tree = self.random_tree(1)
+        values = inorder(tree.root)
+        for low, high in ((-10, 300), (50, 60), (61, 61), (60, 50),
+                          (199, 500), (-5, -1)):
+            expected = [v for v in values if low <= v <= high]
+            self.assertEqual(len(expected), tree.count_range(low, high))
+            self.assertEqual(expected, list(tree.range_iter(low, high)))
+        self.assertEqual([], list(OrderStatisticTree().range_iter(0, 10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
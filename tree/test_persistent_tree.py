@@ -0,0 +1,99 @@
+import numpy as np
+import threading
+import unittest
+
+from binary_tree import is_binary_search_tree
+from persistent_tree import PersistentTree
+from test_balanced_tree import check_avl
+
+
+def nodes(tree: PersistentTree) -> set:
+    found, stack = set(), [tree.root] if tree.root else []
+    while stack:
+        node = stack.pop()
+        found.add(id(node))
+        stack.extend(child for child in (node.left, node.right) if child)
+    return found
+
+
+class TestPersistentTree(unittest.TestCase):
+
+    def test_random_updates(self):
+        rng = np.random.default_rng(0)
+        tree = PersistentTree()
+        values = set()
+        for value in rng.integers(300, size=3000).tolist():
+            if rng.random() < 0.6:
+                new = tree.add(value)
+                self.assertEqual(value in values, new is tree)
+                values.add(value)
+            else:
+                new = tree.remove(value)
+                self.assertEqual(value not in values, new is tree)
+                values.discard(value)
+            tree = new
+            self.assertEqual(len(values), len(tree))
+        self.assertEqual(sorted(values), list(tree))
+        check_avl(tree.root)
+        self.assertTrue(is_binary_search_tree(tree.root))
+        for value in sorted(values):
+            tree = tree.remove(value)
+        self.assertIsNone(tree.root)
+        self.assertEqual(0, len(tree))
+
+    def test_snapshots(self):
+        versions = [PersistentTree()]
+        for value in (5, 3, 8, 1, 4, 7, 9):
+            versions.append(versions[-1].add(value))
+        versions.append(versions[-1].remove(5))
+        versions.append(versions[-1].remove(1))
+        self.assertEqual([], list(versions[0]))
+        self.assertEqual([3, 5, 8], list(versions[3]))
+        self.assertEqual([1, 3, 4, 5, 7, 8, 9], list(versions[7]))
+        self.assertEqual([1, 3, 4, 7, 8, 9], list(versions[8]))
+        self.assertEqual([3, 4, 7, 8, 9], list(versions[9]))
+        self.assertIn(5, versions[7])
+        self.assertNotIn(5, versions[8])
+
+    def test_sharing(self):
+        tree = PersistentTree()
+        for value in range(1000):
+            tree = tree.add(value)
+        before = nodes(tree)
+        for new in (tree.add(1000), tree.add(-1), tree.remove(500),
+                    tree.remove(tree.root.info)):
+            copied = nodes(new) - before
+            self.assertLessEqual(len(copied), 2 * tree.get_height() + 2)
+
+    def test_concurrent_readers(self):
+        # The writer publishes every version of a tree holding 0..n-1 and
+        # one extra value, readers only ever see complete versions
+        n = 200
+        current = PersistentTree()
+        for value in range(n):
+            current = current.add(value)
+        done = threading.Event()
+        errors = []
+
+        def read():
+            while not done.is_set():
+                snapshot = current
+                values = list(snapshot)
+                if len(values) != len(snapshot) or \
+                        values[:n] != list(range(n)):
+                    errors.append(values)
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        for value in range(n, 2 * n):
+            current = current.add(value)
+            current = current.remove(value)
+        done.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual([], errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import numpy as np
+import os
+import tempfile
+import unittest
+
+import tree_storage
+from array_tree import ArrayTree, NONE
+from binary_tree import get_height, search
+from test_array_tree import inorder
+from test_binary_tree import TreeGenerator
+
+
+class TestTreeStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'tree.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_node_round_trip(self):
+        for root, rep, _, _ in TreeGenerator.all_bst_cases():
+            tree_storage.save_tree(self.path, root)
+            loaded = tree_storage.load_array_tree(self.path, validate=True)
+            self.assertIsInstance(loaded.info, np.memmap)
+            self.assertEqual(sorted(rep.tolist()), inorder(loaded))
+            for value in range(20):
+                parent, node = loaded.search(value)
+                self.assertEqual(value in rep, node != NONE)
+            copy = tree_storage.load_tree(self.path)
+            self.assertEqual(get_height(root), get_height(copy))
+            self.assertIsNotNone(search(copy, rep[-1])[1])
+
+    def test_free_slots_are_dropped(self):
+        tree = ArrayTree.from_sorted(np.arange(0, 200, 2))
+        for value in range(0, 200, 6):
+            tree.remove(value)
+        tree_storage.save_array_tree(self.path, tree)
+        loaded = tree_storage.load_array_tree(self.path)
+        self.assertEqual(len(tree), len(loaded))
+        self.assertEqual(len(tree), len(loaded.info))
+        self.assertEqual(inorder(tree), inorder(loaded))
+        self.assertEqual(tree.get_height(), loaded.get_height())
+        # 8 bytes per value and 4 per child index, plus alignment
+        self.assertLessEqual(os.path.getsize(self.path),
+                             tree_storage.HEADER.itemsize + 16 * len(tree) + 8)
+
+    def test_modes(self):
+        tree_storage.save_array_tree(self.path,
+                                     ArrayTree.from_sorted(np.arange(7)))
+        loaded = tree_storage.load_array_tree(self.path)
+        with self.assertRaises(ValueError):
+            loaded.remove(3)
+        # Copy-on-write changes the tree, but not the file
+        loaded = tree_storage.load_array_tree(self.path, mode='c')
+        self.assertTrue(loaded.remove(3))
+        self.assertTrue(loaded.add(10))
+        self.assertEqual([0, 1, 2, 4, 5, 6, 10], inorder(loaded))
+        loaded = tree_storage.load_array_tree(self.path)
+        self.assertEqual(list(range(7)), inorder(loaded))
+
+    def test_empty_and_invalid(self):
+        tree_storage.save_tree(self.path, None)
+        loaded = tree_storage.load_array_tree(self.path)
+        self.assertEqual(0, len(loaded))
+        self.assertIsNone(tree_storage.load_tree(self.path))
+        self.assertTrue(loaded.add(1))
+
+        tree = ArrayTree.from_sorted(np.arange(15))
+        tree.info[3] = 100
+        tree_storage.save_array_tree(self.path, tree)
+        with self.assertRaises(ValueError):
+            tree_storage.load_array_tree(self.path, validate=True)
+        with open(self.path, 'wb') as f:
+            f.write(b'not a tree')
+        with self.assertRaises(ValueError):
+            tree_storage.read_header(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import numpy as np
+import typing
+
+from array_tree import ArrayTree, FREE, NONE
+from node import Node
+
+############################################################################
+# Binary on-disk tree format, holding the columns of an ArrayTree. A file
+# starts with a 64 byte header, followed by the info, left and right
+# columns (each starting at an 8 byte boundary). Slots on the free list are
+# dropped on save, so a file holds exactly one slot per value. Files are
+# opened with np.memmap, so a loaded tree can be searched right away
+# without reading the whole file or creating any Node objects.
+############################################################################
+
+MAGIC = b'TREEBIN'
+VERSION = 1
+
+HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('reserved', '<u4'),
+    ('size', '<u8'),
+    ('root', '<i8'),
+    ('dtype', 'S8'),
+    ('index_dtype', 'S8'),
+    ('padding', 'S16'),
+])
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def read_header(path: str) -> np.void:
+    """
+    Reads and validates the header of a tree file
+
+    :param path: The path of the tree file
+    :return: structured numpy scalar with the HEADER fields
+    """
+
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) != 1 or header[0]['magic'] != MAGIC:
+        raise ValueError('%s is not a tree file' % path)
+    if header[0]['version'] != VERSION:
+        raise ValueError('%s has unsupported version %d'
+                         % (path, header[0]['version']))
+    return header[0]
+
+
+def _compact(tree: ArrayTree) -> typing.Tuple[int, np.ndarray, np.ndarray,
+                                              np.ndarray]:
+    """
+    Drops the free slots of a tree and renumbers the other ones, keeping
+    their order
+
+    :param tree: The tree to compact
+    :return: a Tuple consisting of the root and the info, left and right
+    columns of the compacted tree
+    """
+
+    n = tree.high_water
+    info, left, right = tree.info[:n], tree.left[:n], tree.right[:n]
+    used = right != FREE
+    if used.all():
+        return tree.root, info, left, right
+    # Old slot -> new slot, with NONE mapping to itself at the end
+    renumber = np.append(np.cumsum(used) - 1, NONE).astype(left.dtype)
+    return (int(renumber[tree.root]), info[used],
+            renumber[left[used]], renumber[right[used]])
+
+
+def save_array_tree(path: str, tree: ArrayTree) -> None:
+    """
+    Writes an ArrayTree to a tree file
+
+    :param path: The path of the tree file
+    :param tree: The tree to write
+    """
+
+    root, info, left, right = _compact(tree)
+    header = np.zeros((), dtype=HEADER)
+    header['magic'] = MAGIC
+    header['version'] = VERSION
+    header['size'] = len(info)
+    header['root'] = root
+    header['dtype'] = info.dtype.str.encode('ascii')
+    header['index_dtype'] = left.dtype.str.encode('ascii')
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        for column in (info, left, right):
+            f.seek(_aligned(f.tell()))
+            f.write(np.ascontiguousarray(column).tobytes())
+
+
+def save_tree(path: str, root: typing.Optional[Node],
+              dtype: np.dtype = np.int64) -> None:
+    """
+    Writes a tree of Node objects to a tree file
+
+    :param path: The path of the tree file
+    :param root: The root of the tree
+    :param dtype: The dtype to store the values as
+    """
+
+    save_array_tree(path, ArrayTree.from_node(root, dtype))
+
+
+def load_array_tree(path: str, mode: str = 'r',
+                    validate: bool = False) -> ArrayTree:
+    """
+    Maps the tree in a tree file into memory. The columns of the result are
+    views on the file, so it can be searched immediately.
+
+    :param path: The path of the tree file
+    :param mode: The np.memmap mode, 'r' for read-only, 'c' for
+    copy-on-write or 'r+' for writing through to the file. Adding values
+    beyond the size of the file copies the columns into memory.
+    :param validate: Whether to check the binary search tree property of
+    the loaded tree, see ArrayTree.find_violation
+    :return: ArrayTree backed by the file
+    """
+
+    header = read_header(path)
+    size = int(header['size'])
+    dtype = np.dtype(header['dtype'].decode())
+    tree = ArrayTree(dtype=dtype)
+    if size == 0:
+        # np.memmap cannot map zero bytes
+        return tree
+
+    index_dtype = np.dtype(header['index_dtype'].decode())
+    offset = HEADER.itemsize
+    columns = []
+    for column_dtype in (dtype, index_dtype, index_dtype):
+        offset = _aligned(offset)
+        columns.append(np.memmap(path, dtype=column_dtype, mode=mode,
+                                 offset=offset, shape=(size,)))
+        offset += size * column_dtype.itemsize
+    tree.info, tree.left, tree.right = columns
+    tree.root = int(header['root'])
+    tree.size = tree.high_water = size
+
+    if validate:
+        slot = tree.find_violation()
+        if slot != NONE:
+            raise ValueError('%s is not a binary search tree at slot %d'
+                             % (path, slot))
+    return tree
+
+
+def load_tree(path: str) -> typing.Optional[Node]:
+    """
+    Reads the tree in a tree file into a tree of Node objects
+
+    :param path: The path of the tree file
+    :return: the root Node, or None for an empty tree
+    """
+
+    return load_array_tree(path).to_node()